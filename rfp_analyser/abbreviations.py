@@ -0,0 +1,48 @@
+import re
+from typing import Dict
+
+_WORD = re.compile(r"\w+")
+
+
+class AbbreviationExpander:
+    """Expands a fixed set of abbreviations in a single regex pass.
+
+    Only whole words match, so "EMD" is not found inside "EMDS". The first
+    occurrence of each abbreviation is followed by its full form; later
+    occurrences, and any that the text already defines as "ABBR (...)", are
+    left alone. When every abbreviation is a single word, the pattern scans
+    words and looks them up in the map, so the cost does not grow with the
+    number of abbreviations.
+    """
+
+    def __init__(self, abbreviations: Dict[str, str]):
+        self.abbreviations = {abbr: full for abbr, full in abbreviations.items() if abbr and full}
+        if not self.abbreviations:
+            self._pattern = None
+        elif all(_WORD.fullmatch(abbr) for abbr in self.abbreviations):
+            self._pattern = re.compile(r"(\w+)(\s*\()?")
+        else:
+            # Longest first, so "EMD-II" wins over "EMD"
+            alternatives = "|".join(map(re.escape, sorted(self.abbreviations, key=len, reverse=True)))
+            self._pattern = re.compile(rf"(?<!\w)({alternatives})(?!\w)(\s*\()?")
+
+    def __len__(self) -> int:
+        return len(self.abbreviations)
+
+    def expand(self, text: str) -> str:
+        if not text or self._pattern is None:
+            return text
+
+        seen = set()
+
+        def replace(match: re.Match) -> str:
+            abbr = match.group(1)
+            if abbr not in self.abbreviations or abbr in seen:
+                return match.group(0)
+            seen.add(abbr)
+            if match.group(2):
+                # Already followed by its definition
+                return match.group(0)
+            return f"{abbr} ({self.abbreviations[abbr]})"
+
+        return self._pattern.sub(replace, text)
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerCache:
+    """On-disk cache of generated answers, keyed by everything that determines the answer."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.path = Path(path or config.ANSWER_CACHE_PATH)
+        self.max_entries = max_entries or config.ANSWER_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else config.ANSWER_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_document ON answers (document_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+        self._conn.commit()
+        # Entries as of the last sweep plus those inserted since; a sweep runs when it passes max_entries
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        logger.info(f"Opened answer cache at {self.path}")
+
+    @staticmethod
+    def make_key(document_id: str, question: str, chunk_ids: List[str], model: str,
+                 namespace: str = "") -> str:
+        """Build the cache key for a question answered from the given chunks."""
+        normalized = " ".join(question.lower().split())
+        parts = [namespace, document_id, normalized, ",".join(sorted(chunk_ids)), model]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached answer, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer, created_at FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE answers SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, document_id: str, answer: str):
+        """Store an answer; expired and least recently used entries are evicted once the cache is full."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, document_id, answer, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, document_id, answer, now, now)
+            )
+            self._entries += 1
+            if self._entries > self.max_entries:
+                self._sweep(now)
+            self._conn.commit()
+
+    def _sweep(self, now: float):
+        """Delete expired entries, then the least recently used down to max_entries. Call with the lock held."""
+        if self.ttl:
+            self._conn.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl,))
+        # Other worker processes insert too, so recount rather than trust the local counter
+        count = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM answers WHERE key IN "
+                "(SELECT key FROM answers ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            )
+            count = self.max_entries
+        self._entries = count
+
+    def invalidate_document(self, document_id: str) -> int:
+        """Drop every cached answer for one document."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM answers WHERE document_id = ?", (document_id,))
+            self._conn.commit()
+            self._entries = max(0, self._entries - cursor.rowcount)
+        logger.info(f"Invalidated {cursor.rowcount} cached answers for document {document_id}")
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
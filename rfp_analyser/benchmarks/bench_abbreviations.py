@@ -0,0 +1,84 @@
+"""Compare abbreviation expansion: one str.replace per abbreviation vs the compiled expander.
+
+    python benchmarks/bench_abbreviations.py --abbreviations 1000 --words 5000
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from abbreviations import AbbreviationExpander
+
+WORDS = "the bidder shall submit earnest money deposit before the deadline under clause".split()
+
+
+def make_abbreviations(count: int, rng: random.Random):
+    abbreviations = {}
+    while len(abbreviations) < count:
+        abbr = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 6)))
+        abbreviations[abbr] = " ".join(rng.choice(WORDS).title() for _ in range(len(abbr)))
+    return abbreviations
+
+
+def make_context(abbreviations, words: int, rng: random.Random) -> str:
+    keys = list(abbreviations)
+    return " ".join(rng.choice(keys) if rng.random() < 0.05 else rng.choice(WORDS) for _ in range(words))
+
+
+def replace_loop(abbreviations, text: str) -> str:
+    """The original implementation."""
+    for abbr, full_form in abbreviations.items():
+        text = text.replace(abbr, f"{abbr} ({full_form})")
+    return text
+
+
+def best_of(repeat: int, fn) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--abbreviations", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=5000, help="Words in the context, roughly 4 retrieved chunks is 1000")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    abbreviations = make_abbreviations(args.abbreviations, rng)
+    text = make_context(abbreviations, args.words, rng)
+
+    start = time.perf_counter()
+    expander = AbbreviationExpander(abbreviations)
+    compile_seconds = time.perf_counter() - start
+
+    results = {
+        "abbreviations": args.abbreviations,
+        "context_chars": len(text),
+        "compile_ms": round(compile_seconds * 1000, 3),
+        "replace_loop_ms": round(best_of(args.repeat, lambda: replace_loop(abbreviations, text)) * 1000, 3),
+        "compiled_ms": round(best_of(args.repeat, lambda: expander.expand(text)) * 1000, 3),
+        "replace_loop_output_chars": len(replace_loop(abbreviations, text)),
+        "compiled_output_chars": len(expander.expand(text))
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for key, value in results.items():
+            print(f"{key:<26} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Compare PDF text extraction throughput (pages/sec) across backends.
+
+    python benchmarks/bench_extraction.py --pages 300
+    python benchmarks/bench_extraction.py --pdf path/to/tender.pdf --workers 1 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fitz  # PyMuPDF
+
+from document_processor import PDF_BACKENDS, DocumentProcessor
+
+PARAGRAPH = (
+    "The bidder shall submit an Earnest Money Deposit (EMD) of Rs. 5,00,000 before the "
+    "last date of submission. Clause {page}.{line}: the successful bidder shall deliver, "
+    "install and commission the equipment within 90 days of the purchase order."
+)
+
+
+def make_pdf(path: str, pages: int):
+    """Write a text PDF with the given number of pages."""
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(PARAGRAPH.format(page=page_number, line=line) for line in range(12))
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def bench(pdf_path: str, backend: str, workers: int, repeat: int):
+    processor = DocumentProcessor()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = processor.extract_pages_from_pdf(pdf_path, backend=backend, workers=workers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "backend": backend,
+        "workers": workers,
+        "pages": len(pages),
+        "seconds": round(best, 3),
+        "pages_per_sec": round(len(pages) / best, 1) if best else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", help="PDF to extract; a synthetic one is generated if omitted")
+    parser.add_argument("--pages", type=int, default=300, help="Pages in the synthetic PDF")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--backends", nargs="+", default=list(PDF_BACKENDS), choices=PDF_BACKENDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    tmp_path = None
+    pdf_path = args.pdf
+    if pdf_path is None:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp_path = pdf_path = tmp.name
+        make_pdf(pdf_path, args.pages)
+
+    try:
+        results = [
+            bench(pdf_path, backend, workers, args.repeat)
+            for backend in args.backends
+            for workers in sorted(set(args.workers))
+        ]
+    finally:
+        if tmp_path:
+            os.unlink(tmp_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'backend':<10} {'workers':>7} {'pages':>6} {'seconds':>8} {'pages/sec':>10}")
+        for r in results:
+            print(f"{r['backend']:<10} {r['workers']:>7} {r['pages']:>6} {r['seconds']:>8} {r['pages_per_sec']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare peak memory of whole-document and streaming ingestion.
+
+Each run happens in a fresh process so its peak RSS is measured in isolation.
+Embeddings come from a deterministic stand-in with the same output shape as
+all-MiniLM-L6-v2, so only the pipeline itself is measured.
+
+    python benchmarks/bench_memory.py --pages 500 1000 2000
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from bench_extraction import make_pdf
+from document_processor import DocumentProcessor
+from ingestion import batched, iter_extracted_pages
+
+EMBEDDING_DIM = 384
+BATCH_SIZE = 64
+
+
+def fake_encode(texts):
+    """Return one deterministic float32 vector per text."""
+    seeds = [int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16) for text in texts]
+    return np.stack([np.random.default_rng(seed).random(EMBEDDING_DIM, dtype=np.float32) for seed in seeds])
+
+
+def run_whole(pdf_path):
+    """The original path: one text string, rewritten, fully chunked, encoded at once."""
+    processor = DocumentProcessor()
+    text = processor.extract_text_from_pdf(pdf_path, backend="pymupdf")
+    text = processor.remove_boilerplate(text)
+    processor.extract_abbreviations(text)
+    chunks = processor.chunk_document(text)
+    embeddings = fake_encode([chunk[0] for chunk in chunks]).tolist()
+    return len(chunks), len(embeddings)
+
+
+def run_streaming(pdf_path):
+    """The ingestion path: pages, chunks and embeddings flow through in fixed-size batches."""
+    processor = DocumentProcessor()
+    chunk_count = 0
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pages = iter_extracted_pages(pdf_path, pool, backend="pymupdf", prefetch=1)
+        for batch in batched(processor.iter_chunks(pages), BATCH_SIZE):
+            fake_encode([chunk[0] for chunk in batch]).tolist()
+            chunk_count += len(batch)
+    return chunk_count, chunk_count
+
+
+def measure(mode, pdf_path, results):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    chunks, _ = (run_whole if mode == "whole" else run_streaming)(pdf_path)
+    results.put({
+        "mode": mode,
+        "chunks": chunks,
+        "seconds": round(time.perf_counter() - start, 2),
+        # ru_maxrss is kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "baseline_rss_mb": round(baseline / 1024, 1)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[2000])
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for pages in args.pages:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            pdf_path = tmp.name
+        try:
+            make_pdf(pdf_path, pages)
+            for mode in ("whole", "streaming"):
+                queue = context.Queue()
+                process = context.Process(target=measure, args=(mode, pdf_path, queue))
+                process.start()
+                result = queue.get()
+                process.join()
+                results.append({"pages": pages, **result})
+        finally:
+            os.unlink(pdf_path)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'pages':>6} {'mode':<10} {'chunks':>7} {'seconds':>8} {'peak RSS MB':>12}")
+        for r in results:
+            print(f"{r['pages']:>6} {r['mode']:<10} {r['chunks']:>7} {r['seconds']:>8} {r['peak_rss_mb']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Measure server startup: import time, time to liveness and time to readiness.
+
+Each run starts a fresh uvicorn process with an empty data directory, so the
+vector store and caches start cold.
+
+    python benchmarks/bench_startup.py --runs 3
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_seconds(workdir: str) -> float:
+    """Time `import main` in a fresh interpreter."""
+    code = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=workdir, env=_env(workdir), check=True,
+        capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def wait_for(url: str, start: float, timeout: float) -> float:
+    """Poll `url` until it returns 200; return seconds since `start`."""
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def serve_seconds(workdir: str, timeout: float):
+    """Start the server; return seconds until liveness and until readiness."""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=_env(workdir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        live = wait_for(f"{base}/health/live", start, timeout)
+        ready = wait_for(f"{base}/health/ready", start, timeout)
+    finally:
+        server.terminate()
+        server.wait()
+    return live, ready
+
+
+def _env(data_dir: str):
+    return {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(APP_DIR), os.environ.get("PYTHONPATH")])),
+        "RFP_DATA_DIR": data_dir,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for readiness")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for run in range(args.runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            imported = import_seconds(workdir)
+            live, ready = serve_seconds(workdir, args.timeout)
+        results.append({
+            "run": run + 1,
+            "import_seconds": round(imported, 3),
+            "live_seconds": round(live, 3),
+            "ready_seconds": round(ready, 3)
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'run':>3} {'import s':>9} {'live s':>8} {'ready s':>8}")
+        for r in results:
+            print(f"{r['run']:>3} {r['import_seconds']:>9} {r['live_seconds']:>8} {r['ready_seconds']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Benchmark every stage, then the API end to end under concurrent load.
+
+Synthetic RFPs from synthetic_rfp.py are extracted, chunked, embedded and
+searched in-process; then a server is started against a fake Ollama with
+the given latency, and /analyze, /query and /summary are driven by
+concurrent clients. Everything runs in a fresh temporary directory, and
+the results are JSON so runs can be compared across commits.
+
+    python benchmarks/bench_suite.py --pages 100 --output results.json
+    python benchmarks/bench_suite.py --stages search e2e --concurrency 8 --llm-latency 1.0
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+import httpx
+import numpy as np
+
+from bench_startup import free_port, wait_for
+from synthetic_rfp import make_rfp_pdf
+
+STAGES = ("extraction", "chunking", "embedding", "search", "e2e")
+
+QUESTIONS = [
+    "What is the EMD amount?",
+    "What is the last date for bid submission?",
+    "What is the performance bank guarantee percentage?",
+    "What are the payment terms?",
+    "What is the required uptime under the SLA?",
+    "What is the penalty for delay?",
+    "What turnover must bidders have?",
+    "What items are in the bill of materials?",
+]
+
+
+def percentiles(seconds):
+    values = np.array(seconds) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "mean_ms": round(float(values.mean()), 2),
+    }
+
+
+def bench_stages(args, pdfs, stages, results):
+    from boilerplate import BoilerplateFilter
+    from document_processor import DocumentProcessor
+    from embedding_service import EmbeddingService
+    from reranker import Retriever
+    from vector_store import VectorStore
+
+    processor = DocumentProcessor()
+    start = time.perf_counter()
+    pages = [processor.extract_pages_from_pdf(pdf) for pdf in pdfs]
+    elapsed = time.perf_counter() - start
+    page_count = sum(len(doc_pages) for doc_pages in pages)
+    if "extraction" in stages:
+        results["extraction"] = {"pages": page_count, "seconds": round(elapsed, 3),
+                                 "pages_per_second": round(page_count / elapsed, 1)}
+
+    start = time.perf_counter()
+    filters = [BoilerplateFilter() for _ in pages]
+    chunks = [list(processor.iter_chunks(boilerplate.filter(doc_pages)))
+              for boilerplate, doc_pages in zip(filters, pages)]
+    elapsed = time.perf_counter() - start
+    texts = [text for doc_chunks in chunks for text, _ in doc_chunks]
+    if "chunking" in stages:
+        words = sum(len(text.split()) for text in texts)
+        removed = [boilerplate.stats() for boilerplate in filters]
+        results["chunking"] = {"chunks": len(texts), "seconds": round(elapsed, 3),
+                               "boilerplate_chars_removed": sum(r["boilerplate_chars_removed"] for r in removed),
+                               "boilerplate_chunks_removed": sum(r["boilerplate_chunks_removed"] for r in removed),
+                               "chunks_per_second": round(len(texts) / elapsed, 1),
+                               "words_per_second": round(words / elapsed, 1)}
+
+    if "embedding" in stages:
+        start = time.perf_counter()
+        service = EmbeddingService(use_disk_cache=False)
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        service.encode(texts)
+        elapsed = time.perf_counter() - start
+        results["embedding"] = {"texts": len(texts), "model_load_seconds": round(load_seconds, 3),
+                                "seconds": round(elapsed, 3), "texts_per_second": round(len(texts) / elapsed, 1)}
+        service.close()
+
+    if "search" in stages:
+        store = VectorStore()
+        start = time.perf_counter()
+        for index, doc_chunks in enumerate(chunks):
+            store.add_documents(doc_chunks, f"doc{index}")
+        index_seconds = time.perf_counter() - start
+        store.backend.build()
+        retriever = Retriever(store)
+        questions = [f"{question} ({i})" for i in range(args.searches) for question in QUESTIONS][:args.searches]
+        search, retrieve = [], []
+        for i, question in enumerate(questions):
+            document_id = f"doc{i % len(chunks)}"
+            start = time.perf_counter()
+            store.search(question, 4, document_id)
+            search.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            retriever.retrieve(question, 4, document_id)
+            retrieve.append(time.perf_counter() - start)
+        results["search"] = {"chunks": store.backend.count(), "index_seconds": round(index_seconds, 3),
+                             "hybrid": percentiles(search), "with_rerank": percentiles(retrieve)}
+        store.close()
+
+
+def run_load(concurrency, calls):
+    """Run the calls on `concurrency` threads.
+
+    Returns (result, seconds, error) per call, and the wall time.
+    """
+    def timed(call):
+        start = time.perf_counter()
+        try:
+            return call(), time.perf_counter() - start, None
+        except Exception as e:
+            return None, time.perf_counter() - start, str(e)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed, calls))
+    return outcomes, time.perf_counter() - start
+
+
+def load_summary(outcomes, wall_seconds, concurrency):
+    ok = [seconds for _, seconds, error in outcomes if error is None]
+    summary = {"concurrency": concurrency, "errors": len(outcomes) - len(ok),
+               "throughput_per_second": round(len(outcomes) / wall_seconds, 2)}
+    if ok:
+        summary.update(percentiles(ok))
+    errors = [error for _, _, error in outcomes if error is not None]
+    if errors:
+        summary["first_error"] = errors[0]
+    return summary
+
+
+def bench_e2e(args, pdfs, workdir, results):
+    from fake_ollama import FakeOllamaServer
+
+    fake = FakeOllamaServer(latency=args.llm_latency, token_latency=args.token_latency).start()
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(APP_DIR), os.environ.get("PYTHONPATH")])),
+        "OLLAMA_HOST": fake.url,
+        "RFP_DATA_DIR": workdir,
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for(f"{base}/health/ready", time.perf_counter(), args.timeout)
+        client = httpx.Client(base_url=base, timeout=args.timeout,
+                              limits=httpx.Limits(max_connections=args.concurrency * 2))
+
+        def analyze(pdf):
+            def call():
+                with open(pdf, "rb") as f:
+                    job = client.post("/analyze", files={"file": (Path(pdf).name, f, "application/pdf")}).json()
+                while job.get("status") not in ("completed", "failed", None):
+                    time.sleep(0.05)
+                    job = client.get(f"/jobs/{job['job_id']}").json()
+                if job.get("status") != "completed":
+                    raise RuntimeError(job.get("error") or job.get("detail") or "ingestion failed")
+                return job
+            return call
+
+        outcomes, wall = run_load(args.concurrency, [analyze(pdf) for pdf in pdfs])
+        results["analyze"] = load_summary(outcomes, wall, args.concurrency)
+        document_ids = [job["document_id"] for job, _, error in outcomes if error is None]
+        if not document_ids:
+            return
+
+        def query(question, document_id):
+            def call():
+                response = client.post("/query", json={"question": question, "document_id": document_id})
+                response.raise_for_status()
+                return response.json()
+            return call
+
+        calls = [query(QUESTIONS[i % len(QUESTIONS)], document_ids[(i // len(QUESTIONS)) % len(document_ids)])
+                 for i in range(args.queries)]
+        outcomes, wall = run_load(args.concurrency, calls)
+        results["query"] = load_summary(outcomes, wall, args.concurrency)
+        results["query"]["cached"] = sum(1 for result, _, error in outcomes if error is None and result.get("cached"))
+
+        def summary(document_id):
+            def call():
+                sections = []
+                with client.stream("GET", "/summary", params={"document_id": document_id}) as response:
+                    for line in response.iter_lines():
+                        if line:
+                            sections.append(json.loads(line))
+                if any("error" in section for section in sections):
+                    raise RuntimeError(next(section["error"] for section in sections if "error" in section))
+                return {"sections": len(sections)}
+            return call
+
+        calls = [summary(document_ids[i % len(document_ids)]) for i in range(args.summaries)]
+        outcomes, wall = run_load(args.concurrency, calls)
+        results["summary"] = load_summary(outcomes, wall, args.concurrency)
+        client.close()
+    finally:
+        server.terminate()
+        server.wait()
+        fake.stop()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--documents", type=int, default=4, help="Synthetic RFPs to generate")
+    parser.add_argument("--pages", type=int, default=50, help="Pages per synthetic RFP")
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients in the e2e stage")
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--summaries", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake Ollama seconds per generation")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Fake Ollama seconds between streamed tokens")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="rfp-bench-")
+    results = {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "parameters": vars(args),
+    }
+    try:
+        pdfs = [make_rfp_pdf(os.path.join(workdir, f"rfp{seed}.pdf"), args.pages, seed)
+                for seed in range(args.documents)]
+        in_process = [stage for stage in args.stages if stage != "e2e"]
+        if in_process:
+            # Vector store, keyword index and caches live in RFP_DATA_DIR, read when config is first imported
+            stage_dir = os.path.join(workdir, "stages")
+            os.mkdir(stage_dir)
+            os.environ["RFP_DATA_DIR"] = stage_dir
+            bench_stages(args, pdfs, in_process, results)
+        if "e2e" in args.stages:
+            e2e_dir = os.path.join(workdir, "server")
+            os.mkdir(e2e_dir)
+            bench_e2e(args, pdfs, e2e_dir, results)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
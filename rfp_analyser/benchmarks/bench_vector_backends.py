@@ -0,0 +1,110 @@
+"""Compare vector backends: index build time and p50/p99 query latency.
+
+Synthetic normalized vectors with the shape of all-MiniLM-L6-v2 embeddings
+are split into documents of --chunks-per-document chunks. Queries are timed
+over the whole corpus and limited to one document, as /query does.
+
+    python benchmarks/bench_vector_backends.py --sizes 10000 100000 1000000
+    python benchmarks/bench_vector_backends.py --backends faiss:flat faiss:hnsw --sizes 100000
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from vector_backends import ChromaBackend, FaissBackend
+
+EMBEDDING_DIM = 384
+BATCH_SIZE = 5000  # under ChromaDB's maximum batch size
+
+
+def vectors(start: int, count: int) -> np.ndarray:
+    """Deterministic normalized vectors for chunks start..start+count."""
+    rows = np.random.default_rng(start).standard_normal((count, EMBEDDING_DIM), dtype=np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def open_backend(spec: str, path: str):
+    name, _, index_type = spec.partition(":")
+    if name == "chroma":
+        return ChromaBackend(path)
+    return FaissBackend(path, index_type=index_type or "flat")
+
+
+def build(backend, size: int, chunks_per_document: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, size, BATCH_SIZE):
+        count = min(BATCH_SIZE, size - offset)
+        ids = [f"doc{(offset + i) // chunks_per_document}:{offset + i}" for i in range(count)]
+        backend.upsert(
+            ids,
+            vectors(offset, count).tolist(),
+            [f"chunk {chunk_id}" for chunk_id in ids],
+            [
+                {'document_id': chunk_id.split(':')[0], 'chunk_hash': chunk_id}
+                for chunk_id in ids
+            ]
+        )
+    backend.build()
+    return time.perf_counter() - start
+
+
+def latencies(backend, size: int, queries: int, k: int, chunks_per_document: int, per_document: bool):
+    rng = np.random.default_rng(0)
+    timings = []
+    for _ in range(queries):
+        target = int(rng.integers(size))
+        query = vectors(target, 1)[0] + rng.normal(0, 0.01, EMBEDDING_DIM).astype(np.float32)
+        document_id = f"doc{target // chunks_per_document}" if per_document else None
+        start = time.perf_counter()
+        backend.query([query.tolist()], k, document_id)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1000, np.percentile(timings, 99) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--backends", nargs="+", default=["chroma", "faiss:flat", "faiss:hnsw"],
+                        help="chroma, faiss:flat or faiss:hnsw")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--chunks-per-document", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for spec in args.backends:
+            workdir = tempfile.mkdtemp()
+            try:
+                backend = open_backend(spec, workdir)
+                build_seconds = build(backend, size, args.chunks_per_document)
+                result = {"backend": spec, "chunks": size, "build_seconds": round(build_seconds, 2)}
+                for scope, per_document in (("all", False), ("document", True)):
+                    p50, p99 = latencies(backend, size, args.queries, args.k, args.chunks_per_document, per_document)
+                    result[f"{scope}_p50_ms"] = round(p50, 2)
+                    result[f"{scope}_p99_ms"] = round(p99, 2)
+                backend.close()
+                results.append(result)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'backend':<11} {'chunks':>8} {'build s':>8} {'all p50':>8} {'all p99':>8} {'doc p50':>8} {'doc p99':>8}")
+        for r in results:
+            print(f"{r['backend']:<11} {r['chunks']:>8} {r['build_seconds']:>8} {r['all_p50_ms']:>8} "
+                  f"{r['all_p99_ms']:>8} {r['document_p50_ms']:>8} {r['document_p99_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Measure /query throughput as the number of server worker processes grows.
+
+For each worker count a Chroma server, a fake Ollama and `uvicorn --workers N`
+are started in a fresh data directory. A synthetic RFP is ingested through
+one worker and its job polled through whichever worker answers, then
+concurrent clients ask distinct questions so the answer cache is never hit.
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --concurrency 16 --queries 256
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+import httpx
+
+from bench_startup import free_port, wait_for
+from bench_suite import QUESTIONS, git_commit, load_summary, run_load
+from synthetic_rfp import make_rfp_pdf
+
+
+def start_chroma(data_dir: str, timeout: float):
+    """Start a Chroma server on a free port; returns the process and the port."""
+    port = free_port()
+    chroma = shutil.which("chroma") or str(Path(sys.executable).with_name("chroma"))
+    server = subprocess.Popen(
+        [chroma, "run", "--path", os.path.join(data_dir, "chroma"), "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    wait_for(f"http://127.0.0.1:{port}/api/v2/heartbeat", time.perf_counter(), timeout)
+    return server, port
+
+
+def bench_workers(args, pdf: str, workers: int, fake_url: str):
+    data_dir = tempfile.mkdtemp(prefix="rfp-workers-")
+    chroma, chroma_port = start_chroma(data_dir, args.timeout)
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(APP_DIR), os.environ.get("PYTHONPATH")])),
+        "OLLAMA_HOST": fake_url,
+        "RFP_DATA_DIR": data_dir,
+        "RFP_VECTOR_BACKEND": "chroma",
+        "RFP_CHROMA_HOST": "127.0.0.1",
+        "RFP_CHROMA_PORT": str(chroma_port),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=data_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    client = httpx.Client(base_url=base, timeout=args.timeout,
+                          limits=httpx.Limits(max_connections=args.concurrency * 2))
+    try:
+        start = time.perf_counter()
+        wait_for(f"{base}/health/live", start, args.timeout)
+        # Each worker warms up on its own; wait until a round of fresh connections finds them all ready
+        while not all(httpx.get(f"{base}/health/ready", timeout=args.timeout).status_code == 200
+                      for _ in range(workers * 4)):
+            if time.perf_counter() - start > args.timeout:
+                raise TimeoutError(f"{workers} workers not ready after {args.timeout}s")
+            time.sleep(0.5)
+        ready_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(pdf, "rb") as f:
+            job = client.post("/analyze", files={"file": (Path(pdf).name, f, "application/pdf")}).json()
+        while job.get("status") not in ("completed", "failed", None):
+            time.sleep(0.05)
+            # A new connection each poll, so any worker may answer
+            job = httpx.get(f"{base}/jobs/{job['job_id']}", timeout=args.timeout).json()
+        if job.get("status") != "completed":
+            raise RuntimeError(job.get("error") or job.get("detail") or "ingestion failed")
+        analyze_seconds = time.perf_counter() - start
+        document_id = job["document_id"]
+
+        def query(question):
+            def call():
+                response = client.post("/query", json={"question": question, "document_id": document_id})
+                response.raise_for_status()
+                return response.json()
+            return call
+
+        calls = [query(f"{QUESTIONS[i % len(QUESTIONS)]} ({i})") for i in range(args.queries)]
+        outcomes, wall = run_load(args.concurrency, calls)
+        result = {"workers": workers, "ready_seconds": round(ready_seconds, 2),
+                  "analyze_seconds": round(analyze_seconds, 2), **load_summary(outcomes, wall, args.concurrency)}
+        result["cached"] = sum(1 for answer, _, error in outcomes if error is None and answer.get("cached"))
+        return result
+    finally:
+        client.close()
+        server.terminate()
+        server.wait()
+        chroma.terminate()
+        chroma.wait()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pages", type=int, default=30, help="Pages in the synthetic RFP")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=256)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake Ollama seconds per generation")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    from fake_ollama import FakeOllamaServer
+
+    workdir = tempfile.mkdtemp(prefix="rfp-bench-")
+    fake = FakeOllamaServer(latency=args.llm_latency).start()
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "parameters": vars(args),
+        "runs": [],
+    }
+    try:
+        pdf = make_rfp_pdf(os.path.join(workdir, "rfp.pdf"), args.pages, 0)
+        for workers in args.workers:
+            results["runs"].append(bench_workers(args, pdf, workers, fake.url))
+    finally:
+        fake.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
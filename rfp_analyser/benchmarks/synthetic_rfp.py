@@ -0,0 +1,131 @@
+"""Generate synthetic RFP PDFs for benchmarks.
+
+Documents have numbered and all-caps headings, abbreviations defined on
+first use, amounts, dates, percentages, tables of line items and a running
+header and footer on every page, so every ingestion stage has realistic
+work to do. The same seed always gives the same document.
+
+    python benchmarks/synthetic_rfp.py tender.pdf --pages 300 --seed 1
+"""
+import argparse
+import random
+import textwrap
+from typing import List
+
+import fitz  # PyMuPDF
+
+SECTIONS = [
+    "Introduction", "Project Background and Purpose", "Project Objectives", "Scope of Work",
+    "Eligibility Criteria", "Earnest Money Deposit", "Bill of Materials", "Technical Requirements",
+    "Service Level Agreements", "Payment Terms", "Evaluation Criteria", "Consortium Participation",
+    "Project Location and Logistics", "Terms and Conditions", "Instructions to Bidders",
+]
+
+ABBREVIATIONS = {
+    "EMD": "Earnest Money Deposit", "SLA": "Service Level Agreement", "BOM": "Bill of Materials",
+    "PBG": "Performance Bank Guarantee", "OEM": "Original Equipment Manufacturer",
+    "MSE": "Micro and Small Enterprises", "LOA": "Letter of Award", "POC": "Proof of Concept",
+    "AMC": "Annual Maintenance Contract", "TCO": "Total Cost of Ownership",
+}
+
+SENTENCES = [
+    "The bidder shall submit the {abbr} of Rs. {amount} along with the technical bid.",
+    "All bids must reach the tendering authority on or before {date} at {hour}:00 hours.",
+    "The successful bidder shall furnish a {abbr} equal to {percent}% of the contract value.",
+    "Penalty for delay shall be {percent}% of the order value per week, up to a maximum of 10%.",
+    "The {abbr} shall cover all equipment for a period of {years} years from the date of acceptance.",
+    "Payment of {percent}% shall be released on delivery and the balance on commissioning.",
+    "Bidders must have an average annual turnover of Rs. {amount} in the last three financial years.",
+    "Uptime of {uptime}% shall be maintained, measured monthly, failing which the {abbr} penalty applies.",
+    "The {abbr} shall be issued within {days} days of the final evaluation.",
+    "Bidders shall quote for every line item; partial bids will be rejected.",
+    "Clarifications may be sought by email no later than {date}.",
+    "The purchaser reserves the right to accept or reject any bid without assigning any reason.",
+]
+
+ITEMS = ["Core switch", "Access switch", "Firewall", "Rack server", "Storage array", "UPS 10 kVA",
+         "Structured cabling", "Wireless access point", "Network management software", "Workstation"]
+
+LINES_PER_PAGE = 50
+LINE_WIDTH = 100
+
+
+def _amount(rng: random.Random) -> str:
+    """An amount in Indian digit grouping, e.g. 5,00,000."""
+    value = str(rng.randint(1, 999) * 1000)
+    head, tail = value[:-3], value[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ",".join(filter(None, [head] + groups + [tail]))
+
+
+def _sentence(rng: random.Random, defined: set) -> str:
+    template = rng.choice(SENTENCES)
+    abbr = rng.choice(list(ABBREVIATIONS))
+    # Define each abbreviation on first use, as tenders do, in the "EMD (Earnest Money Deposit)"
+    # form the ingestion pipeline picks up
+    written = abbr if abbr in defined else f"{abbr} ({ABBREVIATIONS[abbr]})"
+    if "{abbr}" in template:
+        defined.add(abbr)
+    return template.format(
+        abbr=written, amount=_amount(rng), percent=rng.choice([2, 3, 5, 10, 20, 30]),
+        date=f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025", hour=rng.randint(10, 17),
+        years=rng.randint(1, 5), uptime=rng.choice(["99.5", "99.9", "98"]), days=rng.choice([7, 15, 30])
+    )
+
+
+def body_lines(pages: int, seed: int = 0) -> List[str]:
+    """The document's lines, without running headers and footers."""
+    rng = random.Random(seed)
+    target = pages * (LINES_PER_PAGE - 4)
+    lines: List[str] = []
+    defined: set = set()
+    section = 0
+    while len(lines) < target:
+        title = SECTIONS[section % len(SECTIONS)]
+        number = section + 1
+        lines += ["", f"{number}. {title}" if section % 3 else f"SECTION {number}: {title.upper()}", ""]
+        for subsection in range(rng.randint(2, 4)):
+            lines.append(f"{number}.{subsection + 1} {rng.choice(SECTIONS)} requirements")
+            paragraph = " ".join(_sentence(rng, defined) for _ in range(rng.randint(4, 9)))
+            lines += textwrap.wrap(paragraph, LINE_WIDTH)
+            if rng.random() < 0.3:
+                lines.append("Sl No | Item | Quantity | Unit")
+                lines += [f"{i + 1} | {rng.choice(ITEMS)} | {rng.randint(1, 200)} | Nos" for i in range(rng.randint(3, 8))]
+        section += 1
+    return lines[:target]
+
+
+def make_rfp_pdf(path: str, pages: int, seed: int = 0) -> str:
+    """Write a synthetic RFP of the given number of pages to `path`."""
+    lines = body_lines(pages, seed)
+    per_page = LINES_PER_PAGE - 4
+    reference = f"RFP/{seed:04d}/2025"
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        text = "\n".join(
+            [f"Tender No. {reference} - Supply, Installation and Commissioning of IT Infrastructure", ""]
+            + lines[page_number * per_page:(page_number + 1) * per_page]
+            + ["", f"Page {page_number + 1} of {pages}"]
+        )
+        page.insert_text((40, 40), text, fontsize=8)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    make_rfp_pdf(args.path, args.pages, args.seed)
+    print(f"Wrote {args.pages} pages to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import logging
+import re
+from collections import Counter, deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+from chunker import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_DIGITS = re.compile(r"\d+")
+_WORDS = re.compile(r"[^\W\d_]+")
+
+
+def fingerprint(line: str) -> int:
+    """Hash a line so that repeats match despite case, spacing and numbering.
+
+    Digit runs are masked when at least two words remain, so "Page 3 of 40"
+    and "Page 4 of 40" are the same line, while bare numbered headings such
+    as "2." or "Section 3" keep the number that tells them apart.
+    """
+    line = " ".join(line.lower().split())
+    if len(_WORDS.findall(line)) >= 2:
+        line = _DIGITS.sub("#", line)
+    return hash(line)
+
+
+class BoilerplateFilter:
+    """Strip the letterheads, reference lines and footers repeated on many pages.
+
+    The first and last few non-empty lines of each page are fingerprinted
+    and counted once per page. An edge line is dropped when its fingerprint
+    occurs on at least `min_pages` pages and on `min_ratio` of the pages
+    seen so far. Pages pass through with `window` pages of lookahead, so
+    the document is still streamed: time is linear in its length and memory
+    holds only the window and one counter entry per distinct edge line.
+
+    The chunks saved are estimated from the tokens removed, at the chunk
+    size and overlap in config, rather than by chunking the text twice.
+    """
+
+    def __init__(self, edge_lines: Optional[int] = None, min_pages: Optional[int] = None,
+                 min_ratio: Optional[float] = None, window: Optional[int] = None):
+        self.edge_lines = edge_lines or config.BOILERPLATE_EDGE_LINES
+        self.min_pages = min_pages or config.BOILERPLATE_MIN_PAGES
+        self.min_ratio = config.BOILERPLATE_MIN_RATIO if min_ratio is None else min_ratio
+        self.window = config.BOILERPLATE_WINDOW if window is None else window
+        self.counts: Counter = Counter()
+        self.pages_seen = 0
+        self.lines_removed = 0
+        self.chars_removed = 0
+        self.tokens_removed = 0
+
+    def filter(self, pages: Iterable[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, text) pairs in order with repeated edge lines removed."""
+        pending = deque()
+        for number, text in pages:
+            lines = text.split("\n")
+            edges = self._edges(lines)
+            self.counts.update(set(edges.values()))
+            self.pages_seen += 1
+            pending.append((number, lines, edges))
+            if len(pending) > self.window:
+                yield self._strip(*pending.popleft())
+        while pending:
+            yield self._strip(*pending.popleft())
+
+    def stats(self) -> Dict[str, Any]:
+        """Report what was removed, with the chunks it would have filled."""
+        # Each chunk after the first adds its size less the overlap carried into it
+        stride = max(1, config.CHUNK_TOKENS - 2 - config.CHUNK_OVERLAP_TOKENS)
+        return {
+            "boilerplate_lines_removed": self.lines_removed,
+            "boilerplate_chars_removed": self.chars_removed,
+            "boilerplate_tokens_removed": self.tokens_removed,
+            "boilerplate_chunks_removed": round(self.tokens_removed / stride)
+        }
+
+    def _edges(self, lines: List[str]) -> Dict[int, int]:
+        """Fingerprints of the first and last non-empty lines, by line index."""
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        edge = filled[:self.edge_lines] + filled[-self.edge_lines:]
+        return {i: fingerprint(lines[i]) for i in edge}
+
+    def _strip(self, number: int, lines: List[str], edges: Dict[int, int]) -> Tuple[int, str]:
+        threshold = max(self.min_pages, self.min_ratio * self.pages_seen)
+        removed = {i for i, key in edges.items() if self.counts[key] >= threshold}
+        self.lines_removed += len(removed)
+        self.chars_removed += sum(len(lines[i]) for i in removed)
+        self.tokens_removed += sum(sum(estimate_tokens(lines[i].split())) for i in removed)
+        return number, "\n".join(line for i, line in enumerate(lines) if i not in removed)
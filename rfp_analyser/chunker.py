@@ -0,0 +1,185 @@
+import logging
+import math
+import re
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+# One pattern for every heading style: "3.2 Scope of Work", "Section 4: Eligibility",
+# "ANNEXURE-II", "IV. PAYMENT TERMS", all-caps lines such as "EVALUATION CRITERIA"
+# and the usual unnumbered RFP section names
+HEADING_PATTERN = re.compile(r"""
+    ^(?:
+        (?P<number>
+            (?i:section|chapter|clause|part|annexure|appendix|schedule)[\s-]*
+                (?:\d+(?:\.\d+)*|[IVXLC]+|[A-Z])\b\s*[.:)-]?
+            |
+            (?:\d{1,2}(?:\.\d{1,2}){1,3}\.?|\d{1,2}[.)]|[IVXLC]{1,5}[.)])(?=\s)
+        )
+        \s*(?P<title>[A-Z][^\n]{0,80}?)?
+        |
+        (?P<known>(?i:scope\ of\ work|technical\ (?:requirements|specifications)|project\ objectives
+            |evaluation\ criteria|eligibility\ criteria|terms\ and\ conditions|payment\ terms
+            |service\ level\ agreements?|bill\ of\ materials|instructions\ to\ bidders))
+        |
+        (?P<caps>[A-Z][A-Z0-9&/,()'\s-]{3,80})
+    )\s*$
+""", re.VERBOSE)
+
+_CAPS = re.compile(r"[A-Z]")
+_LOWER = re.compile(r"[a-z]")
+_ESTIMATE_PIECES = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_")
+
+_token_counter: Optional[TokenCounter] = None
+_token_counter_lock = threading.Lock()
+
+
+def estimate_tokens(words: List[str]) -> List[int]:
+    """Approximate WordPiece token counts without loading a tokenizer.
+
+    Punctuation marks are tokens of their own, digit runs split roughly every
+    three digits and long words into several pieces, so the estimate errs on
+    the high side and chunks stay inside the model window.
+    """
+    counts = []
+    for word in words:
+        count = 0
+        for piece in _ESTIMATE_PIECES.findall(word):
+            if piece[0].isdigit():
+                count += math.ceil(len(piece) / 3)
+            elif piece[0].isalpha():
+                count += 1 + len(piece) // 7
+            else:
+                count += 1
+        counts.append(count)
+    return counts
+
+
+def get_token_counter() -> TokenCounter:
+    """Return a function giving the embedding model's token count for each word.
+
+    The model's own tokenizer is used unless RFP_CHUNK_TOKENIZER is
+    "estimate" or the tokenizer cannot be loaded.
+    """
+    global _token_counter
+    if _token_counter is None:
+        with _token_counter_lock:
+            if _token_counter is None:
+                _token_counter = _load_token_counter()
+    return _token_counter
+
+
+def _load_token_counter() -> TokenCounter:
+    if config.CHUNK_TOKENIZER == "estimate":
+        return estimate_tokens
+    try:
+        from transformers import AutoTokenizer
+
+        name = config.EMBEDDING_MODEL
+        tokenizer = AutoTokenizer.from_pretrained(name if "/" in name else f"sentence-transformers/{name}")
+        logger.info(f"Counting chunk tokens with the {name} tokenizer")
+        return lambda words: [len(ids) for ids in tokenizer(words, add_special_tokens=False)["input_ids"]]
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {config.EMBEDDING_MODEL}, estimating token counts: {e}")
+        return estimate_tokens
+
+
+def match_heading(line: str) -> Optional[Tuple[str, str]]:
+    """Return (number, title) if the line looks like a heading, else None."""
+    line = line.strip()
+    if not 3 <= len(line) <= 100 or line[-1] in ".,;" or len(line.split()) > 12:
+        return None
+    match = HEADING_PATTERN.match(line)
+    if match is None:
+        return None
+    if match.group("known"):
+        return "", line
+    if match.group("caps"):
+        # Needs to be genuinely upper case and more than a short code
+        if _LOWER.search(line) or len(_CAPS.findall(line)) < 5:
+            return None
+        return "", line
+    number = match.group("number").strip().rstrip(".):-").strip()
+    title = (match.group("title") or "").strip()
+    if not title and not re.match(r"(?i)section|chapter|clause|part|annexure|appendix|schedule", number):
+        return None
+    return number, title
+
+
+class StructuralChunker:
+    """Splits a stream of pages into sections and token-bounded chunks in one pass.
+
+    A section runs from one heading to the next, so sections never overlap
+    and text outside any heading still lands in a section. Each section is
+    cut into chunks of at most `max_tokens` embedding-model tokens, with
+    `overlap` tokens repeated between neighbouring chunks of the same section.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, overlap: Optional[int] = None,
+                 token_counter: Optional[TokenCounter] = None):
+        # Two tokens of the model window go to [CLS] and [SEP]
+        self.max_tokens = (max_tokens or config.CHUNK_TOKENS) - 2
+        self.overlap = config.CHUNK_OVERLAP_TOKENS if overlap is None else overlap
+        if not 0 <= self.overlap < self.max_tokens:
+            raise ValueError("Chunk overlap must be smaller than the chunk size")
+        self.token_counter = token_counter
+
+    def chunks(self, pages: Iterable[Tuple[int, str]]) -> Iterator[Tuple[str, Dict]]:
+        count_tokens = self.token_counter or get_token_counter()
+        words: List[Tuple[str, int, int]] = []  # (word, tokens, page)
+        tokens = 0
+        fresh = 0  # words added since the last chunk was emitted
+        section = {"section": "", "section_number": "", "section_index": 0}
+        chunk_id = 0
+
+        def emit():
+            nonlocal chunk_id
+            chunk = (" ".join(word for word, _, _ in words), {
+                "chunk_id": chunk_id,
+                **section,
+                "page_start": words[0][2],
+                "page_end": words[-1][2],
+                "token_count": tokens
+            })
+            chunk_id += 1
+            return chunk
+
+        for page_number, text in pages:
+            for line in text.splitlines():
+                line_words = line.split()
+                if not line_words:
+                    continue
+
+                heading = match_heading(line)
+                if heading is not None:
+                    if fresh:
+                        yield emit()
+                    words, tokens, fresh = [], 0, 0
+                    section = {
+                        "section": heading[1] or heading[0],
+                        "section_number": heading[0],
+                        "section_index": section["section_index"] + 1
+                    }
+
+                for word, word_tokens in zip(line_words, count_tokens(line_words)):
+                    # A single word longer than the window is kept whole; the model truncates it
+                    if tokens + word_tokens > self.max_tokens and fresh:
+                        yield emit()
+                        # Carry the tail of the chunk over as overlap
+                        kept = 0
+                        start = len(words)
+                        while start > 0 and kept + words[start - 1][1] <= self.overlap:
+                            start -= 1
+                            kept += words[start][1]
+                        words, tokens, fresh = words[start:], kept, 0
+                    words.append((word, word_tokens, page_number))
+                    tokens += word_tokens
+                    fresh += 1
+
+        if fresh:
+            yield emit()
@@ -0,0 +1,136 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read an on/off setting from the environment."""
+    value = os.getenv(name)
+    return value.strip().lower() in ("1", "true", "yes", "on") if value else default
+
+
+def _env_path(name: str, default: str) -> str:
+    """Read a file or directory setting, resolved against DATA_DIR.
+
+    Paths are made absolute once, at import, so every worker process uses
+    the same files whatever its working directory.
+    """
+    return os.path.join(DATA_DIR, os.path.expanduser(os.getenv(name) or default))
+
+
+# Storage: indexes, caches and the registry live here, shared by every worker.
+# A relative RFP_DATA_DIR is taken from the package directory, not the working directory
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.normpath(os.path.join(PACKAGE_DIR, os.path.expanduser(os.getenv("RFP_DATA_DIR", "."))))
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# LLM generation
+OLLAMA_HOST = os.getenv("OLLAMA_HOST")  # None lets the ollama client use its default
+OLLAMA_MODEL = os.getenv("RFP_OLLAMA_MODEL", "granite3.2:8b")
+LLM_TIMEOUT = _env_float("RFP_LLM_TIMEOUT", 300.0)
+LLM_CONCURRENCY = _env_int("RFP_LLM_CONCURRENCY", 4)
+
+# PDF extraction
+PDF_BACKEND = os.getenv("RFP_PDF_BACKEND", "pymupdf")  # "pymupdf" or "pdfminer"
+PDF_EXTRACT_WORKERS = _env_int("RFP_PDF_EXTRACT_WORKERS", os.cpu_count() or 1)
+PDF_PAGES_PER_TASK = _env_int("RFP_PDF_PAGES_PER_TASK", 25)
+
+# OCR of scanned pages
+OCR_ENABLED = _env_bool("RFP_OCR_ENABLED", True)  # needs paddleocr installed
+OCR_DPI = _env_int("RFP_OCR_DPI", 200)  # pages are rasterized at this resolution
+OCR_LANG = os.getenv("RFP_OCR_LANG", "en")
+OCR_CACHE_PATH = _env_path("RFP_OCR_CACHE_PATH", ".ocr_cache.sqlite3")
+
+# Boilerplate removal: lines repeated at the top or bottom of many pages
+BOILERPLATE_EDGE_LINES = _env_int("RFP_BOILERPLATE_EDGE_LINES", 3)  # lines checked at each end of a page
+BOILERPLATE_MIN_PAGES = _env_int("RFP_BOILERPLATE_MIN_PAGES", 3)
+BOILERPLATE_MIN_RATIO = _env_float("RFP_BOILERPLATE_MIN_RATIO", 0.3)  # share of the pages seen so far
+BOILERPLATE_WINDOW = _env_int("RFP_BOILERPLATE_WINDOW", 20)  # pages of lookahead before a page is released
+
+# Embeddings
+EMBEDDING_MODEL = os.getenv("RFP_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = _env_int("RFP_EMBEDDING_BATCH_SIZE", 64)
+EMBEDDING_DEVICE = os.getenv("RFP_EMBEDDING_DEVICE")  # None picks CUDA when available
+EMBEDDING_PROCESSES = _env_int("RFP_EMBEDDING_PROCESSES", 1)
+EMBEDDING_LRU_SIZE = _env_int("RFP_EMBEDDING_LRU_SIZE", 10000)
+EMBEDDING_CACHE_PATH = _env_path("RFP_EMBEDDING_CACHE_PATH", ".embedding_cache.sqlite3")
+
+# Chunking
+CHUNK_TOKENS = _env_int("RFP_CHUNK_TOKENS", 256)  # all-MiniLM-L6-v2's input window
+CHUNK_OVERLAP_TOKENS = _env_int("RFP_CHUNK_OVERLAP_TOKENS", 32)
+CHUNK_TOKENIZER = os.getenv("RFP_CHUNK_TOKENIZER", "model")  # "model" or "estimate"
+
+# Vector storage
+VECTOR_BACKEND = os.getenv("RFP_VECTOR_BACKEND", "chroma")  # "chroma" or "faiss"
+CHROMA_PATH = _env_path("RFP_CHROMA_PATH", ".chroma_db")
+# A Chroma server shared by every worker; without one, each process opens CHROMA_PATH itself
+CHROMA_HOST = os.getenv("RFP_CHROMA_HOST")
+CHROMA_PORT = _env_int("RFP_CHROMA_PORT", 8000)
+FAISS_PATH = _env_path("RFP_FAISS_PATH", ".faiss_index")
+FAISS_INDEX_TYPE = os.getenv("RFP_FAISS_INDEX_TYPE", "flat")  # "flat" (exact) or "hnsw" (approximate)
+FAISS_HNSW_M = _env_int("RFP_FAISS_HNSW_M", 32)
+
+# Retrieval
+SEARCH_K = _env_int("RFP_SEARCH_K", 4)
+KEYWORD_INDEX_PATH = _env_path("RFP_KEYWORD_INDEX_PATH", ".keyword_index.sqlite3")
+# Reciprocal-rank fusion of dense and BM25 results; a weight of 0 turns that side off
+HYBRID_DENSE_WEIGHT = _env_float("RFP_HYBRID_DENSE_WEIGHT", 1.0)
+HYBRID_KEYWORD_WEIGHT = _env_float("RFP_HYBRID_KEYWORD_WEIGHT", 1.0)
+HYBRID_RRF_K = _env_int("RFP_HYBRID_RRF_K", 60)
+HYBRID_CANDIDATES = _env_int("RFP_HYBRID_CANDIDATES", 20)  # results taken from each side before fusing
+# Second stage: over-fetch candidates and re-rank them down to SEARCH_K
+RERANK_MODE = os.getenv("RFP_RERANK_MODE", "mmr")  # "mmr", "cross-encoder" or "none"
+RERANK_CANDIDATES = _env_int("RFP_RERANK_CANDIDATES", 20)
+RERANK_MODEL = os.getenv("RFP_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+MMR_DIVERSITY = _env_float("RFP_MMR_DIVERSITY", 0.3)  # 0 ranks by relevance only
+DUPLICATE_THRESHOLD = _env_float("RFP_DUPLICATE_THRESHOLD", 0.95)  # cosine similarity
+RETRIEVAL_BUDGET_MS = _env_float("RFP_RETRIEVAL_BUDGET_MS", 500.0)  # re-ranking is skipped past this
+RERANK_BUDGET_MS = _env_float("RFP_RERANK_BUDGET_MS", 300.0)
+
+# Prompt assembly
+PROMPT_MAX_TOKENS = _env_int("RFP_PROMPT_MAX_TOKENS", 1280)  # instructions, question and retrieved context
+
+# Summary generation
+SUMMARY_CONCURRENCY = _env_int("RFP_SUMMARY_CONCURRENCY", 4)
+SUMMARY_FACTS = os.getenv("RFP_SUMMARY_FACTS", "off")  # "off", "answer" or "seed"; see /summary
+
+# Batch question answering
+QUERY_BATCH_CONCURRENCY = _env_int("RFP_QUERY_BATCH_CONCURRENCY", 4)
+QUERY_BATCH_MAX_QUESTIONS = _env_int("RFP_QUERY_BATCH_MAX_QUESTIONS", 100)
+
+# Uploads
+UPLOAD_MAX_BYTES = _env_int("RFP_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+UPLOAD_SPOOL_BYTES = _env_int("RFP_UPLOAD_SPOOL_BYTES", 1024 * 1024)  # larger uploads go to disk as they arrive
+UPLOAD_DIR = os.getenv("RFP_UPLOAD_DIR")  # None uses the system temporary directory
+
+# Ingestion
+INGEST_WORKERS = _env_int("RFP_INGEST_WORKERS", 2)
+INGEST_MAX_PENDING = _env_int("RFP_INGEST_MAX_PENDING", 16)
+INGEST_JOB_HISTORY = _env_int("RFP_INGEST_JOB_HISTORY", 500)
+# An unfinished job not updated for this long is taken to have died with its worker
+INGEST_JOB_STALE_SECONDS = _env_float("RFP_INGEST_JOB_STALE_SECONDS", 600.0)
+
+# Instrumentation
+TIMING_HEADER = _env_bool("RFP_TIMING_HEADER", False)  # X-Timing on every response, not only when asked
+
+# Document registry
+DOCUMENT_REGISTRY_PATH = _env_path("RFP_DOCUMENT_REGISTRY_PATH", ".documents.sqlite3")
+
+# Answer cache
+ANSWER_CACHE_PATH = _env_path("RFP_ANSWER_CACHE_PATH", ".answer_cache.sqlite3")
+ANSWER_CACHE_MAX_ENTRIES = _env_int("RFP_ANSWER_CACHE_MAX_ENTRIES", 10000)
+ANSWER_CACHE_TTL = _env_float("RFP_ANSWER_CACHE_TTL", 7 * 24 * 3600.0)  # 0 disables expiry
@@ -0,0 +1,9 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# main opens its registry, caches and indexes on import; keep them out of the package directory
+if "RFP_DATA_DIR" not in os.environ:
+    os.environ["RFP_DATA_DIR"] = tempfile.mkdtemp(prefix="rfp-tests-")
+    atexit.register(shutil.rmtree, os.environ["RFP_DATA_DIR"], ignore_errors=True)
@@ -0,0 +1,136 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from chunker import TokenCounter, get_token_counter
+from keyword_index import tokenize
+
+# A sentence ends at ., !, ? or ; followed by a capital or bracket; "Rs. 5,000" and
+# "3.2.1" stay in one piece
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z(\[\"'•])")
+MAX_SENTENCE_WORDS = 60  # table rows and run-on clauses are cut into pieces this long
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split chunk text into sentences, breaking overly long ones into word windows."""
+    sentences = []
+    for sentence in SENTENCE_END.split(text):
+        words = sentence.split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[start:start + MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+def count_tokens(text: str, token_counter: Optional[TokenCounter] = None) -> int:
+    """Token count of the text, using the chunker's counter."""
+    words = text.split()
+    return sum((token_counter or get_token_counter())(words)) if words else 0
+
+
+class ContextBuilder:
+    """Assembles retrieved chunks into a prompt context that fits a token budget.
+
+    Given the prompt template, the budget covers the whole prompt: the context
+    gets what the instructions and the question leave over. Sentences repeated across chunks (page headers, overlap between
+    neighbouring chunks, standard clauses) are kept once. If the rest does not
+    fit, each chunk keeps its sentence most relevant to the question, then
+    sentences are added by relevance until the budget is used; whatever is
+    kept is put back in chunk and reading order. Relevance is the IDF-weighted
+    overlap of the sentence's terms with the question's.
+
+    Token counts come from the embedding model's tokenizer, which is close to,
+    but not the same as, the LLM's.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None, token_counter: Optional[TokenCounter] = None):
+        self.max_tokens = max_tokens or config.PROMPT_MAX_TOKENS
+        self.token_counter = token_counter
+
+    def build(self, question: str, texts: List[str], expand: Optional[Callable[[str], str]] = None,
+              max_tokens: Optional[int] = None, template: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        """Return the context for the question and counts of what was kept and removed.
+
+        `texts` are the retrieved chunks, best first. `expand` is applied to the
+        assembled context (abbreviation expansion), and its output is what has
+        to fit the budget, `max_tokens` if given. With `template`, the prompt
+        the context goes into, the budget is for the formatted prompt.
+        """
+        budget = max_tokens or self.max_tokens
+        counter = self.token_counter or get_token_counter()
+        if template is not None:
+            budget -= count_tokens(template.format(context="", question=question), counter)
+        seen = set()
+        chunks: List[List[Dict]] = []
+        duplicates = 0
+        for rank, text in enumerate(texts):
+            sentences = []
+            for position, sentence in enumerate(split_sentences(text)):
+                key = " ".join(sentence.lower().split())
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                sentences.append({
+                    "rank": rank, "position": position, "text": sentence,
+                    "terms": set(tokenize(sentence)),
+                    "tokens": sum(counter(sentence.split()))
+                })
+            chunks.append(sentences)
+
+        sentences = [sentence for chunk in chunks for sentence in chunk]
+        self._score(question, sentences)
+
+        # Greedy selection: the best sentence of every chunk first, then the rest by score
+        leaders = [max(chunk, key=lambda s: s["score"]) for chunk in chunks if chunk]
+        leader_ids = {id(sentence) for sentence in leaders}
+        rest = sorted(
+            (sentence for sentence in sentences if id(sentence) not in leader_ids),
+            key=lambda s: (-s["score"], s["rank"], s["position"])
+        )
+        selected, used = [], 0
+        for sentence in leaders + rest:
+            if used + sentence["tokens"] <= budget:
+                selected.append(sentence)
+                used += sentence["tokens"]
+
+        # Expansion adds tokens; drop the least relevant sentences until the result fits
+        while True:
+            context = self._assemble(selected)
+            if expand is not None:
+                context = expand(context)
+            context_tokens = count_tokens(context, counter)
+            if context_tokens <= budget or len(selected) <= 1:
+                break
+            selected.remove(min(selected, key=lambda s: (s["score"], -s["rank"], -s["position"])))
+
+        stats = {
+            "context_tokens": context_tokens,
+            "source_tokens": sum(s["tokens"] for s in sentences),
+            "sentences_kept": len(selected),
+            "sentences_dropped": len(sentences) - len(selected),
+            "duplicates_removed": duplicates
+        }
+        return context, stats
+
+    @staticmethod
+    def _score(question: str, sentences: List[Dict]):
+        terms = set(tokenize(question))
+        document_frequency = Counter(term for s in sentences for term in s["terms"] & terms)
+        total = len(sentences)
+        for sentence in sentences:
+            matched = sentence["terms"] & terms
+            sentence["score"] = sum(
+                math.log(1 + total / document_frequency[term]) for term in matched
+            ) / (1 + math.log(1 + len(sentence["terms"])))
+
+    @staticmethod
+    def _assemble(selected: List[Dict]) -> str:
+        by_chunk: Dict[int, List[Dict]] = {}
+        for sentence in selected:
+            by_chunk.setdefault(sentence["rank"], []).append(sentence)
+        return "\n\n".join(
+            " ".join(s["text"] for s in sorted(by_chunk[rank], key=lambda s: s["position"]))
+            for rank in sorted(by_chunk)
+        )
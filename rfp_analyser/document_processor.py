@@ -1,76 +1,113 @@
 import re
-from typing import Dict, List, Tuple
-from pdfminer.high_level import extract_text
-# import pytesseract
-# from PIL import Image
-# import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer
 import fitz  # PyMuPDF
 import os
-# import subprocess
+
+import config
+from chunker import StructuralChunker
+from facts import FactExtractor
+from metrics import timed
+from ocr import has_text, ocr_scanned, scanned_pages
+
+PDF_BACKENDS = ("pymupdf", "pdfminer")
+
+
+def _pdfminer_pages(pdf_path: str, page_indexes: List[int]) -> List[str]:
+    """Extract the given zero-based pages with pdfminer, in order."""
+    texts = []
+    for layout in extract_pages(pdf_path, page_numbers=set(page_indexes)):
+        texts.append("".join(
+            element.get_text() for element in layout if isinstance(element, LTTextContainer)
+        ))
+    return texts
+
+
+def extract_page_range(pdf_path: str, start: int, end: int, backend: str = "pymupdf") -> List[Tuple[int, str]]:
+    """Extract pages [start, end) as (page_number, text) pairs, page numbers starting at 1.
+
+    With the PyMuPDF backend, pages where PyMuPDF finds no text are retried
+    with pdfminer. Module-level so it can run in a process pool.
+    """
+    indexes = list(range(start, end))
+    if backend == "pdfminer":
+        return list(zip([i + 1 for i in indexes], _pdfminer_pages(pdf_path, indexes)))
+
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for i in indexes:
+            pages.append((i + 1, doc[i].get_text()))
+
+    empty = [i for i, (_, text) in enumerate(pages) if not has_text(text)]
+    if empty:
+        fallback = _pdfminer_pages(pdf_path, [indexes[i] for i in empty])
+        for i, text in zip(empty, fallback):
+            if has_text(text):
+                pages[i] = (pages[i][0], text)
+    return pages
+
+
+def page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    """Split a document's pages into [start, end) ranges for parallel extraction."""
+    size = max(1, pages_per_task)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def count_pages(pdf_path: str) -> int:
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
 
 class DocumentProcessor:
     def __init__(self):
         self.abbreviation_pattern = re.compile(r'([A-Z]{2,})\s*\(([^)]+)\)')
         self.abbreviations: Dict[str, str] = {}
-        
-        # # Try to find Tesseract path
-        # try:
-        #     # Try to get path from system
-        #     result = subprocess.run(['where', 'tesseract'], capture_output=True, text=True)
-        #     if result.returncode == 0:
-        #         tesseract_path = result.stdout.strip().split('\n')[0]
-        #         pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        #         print(f"Found Tesseract at: {tesseract_path}")
-        #     else:
-        #         # Fallback to common installation paths
-        #         common_paths = [
-        #             r'C:\Program Files\Tesseract-OCR\tesseract.exe',
-        #             r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
-        #             os.path.expanduser('~') + r'\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
-        #         ]
-        #         
-        #         for path in common_paths:
-        #             if os.path.exists(path):
-        #                 pytesseract.pytesseract.tesseract_cmd = path
-        #                 print(f"Found Tesseract at: {path}")
-        #                 break
-        #         else:
-        #             print("Warning: Tesseract not found. OCR may not work properly.")
-        # except Exception as e:
-        #     print(f"Error finding Tesseract: {e}")
-        #     print("Warning: Tesseract not found. OCR may not work properly.")
-
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text from PDF using PDFMiner."""
+        self.fact_extractor = FactExtractor()
+
+    def extract_text_from_pdf(self, pdf_path: str, backend: Optional[str] = None) -> str:
+        """Extract the text of every page of a PDF."""
+        return "\n".join(text for _, text in self.extract_pages_from_pdf(pdf_path, backend))
+
+    @timed("extract")
+    def extract_pages_from_pdf(self, pdf_path: str, backend: Optional[str] = None,
+                               workers: Optional[int] = None) -> List[Tuple[int, str]]:
+        """Extract (page_number, text) pairs, spreading page ranges over a process pool."""
+        backend = backend or config.PDF_BACKEND
+        if backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{backend}', expected one of {PDF_BACKENDS}")
+        workers = workers or config.PDF_EXTRACT_WORKERS
+
         try:
-            text = extract_text(pdf_path)
-            if not text.strip():
+            ranges = page_ranges(count_pages(pdf_path), config.PDF_PAGES_PER_TASK)
+            if workers > 1 and len(ranges) > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+                    results = pool.map(extract_page_range, *zip(*[
+                        (pdf_path, start, end, backend) for start, end in ranges
+                    ]))
+                    pages = [page for result in results for page in result]
+            else:
+                pages = [page for start, end in ranges for page in extract_page_range(pdf_path, start, end, backend)]
+
+            pages = self._ocr_scanned_pages(pdf_path, pages, workers)
+            if not any(has_text(text) for _, text in pages):
                 print("Warning: No text extracted from PDF. The document might be scanned or image-based.")
-            return text
+            return pages
         except Exception as e:
             print(f"Error extracting text: {e}")
-            return ""
-
-    # def _extract_text_with_ocr(self, pdf_path: str) -> str:
-    #     """Extract text using Tesseract OCR."""
-    #     try:
-    #         doc = fitz.open(pdf_path)
-    #         text = []
-    #         
-    #         for page in doc:
-    #             # Convert page to image
-    #             pix = page.get_pixmap()
-    #             img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-    #             
-    #             # Extract text from image
-    #             page_text = pytesseract.image_to_string(img)
-    #             text.append(page_text)
-    #         
-    #         return " ".join(text)
-    #     except Exception as e:
-    #         print(f"Error during OCR: {e}")
-    #         return ""
+            return []
 
+    def _ocr_scanned_pages(self, pdf_path: str, pages: List[Tuple[int, str]],
+                           workers: int) -> List[Tuple[int, str]]:
+        """Replace the text of image-only pages with their OCR output, one page per pool task."""
+        scanned = scanned_pages(pdf_path, pages)
+        if workers > 1 and len(scanned) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(scanned))) as pool:
+                return list(ocr_scanned(pdf_path, pages, scanned, pool))
+        return list(ocr_scanned(pdf_path, pages, scanned))
+
+    @timed("remove_boilerplate")
     def remove_boilerplate(self, text: str) -> str:
         """Remove headers, footers, and page numbers."""
         # Remove page numbers
@@ -84,55 +121,28 @@ class DocumentProcessor:
         matches = self.abbreviation_pattern.finditer(text)
         for match in matches:
             abbr, full_form = match.groups()
-            self.abbreviations[abbr] = full_form
+            # A definition can be wrapped across lines
+            self.abbreviations[abbr] = " ".join(full_form.split())
         return self.abbreviations
 
-    def chunk_document(self, text: str, chunk_size: int = 1000, overlap: int = 150) -> List[Tuple[str, Dict]]:
+    def extract_facts(self, page: int, text: str) -> List[Dict]:
+        """Collect dates, deadlines, amounts, percentages and EMD values from a page."""
+        return self.fact_extractor.extract(page, text)
+
+    @property
+    def facts(self) -> List[Dict]:
+        return self.fact_extractor.facts
+
+    @timed("chunk")
+    def chunk_document(self, text: str, max_tokens: Optional[int] = None,
+                       overlap: Optional[int] = None) -> List[Tuple[str, Dict]]:
         """Split document into chunks with metadata."""
-        # First try section-wise chunking
-        sections = self._split_by_sections(text)
-        if sections:
-            return sections
-
-        # Fallback to fixed-size chunks
-        chunks = []
-        words = text.split()
-        for i in range(0, len(words), chunk_size - overlap):
-            chunk = ' '.join(words[i:i + chunk_size])
-            chunks.append((chunk, {
-                'chunk_id': len(chunks),
-                'start_word': i,
-                'end_word': min(i + chunk_size, len(words))
-            }))
-        return chunks
-
-    def _split_by_sections(self, text: str) -> List[Tuple[str, Dict]]:
-        """Split document by common section headings."""
-        section_patterns = [
-            r'Scope of Work',
-            r'Technical Requirements',
-            r'Project Objectives',
-            r'Evaluation Criteria',
-            r'Terms and Conditions'
-        ]
-        
-        sections = []
-        current_pos = 0
-        
-        for pattern in section_patterns:
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            for i, match in enumerate(matches):
-                start = match.start()
-                if i < len(matches) - 1:
-                    end = matches[i + 1].start()
-                else:
-                    end = len(text)
-                
-                section_text = text[start:end].strip()
-                sections.append((section_text, {
-                    'section_name': match.group(),
-                    'start_pos': start,
-                    'end_pos': end
-                }))
-        
-        return sections if sections else [] 
\ No newline at end of file
+        return list(self.iter_chunks([(1, text)], max_tokens, overlap))
+
+    def iter_chunks(self, pages: Iterable[Tuple[int, str]], max_tokens: Optional[int] = None,
+                    overlap: Optional[int] = None) -> Iterator[Tuple[str, Dict]]:
+        """Yield section-aware, token-bounded chunks as pages stream in.
+
+        Each chunk records its section and the pages it spans; see StructuralChunker.
+        """
+        return StructuralChunker(max_tokens, overlap).chunks(pages) 
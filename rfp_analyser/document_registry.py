@@ -0,0 +1,219 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentRegistry:
+    """SQLite catalogue of the documents held in the vector store.
+
+    Also holds each document's abbreviations and facts and the progress of
+    ingestion jobs, so every API worker process sees the same state.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config.DOCUMENT_REGISTRY_PATH)
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                document_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS abbreviations (
+                document_id TEXT NOT NULL,
+                abbreviation TEXT NOT NULL,
+                full_form TEXT NOT NULL,
+                PRIMARY KEY (document_id, abbreviation)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS facts (
+                document_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                text TEXT NOT NULL,
+                context TEXT NOT NULL,
+                page INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS facts_document ON facts (document_id, kind)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                finished INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished, updated_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_document ON jobs (document_id, finished)")
+        self._conn.commit()
+        logger.info(f"Opened document registry at {self.path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Other workers may be writing; wait for them rather than failing
+        conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def add(self, document_id: str, filename: str, chunk_count: int):
+        """Record a document, replacing any earlier entry for the same content."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (document_id, filename, chunk_count, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (document_id, filename, chunk_count, time.time())
+            )
+            self._conn.commit()
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Return a document's entry, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Return the most recently analyzed document."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Return every document, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM documents ORDER BY created_at DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_abbreviations(self, document_id: str, abbreviations: Dict[str, str]):
+        """Replace the abbreviations found in a document."""
+        with self._lock:
+            self._conn.execute("DELETE FROM abbreviations WHERE document_id = ?", (document_id,))
+            self._conn.executemany(
+                "INSERT INTO abbreviations (document_id, abbreviation, full_form) VALUES (?, ?, ?)",
+                [(document_id, abbr, full_form) for abbr, full_form in abbreviations.items()]
+            )
+            self._conn.commit()
+
+    def get_abbreviations(self, document_id: str) -> Dict[str, str]:
+        """Return the abbreviations found in a document."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT abbreviation, full_form FROM abbreviations WHERE document_id = ?", (document_id,)
+            ).fetchall()
+        return {row['abbreviation']: row['full_form'] for row in rows}
+
+    def set_facts(self, document_id: str, facts: List[Dict[str, Any]]):
+        """Replace the facts extracted from a document."""
+        with self._lock:
+            self._conn.execute("DELETE FROM facts WHERE document_id = ?", (document_id,))
+            self._conn.executemany(
+                "INSERT INTO facts (document_id, kind, value, text, context, page) VALUES (?, ?, ?, ?, ?, ?)",
+                [(document_id, fact['kind'], fact['value'], fact['text'], fact['context'], fact['page'])
+                 for fact in facts]
+            )
+            self._conn.commit()
+
+    def get_facts(self, document_id: str, kinds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Return a document's facts in page order, optionally only those of the given kinds."""
+        query = "SELECT kind, value, text, context, page FROM facts WHERE document_id = ?"
+        params: List[Any] = [document_id]
+        if kinds:
+            query += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params += kinds
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY page, rowid", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_job(self, job: Dict[str, Any], history: Optional[int] = None):
+        """Record an ingestion job's progress, as returned by IngestionJob.to_dict().
+
+        With `history`, only that many finished jobs are kept.
+        """
+        finished = job['status'] in ("completed", "failed")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, document_id, status, state, updated_at, finished) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job['job_id'], job['document_id'], job['status'], json.dumps(job), time.time(), int(finished))
+            )
+            if finished and history is not None:
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE finished = 1 AND job_id NOT IN ("
+                    "SELECT job_id FROM jobs WHERE finished = 1 ORDER BY updated_at DESC LIMIT ?)",
+                    (history,)
+                )
+            self._conn.commit()
+
+    def claim_job(self, job: Dict[str, Any], stale_after: float) -> Optional[Dict[str, Any]]:
+        """Record a new job unless one for the same document is already under way.
+
+        Returns that job's state, or None when this job was recorded. The
+        check and the insert are one transaction, so two workers cannot both
+        claim a document. A job not updated for `stale_after` seconds is
+        taken to have died with its worker.
+        """
+        now = time.time()
+        # On a connection of its own, so waiting for another worker's write lock
+        # doesn't hold up reads through this registry
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT state FROM jobs WHERE document_id = ? AND finished = 0 AND updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (job['document_id'], now - stale_after)
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (job_id, document_id, status, state, updated_at, finished) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (job['job_id'], job['document_id'], job['status'], json.dumps(job), now)
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return json.loads(row['state']) if row else None
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's last recorded progress, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row['state']) if row else None
+
+    def delete(self, document_id: str) -> bool:
+        """Remove a document's entry. Returns False if it was not registered."""
+        with self._lock:
+            self._conn.execute("DELETE FROM abbreviations WHERE document_id = ?", (document_id,))
+            self._conn.execute("DELETE FROM facts WHERE document_id = ?", (document_id,))
+            cursor = self._conn.execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
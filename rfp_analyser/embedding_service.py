@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """Batched sentence embeddings with an in-memory LRU and an on-disk cache.
+
+    Vectors are L2-normalized float32. On CPU, large batches can be spread
+    over several encoder processes.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, device: Optional[str] = None,
+                 batch_size: Optional[int] = None, cache_path: Optional[str] = None,
+                 use_disk_cache: bool = True, lru_size: Optional[int] = None,
+                 processes: Optional[int] = None):
+        self.model_name = model_name or config.EMBEDDING_MODEL
+        self.batch_size = batch_size or config.EMBEDDING_BATCH_SIZE
+        self.lru_size = lru_size or config.EMBEDDING_LRU_SIZE
+
+        try:
+            # Deferred: importing sentence-transformers pulls in torch, which takes seconds
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(self.model_name, device=device or config.EMBEDDING_DEVICE)
+            self.device = str(self.model.device)
+            logger.info(f"Loaded embedding model {self.model_name} on {self.device}")
+        except Exception as e:
+            logger.error(f"Failed to load embedding model: {e}")
+            raise
+
+        # Multi-process encoding only pays off on CPU; a GPU already parallelises a batch
+        self.processes = processes if processes is not None else config.EMBEDDING_PROCESSES
+        self._process_pool = None
+
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._conn = None
+        if use_disk_cache:
+            path = Path(cache_path or config.EMBEDDING_CACHE_PATH)
+            self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+        self.texts_encoded = 0
+        self.encode_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Return an (n, dim) float32 array of normalized embeddings, one row per text."""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        keys = [self._key(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    vectors[key] = self._lru[key]
+        missing = list({key for key in keys if key not in vectors})
+        if missing and self._conn is not None:
+            vectors.update(self._load(missing))
+
+        to_encode = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                to_encode[key] = text
+        hits = len(texts) - sum(1 for key in keys if key in to_encode)
+
+        if to_encode:
+            encoded = self._encode_uncached(list(to_encode.values()))
+            new_vectors = dict(zip(to_encode.keys(), encoded))
+            vectors.update(new_vectors)
+            if self._conn is not None:
+                self._store(new_vectors)
+
+        with self._lock:
+            self.cache_hits += hits
+            self.cache_misses += len(texts) - hits
+            for key in keys:
+                self._lru[key] = vectors[key]
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+        return np.stack([vectors[key] for key in keys])
+
+    def encode_one(self, text: str) -> np.ndarray:
+        return self.encode([text])[0]
+
+    def warm(self, texts: List[str]):
+        """Precompute embeddings so later lookups are cache hits."""
+        self.encode(texts)
+        logger.info(f"Warmed embedding cache with {len(texts)} texts")
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        start = time.perf_counter()
+        if self.device == "cpu" and self.processes > 1 and len(texts) >= 4 * self.batch_size:
+            if self._process_pool is None:
+                self._process_pool = self.model.start_multi_process_pool(["cpu"] * self.processes)
+            embeddings = self.model.encode_multi_process(texts, self._process_pool, batch_size=self.batch_size)
+        else:
+            embeddings = self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.maximum(norms, 1e-12)
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.texts_encoded += len(texts)
+            self.encode_seconds += elapsed
+        return embeddings
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype(np.float32).tobytes()) for key, vector in vectors.items()]
+            )
+            self._conn.commit()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return throughput and cache hit rate."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "model": self.model_name,
+            "device": self.device,
+            "texts_encoded": self.texts_encoded,
+            "encode_seconds": round(self.encode_seconds, 3),
+            "texts_per_sec": round(self.texts_encoded / self.encode_seconds, 1) if self.encode_seconds else 0.0,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "lru_entries": len(self._lru)
+        }
+
+    def close(self):
+        if self._process_pool is not None:
+            self.model.stop_multi_process_pool(self._process_pool)
+            self._process_pool = None
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
@@ -0,0 +1,160 @@
+import re
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from chunker import match_heading
+from context_builder import count_tokens, split_sentences
+
+FACT_KINDS = ("deadline", "date", "emd", "amount", "percentage")
+
+_MONTHS = {name[:3]: number for number, name in enumerate(
+    ["january", "february", "march", "april", "may", "june", "july",
+     "august", "september", "october", "november", "december"], start=1
+)}
+_MONTH = r"(?P<month_name>jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+
+# Indian tenders write numeric dates day first: 15/03/2025, 15-03-2025, 15.03.2025
+NUMERIC_DATE = re.compile(r"\b(?P<day>\d{1,2})[/.-](?P<month>\d{1,2})[/.-](?P<year>\d{4})\b")
+# "15th March 2025", "15-Mar-2025", "15 of March, 2025"
+DAY_MONTH_DATE = re.compile(
+    rf"\b(?P<day>\d{{1,2}})(?:st|nd|rd|th)?[\s-]+(?:of\s+)?{_MONTH}[\s,-]+(?P<year>\d{{4}})\b", re.IGNORECASE
+)
+# "March 15, 2025"
+MONTH_DAY_DATE = re.compile(rf"\b{_MONTH}\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<year>\d{{4}})\b", re.IGNORECASE)
+
+# "Rs. 5,00,000", "INR 2.5 crore", "₹ 10 lakhs", "1,50,000/- rupees"; the currency must
+# stand alone, so "years 5" or "users 24" are not read as rupees
+AMOUNT = re.compile(r"""
+    (?:(?:(?<!\w)(?:Rs\.?|INR)(?![^\W\d_])|(?<!\w)₹)\s*(?P<number>\d[\d,]*(?:\.\d+)?)|(?P<bare>\d[\d,]*(?:\.\d+)?)(?=\s*(?:/-\s*)?(?:rupees|lakhs?|lacs?|crores?)\b))
+    (?:\s*/-)?(?:\s*(?P<unit>lakhs?|lacs?|crores?|cr\b\.?|million|mn\b))?
+""", re.IGNORECASE | re.VERBOSE)
+_UNITS = {"lakh": 100_000, "lac": 100_000, "crore": 10_000_000, "cr": 10_000_000, "million": 1_000_000, "mn": 1_000_000}
+
+PERCENTAGE = re.compile(r"\b(?P<number>\d{1,3}(?:\.\d+)?)\s*(?:%|per\s?cent\b)", re.IGNORECASE)
+
+DEADLINE_CUES = re.compile(
+    r"last date|due date|deadline|on or before|no later than|not later than|closing|submission|submit"
+    r"|must reach|opening|pre-bid|valid (?:up ?to|till)", re.IGNORECASE
+)
+EMD_CUES = re.compile(r"earnest money|\bEMD\b|bid security|bid guarantee", re.IGNORECASE)
+# An amount or percentage is an EMD value only if a cue comes within this many words before it
+EMD_CUE_WORDS = 6
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+
+def _passages(text: str) -> Iterable[str]:
+    """Runs of lines between blank lines and headings, so a fact's sentence doesn't take in a heading."""
+    lines: List[str] = []
+    for line in text.split("\n"):
+        if line.strip() and not match_heading(line):
+            lines.append(line.strip())
+        elif lines:
+            yield " ".join(lines)
+            lines = []
+    if lines:
+        yield " ".join(lines)
+
+
+def _dates(sentence: str) -> Iterable[re.Match]:
+    for pattern in (NUMERIC_DATE, DAY_MONTH_DATE, MONTH_DAY_DATE):
+        yield from pattern.finditer(sentence)
+
+
+def _after_emd_cue(sentence: str, start: int) -> bool:
+    return bool(EMD_CUES.search(" ".join(sentence[:start].split()[-EMD_CUE_WORDS:])))
+
+
+def _iso_date(match: re.Match) -> Optional[str]:
+    groups = match.groupdict()
+    month = _MONTHS[groups["month_name"][:3].lower()] if groups.get("month_name") else int(groups["month"])
+    try:
+        return date(int(groups["year"]), month, int(groups["day"])).isoformat()
+    except ValueError:
+        return None
+
+
+class FactExtractor:
+    """Pulls dates, deadlines, amounts, percentages and EMD values out of page text.
+
+    Each fact keeps the sentence it came from and its page, so it can be
+    shown, or put in a prompt, on its own. Dates in a sentence about
+    submission or opening are deadlines; amounts and percentages a few words
+    after a mention of earnest money or bid security are EMD values.
+    """
+
+    def __init__(self):
+        self.facts: List[Dict[str, Any]] = []
+        self._seen = set()
+
+    def extract(self, page: int, text: str) -> List[Dict[str, Any]]:
+        """Collect the facts on a page; returns those not seen before."""
+        found = []
+        for sentence in (s for passage in _passages(text) for s in split_sentences(passage)):
+            if not any(c.isdigit() for c in sentence):
+                continue
+            deadline = bool(DEADLINE_CUES.search(sentence))
+            emd = bool(EMD_CUES.search(sentence))
+
+            for match in _dates(sentence):
+                value = _iso_date(match)
+                if value:
+                    found.append(("deadline" if deadline else "date", value, match.group(0), sentence))
+            for match in AMOUNT.finditer(sentence):
+                value = _number(match.group("number") or match.group("bare"))
+                unit = (match.group("unit") or "").lower().rstrip(".")
+                if unit:
+                    value *= next(scale for name, scale in _UNITS.items() if unit.startswith(name))
+                kind = "emd" if emd and _after_emd_cue(sentence, match.start()) else "amount"
+                found.append((kind, _format_number(value), match.group(0).strip(), sentence))
+            for match in PERCENTAGE.finditer(sentence):
+                kind = "emd" if emd and _after_emd_cue(sentence, match.start()) else "percentage"
+                found.append((kind, f"{match.group('number')}%", match.group(0), sentence))
+
+        new = []
+        for kind, value, text_, sentence in found:
+            key = (kind, value, sentence)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            new.append({"kind": kind, "value": value, "text": text_, "context": sentence, "page": page})
+        self.facts.extend(new)
+        return new
+
+
+def select_facts(facts: Iterable[Dict[str, Any]], kinds: Sequence[str],
+                 context: Optional[re.Pattern] = None) -> List[Dict[str, Any]]:
+    """Facts of the given kinds, optionally only those whose sentence matches `context`."""
+    return [
+        fact for fact in facts
+        if fact["kind"] in kinds and (context is None or context.search(fact["context"]))
+    ]
+
+
+def format_facts(facts: Sequence[Dict[str, Any]], limit: int = 20, max_tokens: Optional[int] = None) -> str:
+    """Render facts as a bullet list, one line per source sentence, in page order.
+
+    Stops after `limit` lines, or before going over `max_tokens`.
+    """
+    lines, seen = [], set()
+    for fact in sorted(facts, key=lambda fact: fact["page"]):
+        if fact["context"] not in seen:
+            seen.add(fact["context"])
+            lines.append(f"- {fact['context']} (page {fact['page']})")
+
+    shown, tokens = 0, 0
+    for line in lines[:limit]:
+        if max_tokens is not None:
+            tokens += count_tokens(line)
+            if tokens > max_tokens:
+                break
+        shown += 1
+    if shown < len(lines):
+        return "\n".join(lines[:shown] + [f"- ... and {len(lines) - shown} more"])
+    return "\n".join(lines)
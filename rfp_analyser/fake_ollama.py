@@ -0,0 +1,163 @@
+"""A deterministic stand-in for the Ollama HTTP API, for tests and benchmarks.
+
+Run it directly to serve on a port and point OLLAMA_HOST at it:
+
+    python fake_ollama.py --port 11435 --latency 0.5 --token-latency 0.02
+
+Streaming requests get the answer one word per line, as Ollama sends one
+token per line, with `latency` before the first and `token_latency` between
+the rest.
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeOllamaServer"
+
+    def do_GET(self):
+        if self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.record_start(request)
+        try:
+            time.sleep(self.server.latency_for(request.get("prompt", "")))
+            if request.get("stream", True):
+                self._stream(request)
+                return
+            self._send_json({
+                "model": request.get("model", ""),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "response": self.server.answer_for(request.get("prompt", "")),
+                "done": True,
+                "eval_count": len(self.server.answer_for(request.get("prompt", "")).split(" ")),
+            })
+        finally:
+            self.server.record_end()
+
+    def _stream(self, request):
+        start = time.perf_counter()
+        words = self.server.answer_for(request.get("prompt", "")).split(" ")
+        tokens = [words[0]] + [" " + word for word in words[1:]]
+        # No Content-Length: the body ends when the connection closes, as in HTTP/1.0
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.server.token_latency)
+            self._write_line({
+                "model": request.get("model", ""),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "response": token,
+                "done": False,
+            })
+        self._write_line({
+            "model": request.get("model", ""),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "response": "",
+            "done": True,
+            "eval_count": len(tokens),
+            "eval_duration": int((time.perf_counter() - start) * 1e9),
+        })
+
+    def _write_line(self, payload):
+        self.wfile.write(json.dumps(payload).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """Answers /api/generate after a fixed latency with a reply derived from the prompt.
+
+    `delays` adds seconds to prompts containing a given text, so tests can
+    make some generations finish later than others.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 token_latency: float = 0.0, delays: Optional[Dict[str, float]] = None):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.delays = delays or {}
+        self.token_latency = token_latency
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def answer_for(prompt: str) -> str:
+        """Return the deterministic answer for a prompt."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        return f"Fake answer {digest}"
+
+    def latency_for(self, prompt: str) -> float:
+        """Seconds to wait before answering this prompt."""
+        return self.latency + sum(delay for text, delay in self.delays.items() if text in prompt)
+
+    def record_start(self, request):
+        with self._lock:
+            self.requests.append(request)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def record_end(self):
+        with self._lock:
+            self.active -= 1
+
+    def start(self) -> "FakeOllamaServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake Ollama API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering")
+    parser.add_argument("--token-latency", type=float, default=0.0,
+                        help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(args.host, args.port, args.latency, args.token_latency)
+    print(f"Fake Ollama listening on {server.url}")
+    server.serve_forever()
@@ -0,0 +1,386 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+import metrics
+from boilerplate import BoilerplateFilter
+from document_processor import DocumentProcessor, count_pages, extract_page_range, page_ranges
+from ocr import ocr_page, ocr_scanned, scanned_pages
+
+logger = logging.getLogger(__name__)
+
+# Embedding service loaded once per worker process, on first use
+_worker_embeddings = None
+
+
+def _extract_clean(pdf_path: str, start: int, end: int,
+                   backend: str) -> Tuple[List[Tuple[int, str]], Dict[str, float], List[int]]:
+    """Worker: extract a range of pages and strip their boilerplate.
+
+    Also returns the seconds spent on each, since metrics recorded in a
+    worker process would never reach /metrics, and the image-only pages
+    that need OCR.
+    """
+    processor = DocumentProcessor()
+    started = time.perf_counter()
+    pages = extract_page_range(pdf_path, start, end, backend)
+    extracted = time.perf_counter()
+    cleaned = [(number, processor.remove_boilerplate(text)) for number, text in pages]
+    scanned = scanned_pages(pdf_path, pages)
+    return cleaned, {"extract": extracted - started, "remove_boilerplate": time.perf_counter() - extracted}, scanned
+
+
+def _ocr_clean(pdf_path: str, page_number: int) -> Tuple[str, Dict[str, Any]]:
+    """Worker: OCR a scanned page and strip its boilerplate."""
+    text, timing = ocr_page(pdf_path, page_number)
+    return DocumentProcessor().remove_boilerplate(text), timing
+
+
+def _encode(texts: List[str]) -> List[List[float]]:
+    """Worker: embed a batch of chunk texts."""
+    global _worker_embeddings
+    if _worker_embeddings is None:
+        from embedding_service import EmbeddingService
+        # Chunk embeddings are already deduplicated by the vector store, so skip the disk cache
+        _worker_embeddings = EmbeddingService(use_disk_cache=False, processes=1)
+    return _worker_embeddings.encode(texts).tolist()
+
+
+def iter_extracted_pages(pdf_path: str, pool: Executor, backend: Optional[str] = None,
+                         pages_per_task: Optional[int] = None, prefetch: Optional[int] = None,
+                         on_ocr: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Tuple[int, str]]:
+    """Yield cleaned (page_number, text) pairs in order.
+
+    Page ranges are extracted on the pool, with at most `prefetch` ranges in
+    flight, so memory stays bounded however long the document is. Scanned
+    pages in a range are then OCR'd on the pool one page per task, and
+    `on_ocr` is called with each one's timing.
+    """
+    backend = backend or config.PDF_BACKEND
+    ranges = iter(page_ranges(count_pages(pdf_path), pages_per_task or config.PDF_PAGES_PER_TASK))
+    in_flight = deque()
+    for start, end in islice(ranges, max(1, prefetch or config.INGEST_WORKERS)):
+        in_flight.append(pool.submit(_extract_clean, pdf_path, start, end, backend))
+
+    while in_flight:
+        pages, timings, scanned = in_flight.popleft().result()
+        for stage, seconds in timings.items():
+            metrics.observe(stage, seconds)
+        pages = ocr_scanned(pdf_path, pages, scanned, pool, task=_ocr_clean, on_ocr=on_ocr)
+        next_range = next(ranges, None)
+        if next_range is not None:
+            in_flight.append(pool.submit(_extract_clean, pdf_path, *next_range, backend))
+        yield from pages
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most `size` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class IngestionJob:
+    """Progress of one document moving through the ingestion pipeline."""
+
+    def __init__(self, filename: str, document_id: str, pdf_path: Optional[str] = None,
+                 replaces: Optional[str] = None):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.document_id = document_id
+        self.pdf_path = pdf_path
+        self.replaces = replaces
+        self.status = "queued"
+        self.stage = "queued"
+        self.pages_total = 0
+        self.pages_processed = 0
+        self.chunks_total = 0
+        self.chunks_embedded = 0
+        self.ocr_pages: List[Dict[str, Any]] = []
+        self.stage_timings: Dict[str, float] = {}
+        self.stats: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def add_timing(self, stage: str, seconds: float):
+        """Accumulate time spent in a pipeline stage; stages overlap as the document streams through."""
+        self.stage_timings[stage] = round(self.stage_timings.get(stage, 0.0) + seconds, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "filename": self.filename,
+            "document_id": self.document_id,
+            "pages_total": self.pages_total,
+            "pages_processed": self.pages_processed,
+            "chunks_total": self.chunks_total,
+            "chunks_embedded": self.chunks_embedded,
+            "stage_timings": self.stage_timings,
+            "elapsed": round((self.finished_at or time.time()) - self.created_at, 3),
+            "stats": self.stats,
+            "error": self.error
+        }
+
+
+class QueueFullError(Exception):
+    """Raised when too many uploads are already waiting to be ingested."""
+
+
+class IngestionQueue:
+    """Bounded queue of ingestion jobs drained by a fixed number of workers.
+
+    Extraction, cleaning, chunking and embedding run in a process pool; the
+    vector store, registry and cache are only touched from this process.
+    Job progress is written to the document registry as it changes, so any
+    API worker can report on a job that another worker is running.
+    """
+
+    def __init__(self, vector_store, document_registry, answer_cache,
+                 remove_document: Callable[[str], None], workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, batch_size: Optional[int] = None):
+        self.vector_store = vector_store
+        self.document_registry = document_registry
+        self.answer_cache = answer_cache
+        self.remove_document = remove_document
+        self.workers = max(1, workers or config.INGEST_WORKERS)
+        self.max_pending = max(1, max_pending or config.INGEST_MAX_PENDING)
+        self.batch_size = max(1, batch_size or config.EMBEDDING_BATCH_SIZE)
+
+        self.jobs: Dict[str, IngestionJob] = {}
+        self._saved_at: Dict[str, float] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker pool. Must be called from the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        # Forking while the warm-up thread holds a lock can deadlock the child, so start workers clean
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Started ingestion queue with {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, pdf_path: str, filename: str, document_id: str,
+                     replaces: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a saved PDF for ingestion; returns the job's state.
+
+        If any worker process is already ingesting the same content, the
+        file is dropped and that job's state is returned instead.
+        """
+        if self._queue.full():
+            raise QueueFullError(f"{self.max_pending} documents are already waiting to be processed")
+        job = IngestionJob(filename, document_id, pdf_path, replaces)
+        existing = await asyncio.to_thread(
+            self.document_registry.claim_job, job.to_dict(), config.INGEST_JOB_STALE_SECONDS
+        )
+        if existing is not None:
+            os.unlink(pdf_path)
+            return existing
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            # Filled while the claim was being written; release the claim
+            job.status, job.error, job.finished_at = "failed", "Ingestion queue full", time.time()
+            await asyncio.to_thread(self._save, job)
+            raise QueueFullError(f"{self.max_pending} documents are already waiting to be processed")
+        self._remember(job)
+        return job.to_dict()
+
+    async def record_completed(self, filename: str, document_id: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a job that needed no processing, such as an exact re-upload; returns its state."""
+        job = IngestionJob(filename, document_id)
+        job.status = job.stage = "completed"
+        job.stats = stats
+        job.finished_at = time.time()
+        self._remember(job)
+        await asyncio.to_thread(self._save, job)
+        return job.to_dict()
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's progress, whichever worker process is running it."""
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job is not None else self.document_registry.get_job(job_id)
+
+    def _remember(self, job: IngestionJob):
+        self.jobs[job.job_id] = job
+        # Keep a bounded history of finished jobs
+        finished = [j for j in self.jobs.values() if j.finished_at is not None]
+        for old in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(finished) - config.INGEST_JOB_HISTORY)]:
+            del self.jobs[old.job_id]
+
+    def _save(self, job: IngestionJob, throttle: float = 0.0):
+        """Write a job's progress to the registry, at most every `throttle` seconds."""
+        now = time.monotonic()
+        if throttle and now - self._saved_at.get(job.job_id, 0.0) < throttle:
+            return
+        self._saved_at[job.job_id] = now
+        finished = job.finished_at is not None
+        try:
+            self.document_registry.save_job(job.to_dict(), history=config.INGEST_JOB_HISTORY if finished else None)
+        except Exception as e:
+            logger.warning(f"Failed to save progress of job {job.job_id}: {e}")
+        if finished:
+            self._saved_at.pop(job.job_id, None)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: IngestionJob):
+        job.status = "running"
+        job.stage = "extracting"
+        job.add_timing("queued", time.time() - job.created_at)
+        await asyncio.to_thread(self._save, job)
+        logger.info(f"Ingesting {job.filename} as job {job.job_id}")
+        try:
+            abbreviations, facts, index_stats = await asyncio.to_thread(self._index, job)
+
+            job.stage = "finalizing"
+            start = time.perf_counter()
+            await asyncio.to_thread(self._finalize, job, abbreviations, facts)
+            job.add_timing("finalizing", time.perf_counter() - start)
+
+            job.stats = {
+                "abbreviations_found": len(abbreviations),
+                "facts_found": len(facts),
+                "chunks_indexed": job.chunks_total,
+                **index_stats
+            }
+            if job.ocr_pages:
+                job.stats["ocr_pages"] = job.ocr_pages
+            job.status = job.stage = "completed"
+            for stage, seconds in job.stage_timings.items():
+                metrics.INGEST_STAGE_SECONDS.labels(stage).observe(seconds)
+            metrics.DOCUMENT_PAGES.observe(job.pages_total)
+            metrics.DOCUMENT_CHUNKS.observe(job.chunks_total)
+            logger.info(f"Job {job.job_id} completed: {job.stats}")
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}", exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            await asyncio.to_thread(self._save, job)
+            try:
+                os.unlink(job.pdf_path)
+            except Exception as e:
+                logger.warning(f"Failed to delete temporary file: {e}")
+
+    def _finalize(self, job: IngestionJob, abbreviations: Dict[str, str], facts: List[Dict[str, Any]]):
+        """Register the indexed document and retire what it makes stale."""
+        self.document_registry.add(job.document_id, job.filename, job.chunks_total)
+        self.document_registry.set_abbreviations(job.document_id, abbreviations)
+        self.document_registry.set_facts(job.document_id, facts)
+        self.vector_store.set_abbreviations(job.document_id, abbreviations)
+        # Answers generated from an earlier indexing of this document are stale
+        self.answer_cache.invalidate_document(job.document_id)
+        if job.replaces and job.replaces != job.document_id:
+            self.remove_document(job.replaces)
+            logger.info(f"Document {job.document_id} replaces {job.replaces}")
+
+    def _index(self, job: IngestionJob) -> Tuple[Dict[str, str], List[Dict[str, Any]], Dict[str, int]]:
+        """Stream the document through extract -> clean -> chunk -> embed -> upsert.
+
+        Only a window of pages and one batch of chunks are held at a time.
+        """
+        processor = DocumentProcessor()
+        boilerplate = BoilerplateFilter()
+        job.pages_total = count_pages(job.pdf_path)
+        extract_seconds = 0.0
+
+        def pages():
+            nonlocal extract_seconds
+            page_iter = boilerplate.filter(iter_extracted_pages(
+                job.pdf_path, self._pool, prefetch=self.workers,
+                on_ocr=lambda timing: self._record_ocr(job, timing)
+            ))
+            while True:
+                start = time.perf_counter()
+                page = next(page_iter, None)
+                extract_seconds += time.perf_counter() - start
+                if page is None:
+                    # Every page is read; what is left is embedding and storing the last chunks
+                    job.stage = "indexing"
+                    return
+                job.pages_processed += 1
+                self._save(job, throttle=1.0)
+                processor.extract_abbreviations(page[1])
+                processor.extract_facts(*page)
+                yield page
+
+        def batches():
+            chunk_iter = batched(processor.iter_chunks(pages()), self.batch_size)
+            while True:
+                start, extracted_before = time.perf_counter(), extract_seconds
+                batch = next(chunk_iter, None)
+                # Time spent chunking excludes time spent waiting on extraction
+                job.add_timing("chunking", time.perf_counter() - start - (extract_seconds - extracted_before))
+                if batch is None:
+                    return
+                job.chunks_total += len(batch)
+                yield batch
+
+        start = time.perf_counter()
+        try:
+            index_stats = self.vector_store.add_document_batches(
+                batches(),
+                job.document_id,
+                {'filename': job.filename},
+                lambda texts: self._encode(job, texts)
+            )
+            if job.chunks_total == 0:
+                raise ValueError("Could not extract text from the PDF. The document might be corrupted or empty.")
+        except Exception:
+            # Don't leave a half-indexed document behind
+            if self.document_registry.get(job.document_id) is None:
+                self.vector_store.delete_document(job.document_id)
+            raise
+
+        index_stats = {**index_stats, **boilerplate.stats()}
+        job.add_timing("extracting", extract_seconds)
+        job.add_timing("indexing", time.perf_counter() - start - sum(
+            job.stage_timings.get(stage, 0.0) for stage in ("chunking", "embedding")
+        ) - extract_seconds)
+        return processor.abbreviations, processor.facts, index_stats
+
+    def _record_ocr(self, job: IngestionJob, timing: Dict[str, Any]):
+        job.ocr_pages.append(timing)
+        job.add_timing("ocr", timing["ms"] / 1000)
+
+    def _encode(self, job: IngestionJob, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of chunk texts on the process pool."""
+        start = time.perf_counter()
+        embeddings = self._pool.submit(_encode, texts).result()
+        job.chunks_embedded += len(texts)
+        job.add_timing("embedding", time.perf_counter() - start)
+        self._save(job, throttle=1.0)
+        return embeddings
@@ -0,0 +1,200 @@
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Keeps amounts ("5,00,000"), clause numbers ("3.2.1") and dates ("12/05/2024") as single tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.,/-][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be been by can do does for from has have if in into is it its may must no not
+of on or shall should such that the their there these they this to was were what when where which
+who will with would
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase the text and split it into index terms, dropping stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class KeywordIndex:
+    """BM25 over chunk texts, served from an inverted index in SQLite.
+
+    Each term maps to the chunks containing it, so a query only reads the
+    postings of its own terms however large the corpus grows.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config.KEYWORD_INDEX_PATH)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                chunk_id TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_document ON chunks (document_id);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, document_id, chunk_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_chunk ON postings (chunk_id);
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                chunks INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO totals (id, chunks, length) VALUES (0, 0, 0);
+        """)
+        self._conn.commit()
+        logger.info(f"Opened keyword index at {self.path}")
+
+    def add(self, chunks: Iterable[Tuple[str, str, str]]):
+        """Index (chunk_id, document_id, text) triples, replacing any earlier text for those IDs."""
+        chunks = list(chunks)
+        if not chunks:
+            return
+        with self._lock:
+            self._remove([chunk_id for chunk_id, _, _ in chunks])
+            total_length = 0
+            for chunk_id, document_id, text in chunks:
+                counts = Counter(tokenize(text))
+                length = sum(counts.values())
+                total_length += length
+                self._conn.execute(
+                    "INSERT INTO chunks (chunk_id, document_id, length) VALUES (?, ?, ?)",
+                    (chunk_id, document_id, length)
+                )
+                self._conn.executemany(
+                    "INSERT INTO postings (term, document_id, chunk_id, tf) VALUES (?, ?, ?, ?)",
+                    [(term, document_id, chunk_id, tf) for term, tf in counts.items()]
+                )
+                self._conn.executemany(
+                    "INSERT INTO terms (term, df) VALUES (?, 1) ON CONFLICT (term) DO UPDATE SET df = df + 1",
+                    [(term,) for term in counts]
+                )
+            self._conn.execute(
+                "UPDATE totals SET chunks = chunks + ?, length = length + ? WHERE id = 0",
+                (len(chunks), total_length)
+            )
+            self._conn.commit()
+
+    def remove(self, chunk_ids: List[str]):
+        """Drop chunks from the index."""
+        if not chunk_ids:
+            return
+        with self._lock:
+            self._remove(chunk_ids)
+            self._conn.commit()
+
+    def delete_document(self, document_id: str):
+        """Drop every chunk of one document."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_id FROM chunks WHERE document_id = ?", (document_id,)
+            ).fetchall()
+            self._remove([row[0] for row in rows])
+            self._conn.commit()
+
+    def _remove(self, chunk_ids: List[str]):
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(chunk_ids), 500):
+            part = chunk_ids[i:i + 500]
+            placeholders = ','.join('?' * len(part))
+            removed = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks WHERE chunk_id IN ({placeholders})", part
+            ).fetchone()
+            if not removed[0]:
+                continue
+            self._conn.execute(f"""
+                UPDATE terms SET df = df - (
+                    SELECT COUNT(*) FROM postings
+                    WHERE postings.term = terms.term AND postings.chunk_id IN ({placeholders})
+                )
+                WHERE term IN (SELECT term FROM postings WHERE chunk_id IN ({placeholders}))
+            """, part + part)
+            self._conn.execute("DELETE FROM terms WHERE df <= 0")
+            self._conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", part)
+            self._conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({placeholders})", part)
+            self._conn.execute(
+                "UPDATE totals SET chunks = chunks - ?, length = length - ? WHERE id = 0", removed
+            )
+
+    def search(self, query: str, k: int = 20, document_id: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Return up to k (chunk_id, BM25 score) pairs, best first."""
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        placeholders = ','.join('?' * len(terms))
+        with self._lock:
+            chunk_count, total_length = self._conn.execute(
+                "SELECT chunks, length FROM totals WHERE id = 0"
+            ).fetchone()
+            if not chunk_count:
+                return []
+            df = dict(self._conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({placeholders})", terms
+            ).fetchall())
+            document_filter = "AND p.document_id = ?" if document_id else ""
+            postings = self._conn.execute(f"""
+                SELECT p.chunk_id, p.term, p.tf, c.length
+                FROM postings p JOIN chunks c ON c.chunk_id = p.chunk_id
+                WHERE p.term IN ({placeholders}) {document_filter}
+            """, terms + ([document_id] if document_id else [])).fetchall()
+
+        average_length = total_length / chunk_count or 1.0
+        scores: Dict[str, float] = {}
+        for chunk_id, term, tf, length in postings:
+            idf = math.log(1 + (chunk_count - df[term] + 0.5) / (df[term] + 0.5))
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def has_document(self, document_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM chunks WHERE document_id = ? LIMIT 1", (document_id,)
+            ).fetchone()
+        return row is not None
+
+    def count(self) -> int:
+        """Return the number of indexed chunks."""
+        with self._lock:
+            return self._conn.execute("SELECT chunks FROM totals WHERE id = 0").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.executescript("""
+                DELETE FROM postings;
+                DELETE FROM terms;
+                DELETE FROM chunks;
+                UPDATE totals SET chunks = 0, length = 0 WHERE id = 0;
+            """)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+import ollama
+
+import config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    """A shared generation and the number of callers waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class LLMClient:
+    """Non-blocking Ollama client with pooled connections, timeouts and request coalescing.
+
+    Identical prompts that are already being generated are not sent again;
+    every caller awaits the same in-flight generation instead.
+    """
+
+    def __init__(self, host: Optional[str] = None, model: Optional[str] = None,
+                 timeout: Optional[float] = None, max_concurrency: Optional[int] = None):
+        self.host = host or config.OLLAMA_HOST
+        self.model = model or config.OLLAMA_MODEL
+        self.timeout = timeout if timeout is not None else config.LLM_TIMEOUT
+        self.max_concurrency = max(1, max_concurrency or config.LLM_CONCURRENCY)
+
+        # One pooled HTTP connection per concurrent generation, kept alive between calls
+        self._client = ollama.AsyncClient(
+            host=self.host,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._inflight: Dict[str, _InFlight] = {}
+
+        self.generations = 0
+        self.coalesced = 0
+
+    async def generate(self, prompt: str, model: Optional[str] = None,
+                       timeout: Optional[float] = None) -> str:
+        """Generate a completion for the prompt and return the response text."""
+        model = model or self.model
+        timeout = timeout if timeout is not None else self.timeout
+        key = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = _InFlight(asyncio.create_task(self._generate(model, prompt, timeout)))
+            self._inflight[key] = inflight
+            inflight.task.add_done_callback(lambda _: self._forget(key, inflight))
+        else:
+            self.coalesced += 1
+            logger.info(f"Coalesced identical prompt with in-flight generation ({self.coalesced} total)")
+
+        inflight.waiters += 1
+        try:
+            # Shield the shared task so one caller going away doesn't cancel it for the others
+            return await asyncio.shield(inflight.task)
+        finally:
+            inflight.waiters -= 1
+            if inflight.waiters == 0 and not inflight.task.done():
+                # A caller arriving before the cancelled task finishes must start a new generation
+                self._forget(key, inflight)
+                inflight.task.cancel()
+
+    def _forget(self, key: str, inflight: _InFlight):
+        """Stop coalescing onto this generation, unless a newer one has replaced it."""
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+
+    async def _generate(self, model: str, prompt: str, timeout: float) -> str:
+        """Run a single generation under the concurrency limit."""
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self._client.generate(model=model, prompt=prompt),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Generation with {model} timed out after {timeout}s")
+                raise TimeoutError(f"LLM generation timed out after {timeout}s")
+            self.generations += 1
+            elapsed = time.perf_counter() - start
+            metrics.observe("llm_generate", elapsed)
+            if response.get('eval_count'):
+                metrics.GENERATED_TOKENS.observe(response['eval_count'])
+            logger.info(f"Generated response with {model} in {elapsed:.2f}s")
+            return response['response']
+
+    async def generate_stream(self, prompt: str, model: Optional[str] = None,
+                              timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Generate a completion for the prompt, yielding text as Ollama produces it.
+
+        Yields {"response": text} per token, then a final {"done": True, ...}
+        with the time to first token, the token count and the tokens/sec after
+        the first token. Streams are not coalesced; the timeout covers the
+        whole generation.
+        """
+        model = model or self.model
+        timeout = timeout if timeout is not None else self.timeout
+        async with self._semaphore:
+            start = time.perf_counter()
+            first_token = None
+            tokens = 0
+            eval_count = None
+            deadline = start + timeout
+            try:
+                parts = await asyncio.wait_for(
+                    self._client.generate(model=model, prompt=prompt, stream=True), timeout=timeout
+                )
+                while True:
+                    try:
+                        part = await asyncio.wait_for(parts.__anext__(), timeout=deadline - time.perf_counter())
+                    except StopAsyncIteration:
+                        break
+                    if part['response']:
+                        if first_token is None:
+                            first_token = time.perf_counter()
+                        tokens += 1
+                        yield {"response": part['response']}
+                    if part.get('done'):
+                        eval_count = part.get('eval_count')
+            except asyncio.TimeoutError:
+                logger.error(f"Streaming generation with {model} timed out after {timeout}s")
+                raise TimeoutError(f"LLM generation timed out after {timeout}s")
+            end = time.perf_counter()
+            self.generations += 1
+
+        tokens = eval_count or tokens
+        metrics.observe("llm_generate", end - start)
+        if first_token:
+            metrics.observe("llm_first_token", first_token - start)
+        metrics.GENERATED_TOKENS.observe(tokens)
+        stats = {
+            "done": True,
+            "ttft_ms": round((first_token - start) * 1000, 1) if first_token else None,
+            "generation_ms": round((end - start) * 1000, 1),
+            "tokens": tokens,
+            "tokens_per_second": (
+                round((tokens - 1) / (end - first_token), 1)
+                if first_token and tokens > 1 and end > first_token else None
+            )
+        }
+        logger.info(f"Streamed {tokens} tokens from {model}: first token after {stats['ttft_ms']} ms, "
+                    f"{stats['tokens_per_second']} tokens/s")
+        yield stats
+
+    async def close(self):
+        """Close the pooled HTTP connections."""
+        await self._client.close()
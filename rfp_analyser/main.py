@@ -1,15 +1,29 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST
 from pydantic import BaseModel
 import uvicorn
-import tempfile
 import os
+import json
 import logging
-from typing import List, Dict, Any
-import ollama
+import re
+from typing import List, Dict, Any, Optional
+import asyncio
+import time
 from pathlib import Path
 
-from document_processor import DocumentProcessor
+import config
+import metrics
+from answer_cache import AnswerCache
+from context_builder import ContextBuilder, count_tokens
+from document_registry import DocumentRegistry
+from facts import FACT_KINDS, select_facts
+from ingestion import IngestionQueue, QueueFullError
+from llm_client import LLMClient
+from reranker import Retriever
+from summary_engine import FACT_MODES, SummaryEngine
+from uploads import UploadError, receive_upload
 from vector_store import VectorStore
 
 # Configure logging
@@ -28,11 +42,68 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Timing"],
 )
 
-# Initialize components
-doc_processor = DocumentProcessor()
-vector_store = VectorStore()
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    """Time each request and attach its per-stage breakdown as X-Timing when asked for.
+
+    Streaming responses only include the stages finished before streaming starts.
+    """
+    token = metrics.start_breakdown()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        breakdown = metrics.finish_breakdown(token)
+        route = request.scope.get("route")
+        metrics.REQUEST_SECONDS.labels(
+            request.method, route.path if route else "unmatched", str(status)
+        ).observe(elapsed)
+    if config.TIMING_HEADER or "x-timing" in request.headers:
+        response.headers["X-Timing"] = ", ".join(filter(None, [f"total;dur={elapsed * 1000:.1f}", breakdown]))
+    return response
+
+# Initialize components; the vector store loads its model and collection lazily
+document_registry = DocumentRegistry()
+vector_store = VectorStore(abbreviation_loader=document_registry.get_abbreviations)
+retriever = Retriever(vector_store)
+context_builder = ContextBuilder()
+llm_client = LLMClient()
+answer_cache = AnswerCache()
+
+# Progress of the background warm-up, reported by /health/ready
+warm_up_state: Dict[str, Any] = {"status": "pending", "started_at": None, "ready_at": None, "error": None}
+
+async def warm_up():
+    """Load the embedding model and open the collection without holding up startup."""
+    warm_up_state.update(status="warming", started_at=time.time())
+    try:
+        # Every /summary embeds the same questions; have them cached before the first request
+        await asyncio.to_thread(vector_store.warm_up, [question for _, question in SUMMARY_QUESTIONS])
+        warm_up_state.update(status="ready", ready_at=time.time())
+        logger.info(f"Warm-up finished in {warm_up_state['ready_at'] - warm_up_state['started_at']:.1f}s")
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}", exc_info=True)
+        warm_up_state.update(status="failed", error=str(e))
+
+@app.on_event("startup")
+async def start_background_work():
+    ingestion_queue.start()
+    app.state.warm_up_task = asyncio.create_task(warm_up())
+
+@app.on_event("shutdown")
+async def close_clients():
+    app.state.warm_up_task.cancel()
+    await ingestion_queue.stop()
+    await llm_client.close()
+    answer_cache.close()
+    document_registry.close()
+    vector_store.close()
 
 # Summary questions
 SUMMARY_QUESTIONS = [
@@ -56,101 +127,19 @@ SUMMARY_QUESTIONS = [
     ("Key Differentiators", "What value additions or unique differentiators are required?")
 ]
 
-class Query(BaseModel):
-    question: str
+# Summary sections the extracted facts can answer: the fact kinds, and a pattern
+# their sentence must match
+FACT_SECTIONS = {
+    "Critical Dates": (("deadline", "date"), None),
+    "Financial Details": (("emd", "amount", "percentage"),
+                          re.compile(r"budget|cost|value|contract|payment|turnover|guarantee|security|penalt",
+                                     re.IGNORECASE)),
+    "Extracted Financial Items": (("emd", "amount"), None),
+    "Payment Terms": (("percentage", "amount", "date", "deadline"),
+                      re.compile(r"payment|paid|payable|released|invoice|instal", re.IGNORECASE)),
+}
 
-def validate_pdf_file(file: UploadFile) -> None:
-    """Validate that the uploaded file is a PDF."""
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(
-            status_code=400,
-            detail="Only PDF files are supported"
-        )
-    
-    # Check file size (limit to 10MB)
-    file_size = 0
-    for chunk in file.file:
-        file_size += len(chunk)
-        if file_size > 10 * 1024 * 1024:  # 10MB
-            raise HTTPException(
-                status_code=400,
-                detail="File size exceeds 10MB limit"
-            )
-    file.file.seek(0)  # Reset file pointer
-
-@app.post("/analyze")
-async def analyze_document(file: UploadFile = File(...)):
-    """Process and index an RFP document."""
-    try:
-        logger.info(f"Processing document: {file.filename}")
-        
-        # Validate file
-        validate_pdf_file(file)
-        
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            # Process document
-            text = doc_processor.extract_text_from_pdf(tmp_path)
-            if not text.strip():
-                raise HTTPException(
-                    status_code=400,
-                    detail="Could not extract text from the PDF. The document might be corrupted or empty."
-                )
-            
-            text = doc_processor.remove_boilerplate(text)
-            
-            # Extract and store abbreviations
-            abbreviations = doc_processor.extract_abbreviations(text)
-            vector_store.set_abbreviations(abbreviations)
-            logger.info(f"Extracted {len(abbreviations)} abbreviations")
-            
-            # Chunk and index document
-            chunks = doc_processor.chunk_document(text)
-            vector_store.add_documents(chunks)
-            logger.info(f"Indexed {len(chunks)} document chunks")
-            
-            return {
-                "message": "Document processed successfully",
-                "stats": {
-                    "abbreviations_found": len(abbreviations),
-                    "chunks_indexed": len(chunks)
-                }
-            }
-        finally:
-            # Cleanup
-            try:
-                os.unlink(tmp_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete temporary file: {e}")
-                
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing document: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/query")
-async def query_document(query: Query):
-    """Query the RFP document."""
-    try:
-        logger.info(f"Processing query: {query.question}")
-        
-        # Search for relevant chunks
-        results = vector_store.search(query.question)
-        if not results:
-            return {"answer": "No relevant information found in the document."}
-        
-        # Prepare context
-        context = "\n\n".join([r['text'] for r in results])
-        context = vector_store.expand_abbreviations(context)
-        
-        # Generate response using Granite
-        prompt = f"""You are a highly accurate AI analyst designed to extract answers from government RFP (Request for Proposal) documents. Use only the information provided in the context below to answer the user's question. You must avoid assumptions and always interpret the document logically, even when the language is indirect or synonymous.
+QUERY_PROMPT = """You are a highly accurate AI analyst designed to extract answers from government RFP (Request for Proposal) documents. Use only the information provided in the context below to answer the user's question. You must avoid assumptions and always interpret the document logically, even when the language is indirect or synonymous.
 
 ### Strict Instructions:
 - ✅ Use **ONLY** the provided context — no external knowledge or hallucinations.
@@ -166,48 +155,398 @@ async def query_document(query: Query):
 {context}
 
 ### User Question:
-{query.question}
+{question}
 
 ### Answer:"""
 
-        response = ollama.generate(model='granite3.2:8b', prompt=prompt)
-        return {"answer": response['response']}
+class Query(BaseModel):
+    question: str
+    document_id: Optional[str] = None
+
+class BatchQuery(BaseModel):
+    questions: List[str]
+    document_id: Optional[str] = None
+
+async def resolve_document_id(document_id: Optional[str]) -> str:
+    """Return the document to answer from, defaulting to the most recently analyzed one."""
+    if document_id:
+        if await asyncio.to_thread(document_registry.get, document_id) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown document: {document_id}")
+        return document_id
+
+    latest = await asyncio.to_thread(document_registry.latest)
+    if latest is None:
+        raise HTTPException(status_code=400, detail="No document has been analyzed yet")
+    return latest['document_id']
+
+def remove_document(document_id: str) -> None:
+    """Remove a document's chunks, cached answers and registry entry."""
+    vector_store.delete_document(document_id)
+    answer_cache.invalidate_document(document_id)
+    document_registry.delete(document_id)
+    logger.info(f"Deleted document {document_id}")
+
+ingestion_queue = IngestionQueue(vector_store, document_registry, answer_cache, remove_document)
+
+# /analyze parses its body itself, so describe the form for the API docs
+ANALYZE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "replaces": {"type": "string"}
+            }
+        }}}
+    }
+}
+
+@app.post("/analyze", status_code=202, openapi_extra=ANALYZE_REQUEST_BODY)
+async def analyze_document(request: Request, response: Response):
+    """Queue an RFP document for processing and indexing.
+
+    Returns a job ID straight away; poll `/jobs/{job_id}` for progress. Pass
+    the document_id of an earlier version as `replaces` when uploading a
+    revision; unchanged chunks reuse their embeddings and the old version is removed.
+
+    The body is read once as it streams in: the size limit, the PDF signature
+    check and the content hash all happen on the way to the spool file that
+    the ingestion workers then read.
+    """
+    upload = None
+    try:
+        try:
+            upload, filename, fields = await receive_upload(request.headers, request.stream())
+        except UploadError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        document_id = upload.finish()
+        replaces = fields.get("replaces") or None
+        logger.info(f"Received {filename} ({upload.size} bytes, {'in memory' if upload.in_memory else 'spooled'})")
+
+        # Exact re-upload: the index already holds this content
+        existing = await asyncio.to_thread(document_registry.get, document_id)
+        if existing is not None and await asyncio.to_thread(vector_store.has_document, document_id):
+            upload.discard()
+            logger.info(f"Document {document_id} is already indexed, skipping")
+            job = await ingestion_queue.record_completed(filename, document_id, {
+                "chunks_indexed": existing['chunk_count'],
+                "embeddings_computed": 0,
+                "embeddings_reused": existing['chunk_count']
+            })
+            response.status_code = 200
+            return {"message": "Document already indexed", **job}
+
+        # The ingestion job owns the file from here and deletes it when done
+        pdf_path = upload.save()
+        upload = None
+        try:
+            job = await ingestion_queue.submit(pdf_path, filename, document_id, replaces)
+        except QueueFullError as e:
+            os.unlink(pdf_path)
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+        return {"message": "Document queued for processing", **job}
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error processing query: {str(e)}", exc_info=True)
+        logger.error(f"Error processing document: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if upload is not None:
+            upload.discard()
 
-@app.get("/summary")
-async def get_summary():
-    """Generate a comprehensive summary of the RFP."""
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Latency, chunk count and token histograms in the Prometheus text format."""
+    return Response(metrics.exposition(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/health/live")
+async def liveness():
+    """Report that the server process is up and handling requests."""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness(response: Response):
+    """Report whether the embedding model and vector store have finished loading."""
+    ready = warm_up_state["status"] == "ready"
+    if not ready:
+        response.status_code = 503
+    return {"ready": ready, **warm_up_state}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Report the progress of an ingestion job."""
+    job = await asyncio.to_thread(ingestion_queue.status, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+NO_RESULTS = "No relevant information found in the document."
+
+async def prepare_query(query: Query) -> Dict[str, Any]:
+    """Retrieve context for a question.
+
+    Returns the document, the stage timings and either an `answer` (nothing
+    relevant was found, or the answer is cached) or the `prompt` to generate from.
+    """
+    document_id = await resolve_document_id(query.document_id)
+
+    # Search for relevant chunks, then re-rank them
+    results, timings = await asyncio.to_thread(
+        retriever.retrieve, query.question, config.SEARCH_K, document_id
+    )
+    prepared = {"document_id": document_id, "timings": timings}
+    if not results:
+        prepared["answer"] = NO_RESULTS
+        return prepared
+
+    prepared["cache_key"] = AnswerCache.make_key(
+        document_id, query.question, [r['id'] for r in results],
+        llm_client.model, namespace="query"
+    )
+    cached = await asyncio.to_thread(answer_cache.get, prepared["cache_key"])
+    if cached is not None:
+        prepared.update(answer=cached, cached=True)
+        return prepared
+
+    # Prepare context within the prompt budget
+    with metrics.timed("build_prompt"):
+        context, context_stats = context_builder.build(
+            query.question, [r['text'] for r in results],
+            lambda text: vector_store.expand_abbreviations(text, document_id),
+            template=QUERY_PROMPT
+        )
+        prompt = QUERY_PROMPT.format(context=context, question=query.question)
+        timings["prompt_tokens"] = count_tokens(prompt)
+    metrics.PROMPT_TOKENS.labels("query").observe(timings["prompt_tokens"])
+    prepared.update(prompt=prompt, context=context_stats)
+    return prepared
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/query")
+async def query_document(query: Query):
+    """Query the RFP document."""
     try:
-        logger.info("Generating document summary")
-        summary = {}
-        for section, question in SUMMARY_QUESTIONS:
-            results = vector_store.search(question)
-            if not results:
-                summary[section] = "Not mentioned in the provided context."
-                continue
-                
-            context = "\n\n".join([r['text'] for r in results])
-            context = vector_store.expand_abbreviations(context)
-            
-            prompt = f"""You are a highly accurate AI analyst. Answer the following question based ONLY on the provided context. If the information is not available, respond with "Not mentioned in the provided context."
-
-Context:
-{context}
+        logger.info(f"Processing query: {query.question}")
+        prepared = await prepare_query(query)
+        timings = prepared["timings"]
+        if "prompt" not in prepared:
+            response = {"answer": prepared["answer"], "timings": timings}
+            if prepared.get("cached"):
+                response["cached"] = True
+            return response
 
-Question: {question}
+        # Generate response using Granite
+        start = time.perf_counter()
+        answer = await llm_client.generate(prepared["prompt"])
+        timings["generation_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        context_stats = prepared["context"]
+        logger.info(f"Query prompt of {timings['prompt_tokens']} tokens ({context_stats['context_tokens']} of "
+                    f"{context_stats['source_tokens']} context tokens kept) generated in {timings['generation_ms']} ms")
+        await asyncio.to_thread(answer_cache.put, prepared["cache_key"], prepared["document_id"], answer)
+        return {"answer": answer, "cached": False, "timings": timings, "context": context_stats}
+    except HTTPException:
+        raise
+    except TimeoutError as e:
+        logger.error(f"Timed out processing query: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error processing query: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/query/stream")
+async def query_document_stream(query: Query):
+    """Query the RFP document, streaming the answer as server-sent events.
 
-Answer:"""
-            
-            response = ollama.generate(model='granite3.2:8b', prompt=prompt)
-            summary[section] = response['response']
-        
-        return summary
+    `token` events carry the answer text as it is generated. A final `done`
+    event has the full answer, whether it was cached, and the timings,
+    including time to first token and tokens/sec; failures end the stream
+    with an `error` event.
+    """
+    try:
+        logger.info(f"Processing streaming query: {query.question}")
+        prepared = await prepare_query(query)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error generating summary: {str(e)}", exc_info=True)
+        logger.error(f"Error processing query: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream_tokens():
+        timings = prepared["timings"]
+        if "prompt" not in prepared:
+            yield sse_event("token", {"text": prepared["answer"]})
+            yield sse_event("done", {
+                "answer": prepared["answer"], "cached": prepared.get("cached", False), "timings": timings
+            })
+            return
+
+        parts = []
+        try:
+            async for part in llm_client.generate_stream(prepared["prompt"]):
+                if part.get("done"):
+                    timings.update(
+                        ttft_ms=part["ttft_ms"], generation_ms=part["generation_ms"],
+                        tokens=part["tokens"], tokens_per_second=part["tokens_per_second"]
+                    )
+                else:
+                    parts.append(part["response"])
+                    yield sse_event("token", {"text": part["response"]})
+        except Exception as e:
+            logger.error(f"Error streaming query answer: {str(e)}", exc_info=True)
+            yield sse_event("error", {"error": str(e)})
+            return
+
+        # Only complete answers are cached; a client that disconnects cancels the generation
+        answer = "".join(parts)
+        await asyncio.to_thread(answer_cache.put, prepared["cache_key"], prepared["document_id"], answer)
+        yield sse_event("done", {
+            "answer": answer, "cached": False, "timings": timings, "context": prepared["context"]
+        })
+
+    return StreamingResponse(
+        stream_tokens(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/query/batch")
+async def query_batch(batch: BatchQuery):
+    """Answer a list of questions about the RFP.
+
+    All questions are embedded and retrieved for together, then answered
+    with bounded concurrency. Answers are streamed as newline-delimited
+    JSON, one object per line, in the order they finish; `index` is the
+    question's position in the request.
+    """
+    questions = [question.strip() for question in batch.questions]
+    if not questions or not all(questions):
+        raise HTTPException(status_code=400, detail="Questions must be a non-empty list of non-empty strings")
+    if len(questions) > config.QUERY_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {config.QUERY_BATCH_MAX_QUESTIONS} questions per batch"
+        )
+    document_id = await resolve_document_id(batch.document_id)
+    logger.info(f"Answering {len(questions)} questions for document {document_id}")
+    engine = SummaryEngine(
+        vector_store,
+        llm_client,
+        [(question, question) for question in questions],
+        max_concurrency=config.QUERY_BATCH_CONCURRENCY,
+        k=config.SEARCH_K,
+        answer_cache=answer_cache,
+        document_id=document_id,
+        retriever=retriever,
+        context_builder=context_builder,
+        prompt=QUERY_PROMPT,
+        cache_namespace="query"
+    )
+
+    async def stream_answers():
+        try:
+            async for result in engine.stream():
+                result["question"] = result.pop("section")
+                yield json.dumps(result) + "\n"
+        except Exception as e:
+            logger.error(f"Error answering question batch: {str(e)}", exc_info=True)
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(stream_answers(), media_type="application/x-ndjson")
+
+@app.get("/summary")
+async def get_summary(document_id: Optional[str] = None, facts: Optional[str] = None):
+    """Generate a comprehensive summary of the RFP.
+
+    Sections are streamed as newline-delimited JSON, one object per line,
+    in the order they finish. With `facts=answer` the date and financial
+    sections are answered from the extracted facts without the LLM; with
+    `facts=seed` the facts go into their prompts.
+    """
+    facts_mode = facts or config.SUMMARY_FACTS
+    if facts_mode not in FACT_MODES:
+        raise HTTPException(status_code=400, detail=f"facts must be one of {', '.join(FACT_MODES)}")
+    document_id = await resolve_document_id(document_id)
+    logger.info(f"Generating summary for document {document_id}")
+    section_facts = {}
+    if facts_mode != "off":
+        document_facts = await asyncio.to_thread(document_registry.get_facts, document_id)
+        section_facts = {section: select_facts(document_facts, kinds, pattern)
+                         for section, (kinds, pattern) in FACT_SECTIONS.items()}
+    engine = SummaryEngine(
+        vector_store,
+        llm_client,
+        SUMMARY_QUESTIONS,
+        retriever=retriever,
+        context_builder=context_builder,
+        max_concurrency=config.SUMMARY_CONCURRENCY,
+        k=config.SEARCH_K,
+        answer_cache=answer_cache,
+        document_id=document_id,
+        facts=section_facts,
+        facts_mode=facts_mode
+    )
+
+    async def stream_sections():
+        try:
+            async for section in engine.stream():
+                yield json.dumps(section) + "\n"
+        except Exception as e:
+            logger.error(f"Error generating summary: {str(e)}", exc_info=True)
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(stream_sections(), media_type="application/x-ndjson")
+
+@app.get("/documents")
+async def list_documents():
+    """List the indexed documents."""
+    return {"documents": await asyncio.to_thread(document_registry.list)}
+
+@app.get("/documents/{document_id}/facts")
+async def get_document_facts(document_id: str, kind: Optional[str] = None):
+    """Dates, deadlines, amounts, percentages and EMD values extracted at ingestion.
+
+    `kind` filters by a comma-separated list of kinds.
+    """
+    if await asyncio.to_thread(document_registry.get, document_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown document: {document_id}")
+    kinds = [k.strip() for k in kind.split(",") if k.strip()] if kind else None
+    unknown = [k for k in kinds or [] if k not in FACT_KINDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fact kind: {', '.join(unknown)}. "
+                                                    f"Expected one of {', '.join(FACT_KINDS)}")
+    facts = await asyncio.to_thread(document_registry.get_facts, document_id, kinds)
+    return {"document_id": document_id, "facts": facts}
+
+@app.delete("/documents/{document_id}")
+async def delete_document(document_id: str):
+    """Remove a document, its chunks and its cached answers."""
+    if await asyncio.to_thread(document_registry.get, document_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown document: {document_id}")
+
+    await asyncio.to_thread(remove_document, document_id)
+    return {"message": "Document deleted", "document_id": document_id}
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Report answer cache size and hit/miss counters."""
+    return await asyncio.to_thread(answer_cache.stats)
+
+@app.get("/embeddings/stats")
+async def get_embedding_stats():
+    """Report embedding throughput and cache hit rate.
+
+    Until warm-up has loaded the embedding model this returns 503 rather than loading it here.
+    """
+    if not vector_store.ready:
+        raise HTTPException(status_code=503, detail="Embedding model is still loading", headers={"Retry-After": "5"})
+    return vector_store.embeddings.metrics()
+
 if __name__ == "__main__":
     logger.info("Starting RFP Analyzer server")
     logger.info("Server will be available at: http://localhost:8000")
@@ -0,0 +1,87 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import CollectorRegistry, Histogram, generate_latest, multiprocess
+
+# Seconds; generation and ingestion run into minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+COUNT_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+STAGE_SECONDS = Histogram(
+    "rfp_stage_seconds", "Time spent in each processing stage", ["stage"], buckets=LATENCY_BUCKETS
+)
+INGEST_STAGE_SECONDS = Histogram(
+    "rfp_ingest_stage_seconds", "Time each ingested document spent in each pipeline stage", ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_SECONDS = Histogram(
+    "rfp_request_seconds", "HTTP request latency until the response starts", ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+DOCUMENT_CHUNKS = Histogram("rfp_document_chunks", "Chunks per ingested document", buckets=COUNT_BUCKETS)
+DOCUMENT_PAGES = Histogram("rfp_document_pages", "Pages per ingested document", buckets=COUNT_BUCKETS)
+PROMPT_TOKENS = Histogram("rfp_prompt_tokens", "Tokens per LLM prompt", ["endpoint"], buckets=TOKEN_BUCKETS)
+GENERATED_TOKENS = Histogram("rfp_generated_tokens", "Tokens per LLM response", buckets=TOKEN_BUCKETS)
+
+# Per-request breakdown behind the X-Timing header: stage -> [seconds, calls].
+# asyncio.to_thread copies the context, so work done in threads lands in the same dict.
+_breakdown: contextvars.ContextVar[Optional[Dict[str, list]]] = contextvars.ContextVar(
+    "timing_breakdown", default=None
+)
+
+
+def observe(stage: str, seconds: float):
+    """Record time spent in a stage, in the histogram and the current request's breakdown."""
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        entry = breakdown.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time the enclosed block, or the decorated function, as `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+def exposition() -> bytes:
+    """The metrics in the Prometheus text format.
+
+    Under several server workers each process only sees its own requests;
+    with PROMETHEUS_MULTIPROC_DIR set, the samples every worker wrote there
+    are merged instead.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def start_breakdown() -> contextvars.Token:
+    """Start collecting stage timings for the current request."""
+    return _breakdown.set({})
+
+
+def finish_breakdown(token: contextvars.Token) -> str:
+    """Stop collecting and format the request's timings for the X-Timing header.
+
+    Server-Timing syntax, e.g. "search;dur=12.5, llm_generate;dur=830.1;count=3".
+    """
+    breakdown = _breakdown.get() or {}
+    _breakdown.reset(token)
+    parts = []
+    for stage, (seconds, calls) in breakdown.items():
+        part = f"{stage};dur={seconds * 1000:.1f}"
+        parts.append(part if calls == 1 else f"{part};count={calls}")
+    return ", ".join(parts)
@@ -0,0 +1,174 @@
+import hashlib
+import importlib.util
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+import config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Loaded once per process, on first use; PaddleOCR takes seconds to load its models
+_engine = None
+_cache: Optional["OcrCache"] = None
+
+
+@lru_cache(maxsize=None)
+def _paddleocr_installed() -> bool:
+    installed = importlib.util.find_spec("paddleocr") is not None
+    if not installed:
+        logger.warning("paddleocr is not installed; scanned pages will not be OCR'd")
+    return installed
+
+
+def ocr_available() -> bool:
+    """Return whether scanned pages can be OCR'd in this installation."""
+    return config.OCR_ENABLED and _paddleocr_installed()
+
+
+def has_text(text: str) -> bool:
+    """Return whether extracted page text contains anything worth indexing."""
+    return any(c.isalnum() for c in text)
+
+
+def image_only_pages(pdf_path: str, page_numbers: Iterable[int]) -> List[int]:
+    """Return which of the given pages (numbered from 1) draw images.
+
+    Callers pass the pages where no text layer was found, so these are the
+    scanned pages worth OCR'ing; blank pages are left alone.
+    """
+    page_numbers = list(page_numbers)
+    if not page_numbers:
+        return []
+    with fitz.open(pdf_path) as doc:
+        return [number for number in page_numbers if doc[number - 1].get_image_info()]
+
+
+def scanned_pages(pdf_path: str, pages: Iterable[Tuple[int, str]]) -> List[int]:
+    """Return the extracted pages with no text layer but an image, which are the ones to OCR."""
+    return image_only_pages(pdf_path, [number for number, text in pages if not has_text(text)])
+
+
+def page_image_key(page, dpi: int) -> str:
+    """Cache key for a page's OCR output: the hashes and placement of the images it draws.
+
+    Computed from the embedded images rather than a rendering, so a cache hit
+    skips rasterizing the page too. The same scan in a re-upload or a
+    corrigendum gets the same key wherever it appears.
+    """
+    digest = hashlib.sha256(f"{config.OCR_LANG}\0{dpi}\0{page.rotation}".encode("utf-8"))
+    for info in page.get_image_info(hashes=True):
+        digest.update(info["digest"])
+        digest.update(",".join(f"{value:.1f}" for value in info["bbox"]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """On-disk OCR output per page image, shared by every worker process."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or config.OCR_CACHE_PATH)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM pages WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, text, created_at) VALUES (?, ?, ?)",
+                (key, text, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def recognize(image: np.ndarray) -> str:
+    """Run OCR over an RGB image and return its lines of text, top to bottom."""
+    global _engine
+    if _engine is None:
+        from paddleocr import PaddleOCR
+        _engine = PaddleOCR(use_angle_cls=True, lang=config.OCR_LANG, show_log=False)
+        logger.info(f"Loaded PaddleOCR for '{config.OCR_LANG}'")
+    result = _engine.ocr(image, cls=True)
+    lines = result[0] if result else None
+    # Each line is [box, (text, confidence)]
+    return "\n".join(line[1][0] for line in lines or [])
+
+
+def ocr_page(pdf_path: str, page_number: int, dpi: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    """OCR one page (numbered from 1), going through the cache.
+
+    Returns the text and the page's timing, {"page", "ms", "cached"}.
+    Module-level so it can run in a process pool.
+    """
+    global _cache
+    dpi = dpi or config.OCR_DPI
+    if _cache is None:
+        _cache = OcrCache()
+
+    start = time.perf_counter()
+    with fitz.open(pdf_path) as doc:
+        page = doc[page_number - 1]
+        key = page_image_key(page, dpi)
+        text = _cache.get(key)
+        cached = text is not None
+        if not cached:
+            pixmap = page.get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+            image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, 3)
+            text = recognize(image)
+            _cache.put(key, text)
+    return text, {"page": page_number, "ms": round((time.perf_counter() - start) * 1000, 1), "cached": cached}
+
+
+def ocr_scanned(pdf_path: str, pages: Iterable[Tuple[int, str]], scanned: Iterable[int],
+                pool: Optional[Executor] = None,
+                task: Callable[[str, int], Tuple[str, Dict[str, Any]]] = ocr_page,
+                on_ocr: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Tuple[int, str]]:
+    """Yield `pages` in order with the text of the `scanned` ones replaced by OCR output.
+
+    With a pool, every scanned page is submitted straight away as its own
+    task, so they are read in parallel while the caller carries on;
+    without one, each is read as it is reached. `task` stands in for
+    ocr_page, e.g. to clean the text in the worker, and `on_ocr` is called
+    with each page's timing. Nothing is OCR'd when OCR is unavailable.
+    """
+    scanned = set(scanned) if ocr_available() else set()
+    futures = {}
+    if pool is not None:
+        futures = {number: pool.submit(task, pdf_path, number) for number in sorted(scanned)}
+
+    def replaced():
+        for number, text in pages:
+            if number in scanned:
+                text, timing = futures.pop(number).result() if pool is not None else task(pdf_path, number)
+                metrics.observe("ocr", timing["ms"] / 1000)
+                if on_ocr is not None:
+                    on_ocr(timing)
+            yield number, text
+
+    return replaced()
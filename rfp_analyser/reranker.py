@@ -0,0 +1,188 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import config
+import metrics
+
+logger = logging.getLogger(__name__)
+
+RERANK_MODES = ("none", "mmr", "cross-encoder")
+
+
+def drop_near_duplicates(embeddings: np.ndarray, order: List[int], threshold: float) -> Tuple[List[int], int]:
+    """Keep candidates in `order`, skipping any too similar to one already kept.
+
+    Returns the kept indexes and the number dropped.
+    """
+    kept: List[int] = []
+    for i in order:
+        if kept and float(np.max(embeddings[kept] @ embeddings[i])) >= threshold:
+            continue
+        kept.append(i)
+    return kept, len(order) - len(kept)
+
+
+def fused_relevance(hits: List[Dict[str, Any]]) -> np.ndarray:
+    """The first stage's fused (dense + keyword) scores, scaled so the best is 1."""
+    scores = np.array([hit.get('score') or 0.0 for hit in hits], dtype=np.float32)
+    top = float(scores.max()) if len(scores) else 0.0
+    return scores / top if top > 0 else scores
+
+
+def mmr(query: Optional[np.ndarray], embeddings: np.ndarray, k: int, diversity: float,
+        duplicate_threshold: float, relevance: Optional[np.ndarray] = None) -> Tuple[List[int], int]:
+    """Pick k candidates by maximal marginal relevance.
+
+    Each step takes the candidate with the best trade-off between relevance
+    and dissimilarity to what is already picked; candidates nearly identical
+    to a picked one are dropped. Relevance is cosine similarity to the query
+    unless given. Returns the picked indexes and the number of near-duplicates
+    dropped.
+    """
+    if relevance is None:
+        relevance = embeddings @ query
+    similarity = embeddings @ embeddings.T
+    available = np.ones(len(embeddings), dtype=bool)
+    closest = np.full(len(embeddings), -np.inf)  # similarity to the nearest picked candidate
+    picked: List[int] = []
+    dropped = 0
+    while len(picked) < k and available.any():
+        redundancy = np.where(np.isfinite(closest), closest, 0.0)
+        scores = np.where(available, (1 - diversity) * relevance - diversity * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        closest = np.maximum(closest, similarity[best])
+        duplicates = available & (similarity[best] >= duplicate_threshold)
+        dropped += int(duplicates.sum())
+        available &= ~duplicates
+    return picked, dropped
+
+
+class Retriever:
+    """Two-stage retrieval: over-fetch candidates, then re-rank them down to k.
+
+    Re-ranking uses either a cross-encoder scoring (question, chunk) pairs in
+    one batch, or maximal marginal relevance over the stored embeddings.
+    Both keep the first stage's fusion of dense and keyword rankings in play:
+    MMR takes the fused score as its relevance, and cross-encoder ranks are
+    fused with the first-stage ranks, so keyword-only hits are not lost.
+    Near-duplicate chunks are dropped either way. If the first stage overruns
+    its latency budget the re-ranking is skipped, and the cross-encoder only
+    scores as many candidates as its budget allows.
+    """
+
+    def __init__(self, vector_store, mode: Optional[str] = None, candidates: Optional[int] = None):
+        self.vector_store = vector_store
+        self.mode = mode or config.RERANK_MODE
+        if self.mode not in RERANK_MODES:
+            raise ValueError(f"Unknown re-rank mode: {self.mode}. Expected one of {', '.join(RERANK_MODES)}")
+        self.candidates = candidates or config.RERANK_CANDIDATES
+        self._cross_encoder = None
+        self._cross_encoder_lock = threading.Lock()
+        # Running estimate used to fit cross-encoder work into its budget
+        self._seconds_per_pair: Optional[float] = None
+
+    @property
+    def cross_encoder(self):
+        if self._cross_encoder is None:
+            with self._cross_encoder_lock:
+                if self._cross_encoder is None:
+                    from sentence_transformers import CrossEncoder
+                    self._cross_encoder = CrossEncoder(config.RERANK_MODEL, max_length=config.CHUNK_TOKENS * 2)
+                    logger.info(f"Loaded cross-encoder {config.RERANK_MODEL}")
+        return self._cross_encoder
+
+    def retrieve(self, query: str, k: int, document_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        results, timings = self.retrieve_batch([query], k, document_id)
+        return results[0], timings
+
+    def retrieve_batch(self, queries: List[str], k: int,
+                       document_id: Optional[str] = None) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Any]]:
+        """Return the top k chunks per query and the timings of each stage."""
+        if self.mode == "none":
+            start = time.perf_counter()
+            results = self.vector_store.search_batch(queries, k, document_id)
+            return results, {"retrieval_ms": _ms(start), "rerank": "none"}
+
+        start = time.perf_counter()
+        candidates = self.vector_store.search_batch(queries, max(k, self.candidates), document_id)
+        timings: Dict[str, Any] = {
+            "retrieval_ms": _ms(start),
+            "candidates": sum(len(hits) for hits in candidates)
+        }
+        if timings["retrieval_ms"] > config.RETRIEVAL_BUDGET_MS:
+            logger.warning(f"Retrieval took {timings['retrieval_ms']} ms, over its "
+                           f"{config.RETRIEVAL_BUDGET_MS} ms budget; skipping re-ranking")
+            timings["rerank"] = "skipped"
+            return [hits[:k] for hits in candidates], timings
+
+        start = time.perf_counter()
+        ids = list({hit['id'] for hits in candidates for hit in hits})
+        stored = self.vector_store.chunk_embeddings(ids)
+        if self.mode == "cross-encoder":
+            results, dropped = self._cross_encode(queries, candidates, stored, k)
+        else:
+            results, dropped = [], 0
+            for hits in candidates:
+                hits = [hit for hit in hits if hit['id'] in stored]
+                if not hits:
+                    results.append([])
+                    continue
+                picked, duplicates = mmr(
+                    None, np.stack([stored[hit['id']] for hit in hits]), k,
+                    config.MMR_DIVERSITY, config.DUPLICATE_THRESHOLD, relevance=fused_relevance(hits)
+                )
+                results.append([hits[i] for i in picked])
+                dropped += duplicates
+        timings.update(rerank=self.mode, rerank_ms=_ms(start), duplicates_dropped=dropped)
+        metrics.observe("rerank", timings["rerank_ms"] / 1000)
+        return results, timings
+
+    def _cross_encode(self, queries: List[str], candidates: List[List[Dict[str, Any]]],
+                      stored: Dict[str, np.ndarray], k: int) -> Tuple[List[List[Dict[str, Any]]], int]:
+        # Score only as many of each query's top candidates as fit in the budget
+        per_query = max(len(hits) for hits in candidates) if candidates else 0
+        if self._seconds_per_pair:
+            affordable = int(config.RERANK_BUDGET_MS / 1000 / self._seconds_per_pair / max(1, len(queries)))
+            per_query = max(k, min(per_query, affordable))
+
+        pairs = [(query, hit['text']) for query, hits in zip(queries, candidates) for hit in hits[:per_query]]
+        start = time.perf_counter()
+        scores = self.cross_encoder.predict(pairs, batch_size=config.EMBEDDING_BATCH_SIZE) if pairs else []
+        if pairs:
+            observed = (time.perf_counter() - start) / len(pairs)
+            self._seconds_per_pair = observed if self._seconds_per_pair is None else (
+                0.8 * self._seconds_per_pair + 0.2 * observed
+            )
+
+        results, dropped, offset = [], 0, 0
+        for hits in candidates:
+            scored = len(hits[:per_query])
+            hit_scores = scores[offset:offset + scored]
+            offset += scored
+            # Fuse the cross-encoder's ranking with the first stage's by reciprocal rank;
+            # unscored candidates keep their first-stage order after the scored ones
+            by_score = sorted(range(scored), key=lambda i: -hit_scores[i])
+            fused = {i: 1 / (config.HYBRID_RRF_K + rank + 1) + 1 / (config.HYBRID_RRF_K + i + 1)
+                     for rank, i in enumerate(by_score)}
+            order = sorted(range(scored), key=lambda i: -fused[i]) + list(range(scored, len(hits)))
+            ranked = [hits[i] for i in order if hits[i]['id'] in stored]
+            if not ranked:
+                results.append([])
+                continue
+            kept, duplicates = drop_near_duplicates(
+                np.stack([stored[hit['id']] for hit in ranked]), list(range(len(ranked))),
+                config.DUPLICATE_THRESHOLD
+            )
+            dropped += duplicates
+            results.append([ranked[i] for i in kept[:k]])
+        return results, dropped
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
@@ -9,7 +9,8 @@ setup(
         "setuptools>=68.0.0",
         "build>=1.0.3",
         "pdfminer.six>=20221105",
-        "paddleocr>=2.7.0",
+        "paddleocr>=2.7.0,<3.0",
+        "paddlepaddle>=2.5.0",
         "sentence-transformers>=2.2.2",
         "faiss-cpu>=1.7.4",
         "chromadb>=0.4.22",
@@ -22,9 +23,12 @@ setup(
         "reportlab>=4.0.8",
         "python-pptx>=0.6.23",
         "requests>=2.31.0",
+        "ollama>=0.6.2",
+        "httpx>=0.27.0",
+        "prometheus-client>=0.19.0",
         "numpy>=1.24.0",
         "pandas>=2.1.0",
         "scikit-learn>=1.3.0",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
 ) 
\ No newline at end of file
@@ -9,6 +9,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from pptx import Presentation
 from pptx.util import Inches, Pt
 import io
+import json
+import time
 import base64
 
 # Constants
@@ -94,37 +96,99 @@ def main():
         with st.spinner("Processing document..."):
             files = {"file": (uploaded_file.name, open(tmp_path, "rb"), "application/pdf")}
             response = requests.post(f"{API_URL}/analyze", files=files)
-            if response.status_code == 200:
-                st.success("Document processed successfully!")
-            else:
+            if response.status_code not in (200, 202):
                 st.error("Error processing document")
                 return
 
+            # Poll the ingestion job until it finishes
+            job = response.json()
+            progress = st.progress(0.0, text="Queued")
+            while job["status"] not in ("completed", "failed"):
+                time.sleep(1)
+                job = requests.get(f"{API_URL}/jobs/{job['job_id']}").json()
+                embedded = job["chunks_embedded"] / job["chunks_total"] if job["chunks_total"] else 0.0
+                progress.progress(
+                    embedded,
+                    text=f"{job['stage'].capitalize()}: {job['pages_processed']} pages, "
+                         f"{job['chunks_embedded']}/{job['chunks_total']} chunks embedded"
+                )
+            progress.empty()
+
+            if job["status"] == "failed":
+                st.error(f"Error processing document: {job['error']}")
+                return
+            document_id = job["document_id"]
+            st.success("Document processed successfully!")
+
         # Query section
         st.header("Ask Questions")
         question = st.text_input("Enter your question about the RFP:")
         if question:
-            with st.spinner("Generating answer..."):
-                response = requests.post(f"{API_URL}/query", json={"question": question})
-                if response.status_code == 200:
-                    st.write("Answer:", response.json()["answer"])
-                else:
-                    st.error("Error getting answer")
+            # Render tokens as they arrive instead of waiting for the whole answer
+            response = requests.post(
+                f"{API_URL}/query/stream",
+                json={"question": question, "document_id": document_id},
+                stream=True
+            )
+            if response.status_code == 200:
+                st.write("Answer:")
+                placeholder = st.empty()
+                answer = ""
+                event = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event: "):
+                        event = line[len("event: "):]
+                    elif line.startswith("data: "):
+                        data = json.loads(line[len("data: "):])
+                        if event == "token":
+                            answer += data["text"]
+                            placeholder.markdown(answer + "▌")
+                        elif event == "done":
+                            placeholder.markdown(data["answer"])
+                            timings = data["timings"]
+                            if data["cached"]:
+                                st.caption("Cached answer")
+                            elif timings.get("ttft_ms") is not None:
+                                st.caption(f"First token after {timings['ttft_ms'] / 1000:.2f}s, "
+                                           f"{timings['tokens_per_second'] or 0:.1f} tokens/sec")
+                        elif event == "error":
+                            st.error(f"Error getting answer: {data['error']}")
+            else:
+                st.error("Error getting answer")
 
         # Summary section
         st.header("Generate Summary")
+        facts_mode = st.radio(
+            "Dates and financial sections", ["off", "answer", "seed"], horizontal=True,
+            format_func={"off": "Generate", "answer": "List extracted facts",
+                         "seed": "Generate from extracted facts"}.get
+        )
         if st.button("Generate Summary"):
             with st.spinner("Generating summary..."):
-                response = requests.get(f"{API_URL}/summary")
+                response = requests.get(
+                    f"{API_URL}/summary",
+                    params={"document_id": document_id, "facts": facts_mode},
+                    stream=True
+                )
                 if response.status_code == 200:
-                    summary_data = response.json()
-                    
-                    # Display summary
+                    # Display each section as soon as the server finishes it
                     st.subheader("Summary")
-                    for section, content in summary_data.items():
-                        with st.expander(section):
+                    sections = {}
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        item = json.loads(line)
+                        if "section" not in item:
+                            st.error(f"Error generating summary: {item.get('error')}")
+                            continue
+                        content = item.get("answer", f"Error: {item.get('error')}")
+                        sections[item["index"]] = (item["section"], content)
+                        with st.expander(item["section"]):
                             st.write(content)
 
+                    # Keep the exports in the original question order
+                    summary_data = {section: content for _, (section, content) in sorted(sections.items())}
+
                     # Export options
                     st.subheader("Export Summary")
                     col1, col2 = st.columns(2)
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import metrics
+from answer_cache import AnswerCache
+from context_builder import ContextBuilder, count_tokens
+from facts import format_facts
+from llm_client import LLMClient
+from reranker import Retriever
+from vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+NOT_MENTIONED = "Not mentioned in the provided context."
+
+# How sections with extracted facts are answered: not at all from the facts,
+# straight from the facts without the LLM, or by the LLM with the facts in the prompt
+FACT_MODES = ("off", "answer", "seed")
+
+SUMMARY_PROMPT = """You are a highly accurate AI analyst. Answer the following question based ONLY on the provided context. If the information is not available, respond with "Not mentioned in the provided context."
+
+Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+
+class SummaryEngine:
+    """Answer a list of questions concurrently and yield each section as it finishes.
+
+    Serves /summary, and /query/batch with the query prompt and cache namespace.
+    Sections listed in `facts` can be answered from the document's extracted
+    facts, or have them put in the prompt ahead of fewer retrieved chunks.
+    """
+
+    def __init__(self, vector_store: VectorStore, llm_client: LLMClient,
+                 questions: List[Tuple[str, str]], max_concurrency: int = 4, k: int = 4,
+                 answer_cache: Optional[AnswerCache] = None, document_id: Optional[str] = None,
+                 retriever: Optional[Retriever] = None, context_builder: Optional[ContextBuilder] = None,
+                 prompt: str = SUMMARY_PROMPT, cache_namespace: str = "summary",
+                 facts: Optional[Dict[str, List[Dict[str, Any]]]] = None, facts_mode: str = "off"):
+        if facts_mode not in FACT_MODES:
+            raise ValueError(f"Unknown facts mode: {facts_mode}. Expected one of {', '.join(FACT_MODES)}")
+        self.vector_store = vector_store
+        self.retriever = retriever or Retriever(vector_store)
+        self.context_builder = context_builder or ContextBuilder()
+        self.prompt = prompt
+        self.cache_namespace = cache_namespace
+        self.llm_client = llm_client
+        self.answer_cache = answer_cache
+        self.document_id = document_id
+        self.questions = questions
+        self.max_concurrency = max(1, max_concurrency)
+        self.k = k
+        # Sections without any facts are answered as usual
+        self.facts = {section: found for section, found in (facts or {}).items() if found} if facts_mode != "off" else {}
+        self.facts_mode = facts_mode
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one result per summary section, in completion order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = []
+        try:
+            pending = []
+            for index, (section, question) in enumerate(self.questions):
+                if self.facts_mode == "answer" and section in self.facts:
+                    # Instant, so these stream before retrieval starts
+                    yield self._answer_from_facts(index, section)
+                else:
+                    pending.append((index, section, question))
+            if not pending:
+                return
+
+            # One batched embedding call, vector query and re-ranking pass for every question
+            retrieved, timings = await asyncio.to_thread(
+                self.retriever.retrieve_batch,
+                [question for _, _, question in pending],
+                self.k,
+                self.document_id
+            )
+            logger.info(f"Retrieved context for {len(pending)} summary questions: {timings}")
+
+            tasks = [
+                asyncio.create_task(self._answer(semaphore, index, section, question, results, timings))
+                for (index, section, question), results in zip(pending, retrieved)
+            ]
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The client may disconnect mid-stream; don't leave generations queued up
+            for task in tasks:
+                task.cancel()
+
+    def _answer_from_facts(self, index: int, section: str) -> Dict[str, Any]:
+        facts = self.facts[section]
+        return {
+            "index": index, "section": section, "cached": False, "source": "facts",
+            "facts_used": len(facts), "answer": format_facts(facts), "timings": {}, "elapsed": 0.0
+        }
+
+    async def _answer(self, semaphore: asyncio.Semaphore, index: int, section: str,
+                      question: str, results: List[Dict[str, Any]],
+                      timings: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the answer for a single summary section."""
+        start = time.perf_counter()
+        # Retrieval ran once for every section, so each reports the shared stage timings
+        result = {"index": index, "section": section, "cached": False, "timings": dict(timings)}
+        seed = self.facts.get(section) if self.facts_mode == "seed" else None
+        if seed:
+            # The facts carry the specifics, so fewer chunks are needed around them
+            results = results[:max(1, self.k // 2)]
+            result["facts_used"] = len(seed)
+        if not results and not seed:
+            result["answer"] = NOT_MENTIONED
+            result["elapsed"] = 0.0
+            return result
+
+        cache_key = None
+        if self.answer_cache is not None and self.document_id:
+            cache_key = AnswerCache.make_key(
+                self.document_id, question, [r['id'] for r in results],
+                self.llm_client.model, namespace=f"{self.cache_namespace}+facts" if seed else self.cache_namespace
+            )
+            cached = await asyncio.to_thread(self.answer_cache.get, cache_key)
+            if cached is not None:
+                result["answer"] = cached
+                result["cached"] = True
+                result["elapsed"] = round(time.perf_counter() - start, 3)
+                return result
+
+        with metrics.timed("build_prompt"):
+            # Seeded facts take up to a quarter of the prompt budget and the chunks get what is left
+            facts_text = ""
+            if seed:
+                facts = format_facts(seed, max_tokens=self.context_builder.max_tokens // 4)
+                facts_text = f"Facts extracted from the document:\n{facts}\n\n"
+            context, context_stats = self.context_builder.build(
+                question, [r['text'] for r in results],
+                lambda text: self.vector_store.expand_abbreviations(text, self.document_id),
+                max_tokens=self.context_builder.max_tokens - count_tokens(facts_text),
+                template=self.prompt
+            )
+            context = facts_text + context
+            prompt = self.prompt.format(context=context, question=question)
+            result["timings"]["prompt_tokens"] = count_tokens(prompt)
+        metrics.PROMPT_TOKENS.labels(self.cache_namespace).observe(result["timings"]["prompt_tokens"])
+
+        try:
+            async with semaphore:
+                generation_start = time.perf_counter()
+                result["answer"] = await self.llm_client.generate(prompt)
+                result["timings"]["generation_ms"] = round((time.perf_counter() - generation_start) * 1000, 1)
+            logger.info(f"Section '{section}': prompt of {result['timings']['prompt_tokens']} tokens "
+                        f"({context_stats['context_tokens']} of {context_stats['source_tokens']} context tokens "
+                        f"kept) generated in {result['timings']['generation_ms']} ms")
+            if cache_key is not None:
+                await asyncio.to_thread(self.answer_cache.put, cache_key, self.document_id, result["answer"])
+        except Exception as e:
+            logger.error(f"Error generating summary section '{section}': {e}", exc_info=True)
+            result["error"] = str(e)
+        result["elapsed"] = round(time.perf_counter() - start, 3)
+        return result
@@ -0,0 +1,21 @@
+from abbreviations import AbbreviationExpander
+
+
+def test_expands_whole_words_once():
+    expander = AbbreviationExpander({"EMD": "Earnest Money Deposit", "SLA": "Service Level Agreement"})
+
+    text = expander.expand("Pay the EMD. EMDS are refundable. The EMD and SLA apply.")
+
+    assert text == (
+        "Pay the EMD (Earnest Money Deposit). EMDS are refundable. "
+        "The EMD and SLA (Service Level Agreement) apply."
+    )
+
+
+def test_does_not_re_expand_defined_or_nested_abbreviations():
+    expander = AbbreviationExpander({"EMD": "Earnest Money Deposit", "EM": "Electronic Mail", "R&D": "Research and Development"})
+
+    assert expander.expand("EMD (Earnest Money Deposit) is due. EMD again.") == (
+        "EMD (Earnest Money Deposit) is due. EMD again."
+    )
+    assert expander.expand("R&D by EM") == "R&D (Research and Development) by EM (Electronic Mail)"
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from answer_cache import AnswerCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"), max_entries=3, ttl=0)
+    yield cache
+    cache.close()
+
+
+def test_key_depends_on_chunks_and_model_but_not_question_spacing():
+    key = AnswerCache.make_key("doc", "What is the EMD?", ["c1", "c2"], "granite")
+    assert key == AnswerCache.make_key("doc", "  what is the  emd?", ["c2", "c1"], "granite")
+    assert key != AnswerCache.make_key("doc", "What is the EMD?", ["c1", "c3"], "granite")
+    assert key != AnswerCache.make_key("doc", "What is the EMD?", ["c1", "c2"], "llama")
+    assert key != AnswerCache.make_key("doc", "What is the EMD?", ["c1", "c2"], "granite", namespace="summary")
+
+
+def test_least_recently_used_are_evicted_and_documents_invalidated(cache):
+    for n in range(3):
+        cache.put(f"k{n}", "doc-a" if n < 2 else "doc-b", f"answer {n}")
+        time.sleep(0.01)
+    assert cache.get("k0") == "answer 0"  # k1 is now the least recently used
+    cache.put("k3", "doc-b", "answer 3")
+    assert cache.get("k1") is None
+    assert [cache.get(key) for key in ("k0", "k2", "k3")] == ["answer 0", "answer 2", "answer 3"]
+
+    assert cache.invalidate_document("doc-b") == 2
+    assert cache.get("k2") is None and cache.get("k0") == "answer 0"
+    assert cache.stats() == {"entries": 1, "hits": 5, "misses": 2, "hit_rate": 5 / 7}
+
+
+def test_expired_answers_are_misses(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"), max_entries=10, ttl=0.05)
+    cache.put("k", "doc", "answer")
+    assert cache.get("k") == "answer"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
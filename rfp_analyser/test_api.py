@@ -0,0 +1,258 @@
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+import main
+import vector_store as vector_store_module
+from answer_cache import AnswerCache
+from document_registry import DocumentRegistry
+from fake_ollama import FakeOllamaServer
+from ingestion import IngestionQueue
+from llm_client import LLMClient
+from reranker import Retriever
+from vector_store import VectorStore
+
+DIM = 8
+
+
+class StubEmbeddingService:
+    """Embeds each text as a fixed unit vector derived from its hash; no model is loaded."""
+
+    def __init__(self, **kwargs):
+        self.encoded = 0
+
+    def encode(self, texts):
+        self.encoded += len(texts)
+        vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+            vectors[i] = np.random.default_rng(seed).random(DIM) + 0.01
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def warm(self, texts):
+        self.encode(texts)
+
+    def metrics(self):
+        return {"texts_encoded": self.encoded}
+
+    def close(self):
+        pass
+
+
+class StubPipelineQueue(IngestionQueue):
+    """Runs jobs without touching the PDF: each waits for `release`, and broken.pdf fails."""
+
+    release = threading.Event()
+
+    def _index(self, job):
+        if not self.release.wait(timeout=10):
+            raise TimeoutError("Stub pipeline was never released")
+        if job.filename == "broken.pdf":
+            raise ValueError("Could not extract text from the PDF")
+        job.pages_total = job.pages_processed = 1
+        job.chunks_total = 2
+        return {"EMD": "Earnest Money Deposit"}, [], {"embeddings_computed": 2}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """The app with its registry, caches and indexes in tmp_path, a stub embedder and a fake Ollama."""
+    fake = FakeOllamaServer(latency=0.05).start()
+    monkeypatch.setattr(config, "FAISS_PATH", str(tmp_path / "faiss"))
+    monkeypatch.setattr(config, "INGEST_MAX_PENDING", 1)
+    monkeypatch.setattr(vector_store_module, "EmbeddingService", StubEmbeddingService)
+
+    registry = DocumentRegistry(str(tmp_path / "documents.sqlite3"))
+    store = VectorStore(backend="faiss", keyword_index_path=str(tmp_path / "keywords.sqlite3"),
+                        abbreviation_loader=registry.get_abbreviations)
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"))
+    monkeypatch.setattr(main, "document_registry", registry)
+    monkeypatch.setattr(main, "vector_store", store)
+    monkeypatch.setattr(main, "retriever", Retriever(store))
+    monkeypatch.setattr(main, "answer_cache", cache)
+    monkeypatch.setattr(main, "llm_client", LLMClient(host=fake.url, model="fake-model"))
+    monkeypatch.setattr(main, "ingestion_queue", StubPipelineQueue(store, registry, cache, main.remove_document,
+                                                                   workers=1))
+    StubPipelineQueue.release.clear()
+
+    with TestClient(main.app) as client:
+        client.fake_ollama = fake
+        yield client
+        StubPipelineQueue.release.set()
+    fake.stop()
+
+
+def _upload(client, content: bytes, filename: str = "tender.pdf"):
+    return client.post("/analyze", files={"file": (filename, b"%PDF-1.4\n" + content, "application/pdf")})
+
+
+def _wait_for(client, job_id: str, status: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] == status or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def test_jobs_move_from_queued_through_running_to_completed_or_failed(api):
+    first = _upload(api, b"first tender")
+    assert first.status_code == 202
+    assert first.json()["status"] == "queued"
+    first = _wait_for(api, first.json()["job_id"], "running")
+    assert first["status"] == "running"
+    assert first["stage"] == "extracting"
+
+    # The same upload while it is being processed joins the job under way
+    again = _upload(api, b"first tender")
+    assert again.status_code == 202
+    assert again.json()["job_id"] == first["job_id"]
+
+    # The one worker is busy, so this waits; the queue holds INGEST_MAX_PENDING jobs
+    broken = _upload(api, b"unreadable scan", filename="broken.pdf")
+    assert broken.json()["status"] == "queued"
+    full = _upload(api, b"third tender")
+    assert full.status_code == 503
+    assert full.headers["Retry-After"] == "30"
+
+    StubPipelineQueue.release.set()
+    done = _wait_for(api, first["job_id"], "completed")
+    assert done["status"] == "completed"
+    assert done["stats"]["chunks_indexed"] == 2
+    assert done["stats"]["abbreviations_found"] == 1
+    assert main.document_registry.get(done["document_id"])["chunk_count"] == 2
+
+    failed = _wait_for(api, broken.json()["job_id"], "failed")
+    assert failed["status"] == "failed"
+    assert failed["error"] == "Could not extract text from the PDF"
+    assert main.document_registry.get(failed["document_id"]) is None
+
+
+def test_jobs_are_reported_from_the_shared_registry(api):
+    # A job run by another worker process is only known through the registry
+    main.document_registry.save_job({"job_id": "elsewhere", "document_id": "doc-1", "status": "running",
+                                     "pages_processed": 4})
+    assert api.get("/jobs/elsewhere").json()["pages_processed"] == 4
+    assert api.get("/jobs/unknown").status_code == 404
+
+
+def _index_document(document_id: str = "doc-1"):
+    texts = [
+        "The Earnest Money Deposit (EMD) is Rs 50,000, payable by demand draft.",
+        "Bids must be submitted on or before 15/03/2025 at 15:00 hours.",
+        "The contract runs for three years from the date of award.",
+        "Payment is released within 30 days of an accepted invoice.",
+    ]
+    main.vector_store.add_documents([(text, {"page": n + 1}) for n, text in enumerate(texts)], document_id)
+    main.document_registry.add(document_id, "tender.pdf", len(texts))
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_answers_stream_as_they_finish_with_their_index(api):
+    _index_document()
+    api.fake_ollama.delays = {"slowest question": 0.5}
+    questions = ["What is the slowest question about the EMD?", "When are bids due?", "How long is the contract?"]
+
+    response = api.post("/query/batch", json={"questions": questions, "document_id": "doc-1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    answers = _ndjson(response)
+    assert answers[-1]["index"] == 0
+    assert sorted(answer["index"] for answer in answers) == [0, 1, 2]
+    assert all(answer["question"] == questions[answer["index"]] for answer in answers)
+    assert all(answer["answer"].startswith("Fake answer") and not answer["cached"] for answer in answers)
+
+
+def test_repeated_batch_is_answered_from_the_cache(api):
+    _index_document()
+    questions = ["What is the EMD?", "When are bids due?"]
+
+    first = _ndjson(api.post("/query/batch", json={"questions": questions}))
+    second = _ndjson(api.post("/query/batch", json={"questions": questions}))
+
+    assert len(api.fake_ollama.requests) == 2
+    assert all(answer["cached"] for answer in second)
+    assert ({answer["index"]: answer["answer"] for answer in second}
+            == {answer["index"]: answer["answer"] for answer in first})
+
+
+def test_batch_size_and_questions_are_checked(api, monkeypatch):
+    _index_document()
+    monkeypatch.setattr(config, "QUERY_BATCH_MAX_QUESTIONS", 2)
+
+    too_many = api.post("/query/batch", json={"questions": ["One?", "Two?", "Three?"]})
+    assert too_many.status_code == 400
+    assert too_many.json()["detail"] == "At most 2 questions per batch"
+    assert api.post("/query/batch", json={"questions": ["One?", " "]}).status_code == 400
+    assert api.post("/query/batch", json={"questions": ["One?"], "document_id": "missing"}).status_code == 404
+    assert api.fake_ollama.requests == []
+
+
+def _events(response):
+    events = []
+    for block in response.text.split("\n\n"):
+        if block:
+            event, data = block.split("\n", 1)
+            events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_sends_tokens_then_done_and_caches_the_answer(api):
+    _index_document()
+
+    response = api.post("/query/stream", json={"question": "What is the EMD?"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response)
+    tokens = [data["text"] for event, data in events[:-1]]
+    assert [event for event, _ in events] == ["token"] * len(tokens) + ["done"]
+    done = events[-1][1]
+    assert "".join(tokens) == done["answer"] == FakeOllamaServer.answer_for(api.fake_ollama.requests[0]["prompt"])
+    assert not done["cached"]
+    assert done["timings"]["tokens"] == len(tokens)
+    assert "ttft_ms" in done["timings"]
+
+    # The cached answer arrives as a single token
+    events = _events(api.post("/query/stream", json={"question": "What is the EMD?"}))
+    assert [event for event, _ in events] == ["token", "done"]
+    assert events[0][1]["text"] == done["answer"]
+    assert events[1][1]["cached"]
+    assert len(api.fake_ollama.requests) == 1
+
+
+def test_stream_ends_with_an_error_event_when_generation_fails(api, monkeypatch):
+    _index_document()
+    monkeypatch.setattr(main.llm_client, "timeout", 0.01)
+
+    events = _events(api.post("/query/stream", json={"question": "What is the EMD?"}))
+
+    assert events == [("error", {"error": "LLM generation timed out after 0.01s"})]
+    # Nothing is cached, so asking again generates afresh
+    monkeypatch.setattr(main.llm_client, "timeout", 30.0)
+    assert _events(api.post("/query/stream", json={"question": "What is the EMD?"}))[-1][0] == "done"
+    assert api.post("/query/stream", json={"question": "What is the EMD?", "document_id": "missing"}).status_code == 404
+
+
+def test_embedding_stats_wait_for_warm_up_instead_of_loading_the_model(api, monkeypatch):
+    deadline = time.monotonic() + 10
+    while api.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert api.get("/embeddings/stats").json()["texts_encoded"] > 0
+
+    cold = VectorStore(backend="faiss", keyword_index_path=":memory:")
+    monkeypatch.setattr(main, "vector_store", cold)
+    response = api.get("/embeddings/stats")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert not cold.ready
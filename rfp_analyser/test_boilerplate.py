@@ -0,0 +1,52 @@
+from boilerplate import BoilerplateFilter, fingerprint
+from chunker import estimate_tokens
+
+HEADER = "Ministry of Railways  -  Tender No. RFP/0042/2025"
+ITEMS = ["switches", "routers", "servers", "cabling", "racks", "firewalls", "UPS units"]
+
+
+def _pages(count):
+    return [
+        (n, f"{HEADER}\nClause {n}.1 The bidder shall supply {ITEMS[n % 7]} for site {'ABCDEFGHIJKLMN'[n % 14]}.\n"
+            f"{ITEMS[(n + 3) % 7].capitalize()} are delivered to depot {'PQRSTUVWXYZ'[n % 11]}.\nPage {n} of {count}")
+        for n in range(1, count + 1)
+    ]
+
+
+def test_repeated_edge_lines_are_removed_while_streaming():
+    pages = _pages(30)
+    pulled = []
+
+    def source():
+        for page in pages:
+            pulled.append(page[0])
+            yield page
+
+    boilerplate = BoilerplateFilter(edge_lines=2, min_pages=3, min_ratio=0.5, window=5)
+    stream = boilerplate.filter(source())
+    number, text = next(stream)
+    assert number == 1 and len(pulled) == 6  # released after `window` pages of lookahead
+    assert text == "Clause 1.1 The bidder shall supply routers for site B.\nRacks are delivered to depot Q."
+
+    rest = list(stream)
+    assert all(HEADER not in text and "Page" not in text for _, text in rest)
+    assert all("Clause" in text and "depot" in text for _, text in rest)
+    tokens = 30 * sum(estimate_tokens(HEADER.split())) + sum(sum(estimate_tokens(["Page", str(n), "of", "30"]))
+                                                              for n in range(1, 31))
+    stats = boilerplate.stats()
+    assert stats["boilerplate_lines_removed"] == 60
+    assert stats["boilerplate_chars_removed"] == 30 * len(HEADER) + sum(len(f"Page {n} of 30") for n in range(1, 31))
+    assert stats["boilerplate_tokens_removed"] == tokens
+    assert stats["boilerplate_chunks_removed"] >= 1
+
+
+def test_short_documents_and_numbered_headings_are_untouched():
+    pages = _pages(2)
+    assert list(BoilerplateFilter(min_pages=3).filter(pages)) == pages
+
+    # Numbered headings at the top of each page differ only in their number
+    assert fingerprint("Page 3 of 40") == fingerprint("page 4  of 40")
+    assert fingerprint("2.") != fingerprint("3.") and fingerprint("Section 3") != fingerprint("Section 4")
+    pages = [(n, f"Section {n}\nThe bidder shall supply {ITEMS[n % 7]} for site {n}.") for n in range(1, 13)]
+    kept = list(BoilerplateFilter(edge_lines=1, min_pages=3, min_ratio=0.5, window=5).filter(pages))
+    assert all(text.startswith(f"Section {n}\n") for n, text in kept)
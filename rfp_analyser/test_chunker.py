@@ -0,0 +1,38 @@
+from chunker import StructuralChunker, estimate_tokens
+
+
+def _chunks(pages, max_tokens=40, overlap=8):
+    return list(StructuralChunker(max_tokens, overlap, token_counter=estimate_tokens).chunks(pages))
+
+
+def test_sections_do_not_overlap_and_keep_text_outside_headings():
+    pages = [
+        (1, "Tender notice for network upgrade\n1. Scope of Work\nSupply and install switches"),
+        (2, "across all sites\n2. Evaluation Criteria\nLowest price wins\nScope of Work is final"),
+    ]
+
+    chunks = _chunks(pages)
+
+    assert [(meta["section"], meta["page_start"], meta["page_end"]) for _, meta in chunks] == [
+        ("", 1, 1),
+        ("Scope of Work", 1, 2),
+        ("Evaluation Criteria", 2, 2),
+    ]
+    assert chunks[1][0] == "1. Scope of Work Supply and install switches across all sites"
+    words = [word for text, _ in chunks for word in text.split()]
+    assert len(words) == sum(len(text.split()) for _, text in pages)
+
+
+def test_chunks_stay_within_token_budget_with_overlap():
+    text = " ".join(f"clause{i} requires compliance" for i in range(100))
+
+    chunks = _chunks([(1, text)], max_tokens=40, overlap=8)
+
+    assert len(chunks) > 1
+    assert all(meta["token_count"] <= 38 for _, meta in chunks)
+    for (previous, _), (current, _) in zip(chunks, chunks[1:]):
+        # Each chunk opens with up to 8 tokens from the end of the one before
+        overlap = max(k for k in range(1, 9) if previous.split()[-k:] == current.split()[:k])
+        assert sum(estimate_tokens(current.split()[:overlap])) <= 8
+        assert sum(estimate_tokens(current.split()[:overlap + 1])) > 8
+    assert chunks[-1][0].endswith("clause99 requires compliance")
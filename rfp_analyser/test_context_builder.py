@@ -0,0 +1,52 @@
+from chunker import estimate_tokens
+from context_builder import ContextBuilder, count_tokens
+
+
+def test_repeated_sentences_are_kept_once():
+    header = "Government of Example State Tender Document."
+    texts = [
+        f"{header} The EMD is Rs 50,000. It is refundable.",
+        f"{header} Bids are due on 12/05/2024.",
+    ]
+
+    context, stats = ContextBuilder(1000, token_counter=estimate_tokens).build("What is the EMD?", texts)
+
+    assert context.count(header) == 1
+    assert stats["duplicates_removed"] == 1
+    assert stats["sentences_dropped"] == 0
+    assert context.split("\n\n")[1] == "Bids are due on 12/05/2024."
+
+
+def test_over_budget_keeps_relevant_sentences_within_budget():
+    filler = " ".join(f"Clause {i} covers general conditions of contract." for i in range(30))
+    texts = [
+        f"{filler} The earnest money deposit is Rs 2,00,000 payable by demand draft.",
+        f"Performance security is 5 percent of contract value. {filler}",
+    ]
+    builder = ContextBuilder(60, token_counter=estimate_tokens)
+
+    context, stats = builder.build(
+        "How much is the earnest money deposit?", texts,
+        expand=lambda text: text.replace("Rs", "Rs (Rupees)", 1)
+    )
+
+    assert "The earnest money deposit is Rs (Rupees) 2,00,000" in context
+    assert count_tokens(context, estimate_tokens) == stats["context_tokens"] <= 60
+    assert stats["sentences_dropped"] > 0
+
+
+def test_budget_with_a_template_covers_the_whole_prompt():
+    template = "Answer only from the context below, citing the clause.\n\nContext:\n{context}\n\nQuestion: {question}\n\nAnswer:"
+    question = "How much is the earnest money deposit?"
+    texts = [f"Clause {i} of the tender sets out general conditions that apply to every bidder." for i in range(8)]
+    texts[3] += " The earnest money deposit is Rs 2,00,000."
+    builder = ContextBuilder(80, token_counter=estimate_tokens)
+
+    context, stats = builder.build(question, texts, template=template)
+    prompt = template.format(context=context, question=question)
+
+    assert count_tokens(prompt, estimate_tokens) <= 80
+    assert stats["context_tokens"] <= 80 - count_tokens(template.format(context="", question=question), estimate_tokens)
+    assert "The earnest money deposit is Rs 2,00,000." in context
+    # Without the template the context alone fills the budget
+    assert builder.build(question, texts)[1]["context_tokens"] > stats["context_tokens"]
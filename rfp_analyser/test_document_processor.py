@@ -0,0 +1,50 @@
+import fitz
+
+import document_processor
+from document_processor import DocumentProcessor, extract_page_range
+
+
+def _pdf(path, pages):
+    """Write a PDF with one page per string; None leaves the page blank."""
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if text is not None:
+            page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_pages_without_text_are_retried_with_pdfminer_one_by_one(tmp_path, monkeypatch):
+    pdf = _pdf(tmp_path / "tender.pdf", ["Tender notice", None, "Scope of work", None, "Annexure"])
+    retried = []
+
+    def pdfminer_pages(path, indexes):
+        retried.append(indexes)
+        # pdfminer reads the second page but finds nothing on the fourth either
+        return ["Read by pdfminer" if i == 1 else "" for i in indexes]
+
+    monkeypatch.setattr(document_processor, "_pdfminer_pages", pdfminer_pages)
+
+    pages = extract_page_range(pdf, 1, 5)
+
+    assert retried == [[1, 3]]
+    assert [(number, text.strip()) for number, text in pages] == [
+        (2, "Read by pdfminer"), (3, "Scope of work"), (4, ""), (5, "Annexure")
+    ]
+
+
+def test_pdfminer_backend_numbers_pages_from_the_range_start(tmp_path):
+    pdf = _pdf(tmp_path / "tender.pdf", ["Tender notice", "Scope of work", "Annexure"])
+
+    pages = extract_page_range(pdf, 1, 3, backend="pdfminer")
+
+    assert [(number, text.strip()) for number, text in pages] == [(2, "Scope of work"), (3, "Annexure")]
+
+
+def test_abbreviation_definitions_wrapped_across_lines_are_read_whole():
+    text = "The bidder shall submit the EMD (Earnest Money\nDeposit) and an SLA (Service Level Agreement)."
+    assert DocumentProcessor().extract_abbreviations(text) == {
+        "EMD": "Earnest Money Deposit", "SLA": "Service Level Agreement"
+    }
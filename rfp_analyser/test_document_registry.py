@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+import time
+
+from document_registry import DocumentRegistry
+
+
+def test_workers_sharing_a_registry_see_each_others_state(tmp_path):
+    # Two API worker processes open the same file
+    path = str(tmp_path / "documents.sqlite3")
+    first, second = DocumentRegistry(path), DocumentRegistry(path)
+
+    first.add("doc-1", "tender.pdf", 12)
+    first.set_abbreviations("doc-1", {"EMD": "Earnest Money Deposit"})
+    assert second.latest()["document_id"] == "doc-1"
+    assert second.get_abbreviations("doc-1") == {"EMD": "Earnest Money Deposit"}
+
+    first.save_job({"job_id": "job-1", "document_id": "doc-1", "status": "running", "pages_processed": 3})
+    assert second.get_job("job-1")["pages_processed"] == 3
+    assert second.get_job("unknown") is None
+
+    # Only the most recent finished jobs are kept
+    for n in range(2, 5):
+        first.save_job({"job_id": f"job-{n}", "document_id": "doc-1", "status": "completed"}, history=2)
+    assert second.get_job("job-2") is None
+    assert second.get_job("job-4")["status"] == "completed"
+    assert second.get_job("job-1")["status"] == "running"
+
+    first.close()
+    second.close()
+
+
+def test_only_one_worker_claims_a_document(tmp_path):
+    path = str(tmp_path / "documents.sqlite3")
+    first, second = DocumentRegistry(path), DocumentRegistry(path)
+
+    assert first.claim_job({"job_id": "a", "document_id": "doc-1", "status": "queued"}, stale_after=60) is None
+    # The same upload reaching another worker gets the job already under way
+    assert second.claim_job({"job_id": "b", "document_id": "doc-1", "status": "queued"}, stale_after=60)["job_id"] == "a"
+    assert second.get_job("b") is None
+
+    # Once it finishes, or if its worker stopped updating it, the document can be claimed again
+    first.save_job({"job_id": "a", "document_id": "doc-1", "status": "completed"})
+    assert second.claim_job({"job_id": "c", "document_id": "doc-1", "status": "queued"}, stale_after=60) is None
+    time.sleep(0.05)
+    assert first.claim_job({"job_id": "d", "document_id": "doc-1", "status": "queued"}, stale_after=0.01) is None
+
+    first.close()
+    second.close()
+
+
+def test_reads_are_not_held_up_by_a_claim_waiting_for_the_write_lock(tmp_path):
+    path = str(tmp_path / "documents.sqlite3")
+    registry = DocumentRegistry(path)
+    registry.add("doc-1", "tender.pdf", 12)
+    # Another worker is in the middle of a write
+    writer = sqlite3.connect(path)
+    writer.execute("BEGIN IMMEDIATE")
+
+    claimed = []
+    claim = threading.Thread(target=lambda: claimed.append(
+        registry.claim_job({"job_id": "a", "document_id": "doc-2", "status": "queued"}, stale_after=60)
+    ))
+    claim.start()
+    time.sleep(0.1)
+    start = time.perf_counter()
+    assert registry.get("doc-1")["chunk_count"] == 12
+    assert time.perf_counter() - start < 0.5
+    assert claim.is_alive()
+
+    writer.rollback()
+    claim.join()
+    assert claimed == [None]
+    assert registry.get_job("a")["status"] == "queued"
+    writer.close()
+    registry.close()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+import sentence_transformers
+
+from embedding_service import EmbeddingService
+
+
+class StubModel:
+    """Stands in for a SentenceTransformer: unnormalized vectors from the text length, calls recorded."""
+
+    device = "cpu"
+    calls = []
+
+    def __init__(self, model_name, device=None):
+        pass
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True):
+        StubModel.calls.append(list(texts))
+        return np.array([[len(text), 1.0, 2.0] for text in texts])
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+
+@pytest.fixture(autouse=True)
+def stub_model(monkeypatch):
+    monkeypatch.setattr(sentence_transformers, "SentenceTransformer", StubModel)
+    StubModel.calls = []
+
+
+def test_embeddings_are_normalized_float32_rows(tmp_path):
+    service = EmbeddingService(cache_path=str(tmp_path / "embeddings.sqlite3"))
+
+    vectors = service.encode(["EMD", "Earnest Money Deposit"])
+
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (2, 3)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert np.allclose(vectors[0], np.array([3, 1, 2]) / np.sqrt(14))
+    assert service.encode([]).shape == (0, 3)
+    service.close()
+
+
+def test_repeated_texts_are_served_from_the_lru(tmp_path):
+    service = EmbeddingService(cache_path=str(tmp_path / "embeddings.sqlite3"), lru_size=2)
+
+    first = service.encode(["a", "bb", "a"])
+    again = service.encode(["bb", "a"])
+
+    assert StubModel.calls == [["a", "bb"]]
+    assert np.array_equal(first[0], first[2])
+    assert np.array_equal(again, first[[1, 0]])
+    # The repeat within the first batch is encoded once but not counted as a hit
+    stats = service.metrics()
+    assert (stats["cache_hits"], stats["cache_misses"], stats["lru_entries"]) == (2, 3, 2)
+    service.close()
+
+
+def test_embeddings_outlive_the_lru_and_the_process_in_sqlite(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    service = EmbeddingService(cache_path=path, lru_size=1)
+    first = service.encode(["a", "bb"])
+    # "a" has been evicted from the LRU but is still on disk
+    assert np.array_equal(service.encode(["a"])[0], first[0])
+    service.close()
+
+    restarted = EmbeddingService(cache_path=path)
+    assert np.array_equal(restarted.encode(["bb", "a"]), first[[1, 0]])
+    assert StubModel.calls == [["a", "bb"]]
+    assert restarted.metrics()["cache_hit_rate"] == 1.0
+    restarted.close()
+
+    uncached = EmbeddingService(use_disk_cache=False)
+    uncached.encode(["a"])
+    assert StubModel.calls[-1] == ["a"]
+    uncached.close()
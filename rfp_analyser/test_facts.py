@@ -0,0 +1,61 @@
+from facts import FactExtractor, format_facts, select_facts
+
+PAGE = """SECTION 3: BID SUBMISSION
+The bidder shall submit an Earnest Money Deposit (EMD) of Rs. 5,00,000 with the technical bid.
+All bids must reach the tendering authority on or before 15/03/2025 at 15:00 hours. The
+contract was signed on 2nd March, 2024. The estimated cost is INR 2.5 crore.
+4. PAYMENT TERMS
+Payment of 60% shall be released on delivery. Bid security of 2 percent applies to
+foreign bidders. Invalid dates such as 31/02/2025 are skipped."""
+
+
+def test_facts_are_extracted_with_kind_and_sentence():
+    extractor = FactExtractor()
+    facts = extractor.extract(7, PAGE)
+
+    assert [(fact["kind"], fact["value"], fact["text"]) for fact in facts] == [
+        ("emd", "500000", "Rs. 5,00,000"),
+        ("deadline", "2025-03-15", "15/03/2025"),
+        ("date", "2024-03-02", "2nd March, 2024"),
+        ("amount", "25000000", "INR 2.5 crore"),
+        ("percentage", "60%", "60%"),
+        ("emd", "2%", "2 percent"),
+    ]
+    assert facts[1]["context"] == "All bids must reach the tendering authority on or before 15/03/2025 at 15:00 hours."
+    # Headings stay out of the sentence
+    assert facts[0]["context"].startswith("The bidder shall submit")
+    assert all(fact["page"] == 7 for fact in facts)
+
+    # A page repeated, as in a corrigendum, adds nothing new
+    assert extractor.extract(8, PAGE) == []
+    assert len(extractor.facts) == 6
+
+
+def test_selected_facts_are_listed_once_per_sentence():
+    facts = FactExtractor().extract(1, PAGE)
+    money = select_facts(facts, ("emd", "amount"))
+    assert [fact["value"] for fact in money] == ["500000", "25000000", "2%"]
+
+    listing = format_facts(facts, limit=3)
+    assert listing.splitlines()[0] == (
+        "- The bidder shall submit an Earnest Money Deposit (EMD) of Rs. 5,00,000 with the technical bid. (page 1)"
+    )
+    assert listing.splitlines()[-1] == "- ... and 3 more"
+    budgeted = format_facts(facts, max_tokens=70).splitlines()
+    assert 1 < len(budgeted) < 6 and budgeted[-1].endswith("more")
+
+
+def test_words_ending_in_rs_or_inr_are_not_currency():
+    text = ("The contract runs for 3 years 5 months. Support covers 500 users 24x7. "
+            "The portal serves 200 concurrent users 100 times a day. Faults are fixed within 4 hrs 30 minutes.")
+    assert [fact for fact in FactExtractor().extract(1, text) if fact["kind"] in ("amount", "emd")] == []
+    assert [fact["value"] for fact in FactExtractor().extract(1, "Fees: Rs.300 and INR2 crore.")] == ["300", "20000000"]
+
+
+def test_only_amounts_just_after_an_emd_cue_are_emd_values():
+    text = ("Uptime of 99.5% is required each month, failing which an EMD penalty applies. "
+            "The EMD of Rs 50,000 is refunded after award, and the contract value is Rs 10 lakh.")
+    facts = FactExtractor().extract(1, text)
+    assert [(fact["kind"], fact["value"]) for fact in facts] == [
+        ("percentage", "99.5%"), ("emd", "50000"), ("amount", "1000000")
+    ]
@@ -0,0 +1,42 @@
+import pytest
+
+from keyword_index import KeywordIndex, tokenize
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = KeywordIndex(str(tmp_path / "keywords.sqlite3"))
+    yield index
+    index.close()
+
+
+def test_tokenize_keeps_amounts_dates_and_clause_numbers():
+    tokens = tokenize("The EMD of Rs. 5,00,000 is due by 12/05/2024 under clause 7.3.1.")
+
+    assert tokens == ["emd", "rs", "5,00,000", "due", "12/05/2024", "under", "clause", "7.3.1"]
+
+
+def test_exact_tokens_rank_first_and_filter_by_document(index):
+    index.add([
+        ("a:0", "a", "The bidder shall install the network equipment."),
+        ("a:1", "a", "An EMD of Rs. 5,00,000 is payable with the bid."),
+        ("b:0", "b", "The EMD for this tender is waived."),
+    ])
+
+    assert index.search("What is the EMD amount?", k=1)[0][0] in ("a:1", "b:0")
+    assert [chunk_id for chunk_id, _ in index.search("EMD 5,00,000", document_id="a")] == ["a:1"]
+    assert index.search("EMD", document_id="b")[0][0] == "b:0"
+
+
+def test_replacing_and_removing_chunks_updates_statistics(index):
+    index.add([("a:0", "a", "earnest money deposit"), ("a:1", "a", "performance bank guarantee")])
+    index.add([("a:0", "a", "security deposit")])
+
+    assert index.search("earnest") == []
+    assert index.search("security")[0][0] == "a:0"
+
+    index.delete_document("a")
+
+    assert index.count() == 0
+    assert index.search("deposit") == []
+    assert index._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0] == 0
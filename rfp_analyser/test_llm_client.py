@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from fake_ollama import FakeOllamaServer
+from llm_client import LLMClient
+
+
+@pytest.fixture
+def fake_ollama():
+    server = FakeOllamaServer(latency=0.2).start()
+    yield server
+    server.stop()
+
+
+def _run(coro_factory, server, **kwargs):
+    async def runner():
+        client = LLMClient(host=server.url, model="fake-model", **kwargs)
+        try:
+            return await coro_factory(client)
+        finally:
+            await client.close()
+    return asyncio.run(runner())
+
+
+def test_generate_returns_response(fake_ollama):
+    answer = _run(lambda client: client.generate("What is the EMD?"), fake_ollama)
+
+    assert answer == FakeOllamaServer.answer_for("What is the EMD?")
+    assert fake_ollama.requests[0]["model"] == "fake-model"
+
+
+def test_identical_prompts_share_one_generation(fake_ollama):
+    async def ask(client):
+        answers = await asyncio.gather(*[client.generate("same prompt") for _ in range(5)])
+        return answers, client.coalesced
+
+    answers, coalesced = _run(ask, fake_ollama)
+
+    assert len(set(answers)) == 1
+    assert len(fake_ollama.requests) == 1
+    assert coalesced == 4
+
+
+def test_prompt_asked_again_after_its_only_caller_left_is_generated_afresh(fake_ollama):
+    async def ask(client):
+        first = asyncio.create_task(client.generate("same prompt"))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # The cancelled generation may not have finished yet; it must not be joined
+        return await client.generate("same prompt"), client.coalesced
+
+    answer, coalesced = _run(ask, fake_ollama)
+
+    assert answer == FakeOllamaServer.answer_for("same prompt")
+    assert coalesced == 0
+
+
+def test_concurrency_is_bounded(fake_ollama):
+    async def ask(client):
+        return await asyncio.gather(*[client.generate(f"prompt {i}") for i in range(6)])
+
+    _run(ask, fake_ollama, max_concurrency=2)
+
+    assert len(fake_ollama.requests) == 6
+    assert fake_ollama.max_active <= 2
+
+
+def test_generation_times_out(fake_ollama):
+    with pytest.raises(TimeoutError):
+        _run(lambda client: client.generate("slow prompt"), fake_ollama, timeout=0.05)
+
+
+def test_generate_stream_yields_tokens_then_stats():
+    server = FakeOllamaServer(latency=0.1, token_latency=0.01).start()
+    try:
+        async def stream(client):
+            return [part async for part in client.generate_stream("What is the EMD?")]
+
+        parts = _run(stream, server)
+    finally:
+        server.stop()
+
+    text = "".join(part["response"] for part in parts[:-1])
+    assert text == FakeOllamaServer.answer_for("What is the EMD?")
+    stats = parts[-1]
+    assert stats["done"] and stats["tokens"] == len(parts) - 1
+    assert stats["ttft_ms"] >= 100 and stats["tokens_per_second"] > 0
@@ -0,0 +1,34 @@
+from prometheus_client import REGISTRY
+
+import metrics
+
+
+def _count(stage):
+    return REGISTRY.get_sample_value("rfp_stage_seconds_count", {"stage": stage}) or 0
+
+
+def test_timed_feeds_histogram_and_request_breakdown():
+    before = _count("test_stage")
+
+    @metrics.timed("test_stage")
+    def work():
+        return 42
+
+    token = metrics.start_breakdown()
+    assert work() == 42
+    with metrics.timed("test_stage"):
+        pass
+    with metrics.timed("other_stage"):
+        pass
+    header = metrics.finish_breakdown(token)
+
+    assert _count("test_stage") == before + 2
+    stages = [part.split(";")[0] for part in header.split(", ")]
+    assert stages == ["test_stage", "other_stage"]
+    assert header.split(", ")[0].endswith(";count=2")
+
+
+def test_observe_outside_a_request_only_feeds_histogram():
+    before = _count("background")
+    metrics.observe("background", 0.5)
+    assert _count("background") == before + 1
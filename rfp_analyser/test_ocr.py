@@ -0,0 +1,78 @@
+import fitz
+import numpy as np
+import pytest
+
+import ocr
+
+
+def _scan(seed):
+    """A PNG of random pixels standing in for a scanned page."""
+    pixels = np.random.default_rng(seed).integers(0, 255, (60, 40, 3), dtype=np.uint8)
+    return fitz.Pixmap(fitz.csRGB, 40, 60, pixels.tobytes(), False).tobytes("png")
+
+
+def _pdf(path, pages):
+    """Write a PDF whose pages are text (a str), a scan (an int seed) or blank (None)."""
+    doc = fitz.open()
+    for content in pages:
+        page = doc.new_page()
+        if isinstance(content, str):
+            page.insert_text((72, 72), content)
+        elif content is not None:
+            page.insert_image(page.rect, stream=_scan(content))
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def recognized(tmp_path, monkeypatch):
+    calls = []
+
+    def recognize(image):
+        calls.append(image.shape)
+        return f"scanned text {len(calls)}"
+
+    monkeypatch.setattr(ocr, "recognize", recognize)
+    monkeypatch.setattr(ocr, "_cache", ocr.OcrCache(str(tmp_path / "ocr.sqlite3")))
+    yield calls
+    ocr._cache.close()
+
+
+def test_only_image_pages_are_ocr_candidates(tmp_path):
+    pdf = _pdf(tmp_path / "mixed.pdf", ["Tender notice", 1, None])
+    assert ocr.image_only_pages(pdf, [2, 3]) == [2]
+
+
+def test_pages_are_ocrd_once_per_image(tmp_path, recognized):
+    first = _pdf(tmp_path / "first.pdf", [1, 2])
+    # A corrigendum repeating the first scan on another page
+    corrigendum = _pdf(tmp_path / "corrigendum.pdf", ["Corrigendum 1", 1])
+
+    text, timing = ocr.ocr_page(first, 1, dpi=72)
+    assert text == "scanned text 1"
+    assert timing["page"] == 1 and not timing["cached"] and timing["ms"] >= 0
+    assert recognized == [(842, 595, 3)]  # A4 at 72 dpi
+
+    assert ocr.ocr_page(first, 2, dpi=72)[0] == "scanned text 2"
+    text, timing = ocr.ocr_page(corrigendum, 2, dpi=72)
+    assert text == "scanned text 1" and timing["cached"]
+    assert len(recognized) == 2
+
+    # A different resolution can read differently, so it is OCR'd again
+    ocr.ocr_page(first, 1, dpi=100)
+    assert len(recognized) == 3
+
+
+def test_scanned_pages_are_replaced_in_order(tmp_path, recognized, monkeypatch):
+    monkeypatch.setattr(ocr, "ocr_available", lambda: True)
+    pdf = _pdf(tmp_path / "mixed.pdf", ["Tender notice", 1, None])
+    pages = [(1, "Tender notice"), (2, ""), (3, "")]
+    timings = []
+
+    scanned = ocr.scanned_pages(pdf, pages)
+    assert scanned == [2]
+    replaced = ocr.ocr_scanned(pdf, pages, scanned, task=lambda path, number: ocr.ocr_page(path, number, dpi=72),
+                               on_ocr=timings.append)
+    assert list(replaced) == [(1, "Tender notice"), (2, "scanned text 1"), (3, "")]
+    assert [timing["page"] for timing in timings] == [2]
@@ -0,0 +1,62 @@
+import numpy as np
+
+from reranker import Retriever, drop_near_duplicates, mmr
+
+
+def _unit(*rows):
+    matrix = np.array(rows, dtype=np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_mmr_prefers_diverse_candidates_and_drops_duplicates():
+    query = _unit([1.0, 1.0, 0.0])[0]
+    embeddings = _unit(
+        [1.0, 0.9, 0.0],    # most relevant
+        [1.0, 0.9, 0.001],  # near-duplicate of the first
+        [1.0, 0.6, 0.0],    # relevant but redundant
+        [0.2, 1.0, 0.8],    # less relevant, covers something new
+    )
+
+    picked, dropped = mmr(query, embeddings, k=2, diversity=0.5, duplicate_threshold=0.99)
+
+    assert picked == [0, 3]
+    assert dropped == 1
+
+    picked, dropped = mmr(query, embeddings, k=2, diversity=0.0, duplicate_threshold=0.99)
+    assert picked == [0, 2]
+
+
+def test_drop_near_duplicates_keeps_the_first_in_order():
+    embeddings = _unit([1.0, 0.0], [1.0, 0.001], [0.0, 1.0])
+
+    kept, dropped = drop_near_duplicates(embeddings, [1, 0, 2], threshold=0.99)
+
+    assert kept == [1, 2]
+    assert dropped == 1
+
+
+class _Store:
+    """Fused first-stage hits: "clause" matched only on keywords and sits far from the query embedding."""
+
+    hits = [
+        {"id": "dense-1", "text": "Bid security terms", "distance": 0.1, "score": 2 / 61},
+        {"id": "clause", "text": "Clause 7.3.2 EMD", "distance": None, "score": 1 / 61},
+        {"id": "dense-2", "text": "Security deposit", "distance": 0.15, "score": 1 / 62},
+        {"id": "dense-3", "text": "Bank guarantee", "distance": 0.2, "score": 1 / 63},
+    ]
+    stored = dict(zip(
+        ["dense-1", "clause", "dense-2", "dense-3"],
+        _unit([1.0, 0.1, 0.0], [0.0, 0.2, 1.0], [1.0, 0.2, 0.0], [1.0, 0.0, 0.2])
+    ))
+
+    def search_batch(self, queries, k, document_id=None):
+        return [self.hits[:k] for _ in queries]
+
+    def chunk_embeddings(self, ids):
+        return {chunk_id: self.stored[chunk_id] for chunk_id in ids}
+
+
+def test_keyword_only_hits_survive_mmr():
+    results, timings = Retriever(_Store(), mode="mmr", candidates=4).retrieve("clause 7.3.2", 2)
+    assert [hit["id"] for hit in results] == ["dense-1", "clause"]
+    assert timings["rerank"] == "mmr"
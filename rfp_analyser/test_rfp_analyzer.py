@@ -1,5 +1,7 @@
 import requests
 import os
+import json
+import time
 from pathlib import Path
 
 def test_rfp_analyzer():
@@ -18,7 +20,12 @@ def test_rfp_analyzer():
     with open(test_pdf, "rb") as f:
         files = {"file": (test_pdf, f, "application/pdf")}
         response = requests.post(f"{base_url}/analyze", files=files)
-        print(f"Analysis response: {response.json()}")
+        job = response.json()
+        while job["status"] not in ("completed", "failed"):
+            time.sleep(1)
+            job = requests.get(f"{base_url}/jobs/{job['job_id']}").json()
+        print(f"Analysis response: {job}")
+        document_id = job["document_id"]
 
     # Test query
     print("\nTesting query functionality...")
@@ -32,20 +39,24 @@ def test_rfp_analyzer():
     for question in test_questions:
         response = requests.post(
             f"{base_url}/query",
-            json={"question": question}
+            json={"question": question, "document_id": document_id}
         )
         print(f"\nQ: {question}")
         print(f"A: {response.json()['answer']}")
 
     # Test summary
     print("\nTesting summary generation...")
-    response = requests.get(f"{base_url}/summary")
-    summary = response.json()
-    
+    response = requests.get(
+        f"{base_url}/summary", params={"document_id": document_id}, stream=True
+    )
+
     print("\nRFP Summary:")
-    for section, content in summary.items():
-        print(f"\n{section}:")
-        print(content)
+    for line in response.iter_lines():
+        if not line:
+            continue
+        item = json.loads(line)
+        print(f"\n{item.get('section')}:")
+        print(item.get("answer", item.get("error")))
 
 if __name__ == "__main__":
     test_rfp_analyzer() 
\ No newline at end of file
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from answer_cache import AnswerCache
+from chunker import estimate_tokens
+from context_builder import ContextBuilder
+from fake_ollama import FakeOllamaServer
+from llm_client import LLMClient
+from summary_engine import SummaryEngine
+
+EMD_FACT = {"kind": "emd", "value": 50000, "text": "Rs 50,000", "context": "The EMD is Rs 50,000.", "page": 3}
+
+
+class StubRetriever:
+    """Returns `k` made-up chunks per question and remembers what it was asked."""
+
+    def __init__(self):
+        self.calls = []
+
+    def retrieve_batch(self, queries, k, document_id=None):
+        self.calls.append(list(queries))
+        results = [
+            [{"id": f"{query}-{n}", "text": f"Chunk {n} about {query}"} for n in range(k)]
+            for query in queries
+        ]
+        return results, {"retrieval_ms": 1.0}
+
+
+class StubVectorStore:
+    def expand_abbreviations(self, text, document_id=None):
+        return text
+
+
+@pytest.fixture
+def fake_ollama():
+    server = FakeOllamaServer(latency=0.1, delays={"slow question": 0.5}).start()
+    yield server
+    server.stop()
+
+
+def _engine(client, questions, **kwargs):
+    return SummaryEngine(
+        StubVectorStore(), client, questions, retriever=kwargs.pop("retriever", StubRetriever()),
+        context_builder=ContextBuilder(1000, token_counter=estimate_tokens), **kwargs
+    )
+
+
+def _run(coro_factory, server):
+    async def runner():
+        client = LLMClient(host=server.url, model="fake-model")
+        try:
+            return await coro_factory(client)
+        finally:
+            await client.close()
+    return asyncio.run(runner())
+
+
+def test_sections_stream_in_completion_order(fake_ollama):
+    questions = [("Scope", "The slow question?"), ("EMD", "The quick question?")]
+
+    async def collect(client):
+        return [section async for section in _engine(client, questions).stream()]
+
+    sections = _run(collect, fake_ollama)
+
+    assert [(section["index"], section["section"]) for section in sections] == [(1, "EMD"), (0, "Scope")]
+    assert all(section["answer"].startswith("Fake answer") for section in sections)
+    assert all(section["timings"]["retrieval_ms"] == 1.0 for section in sections)
+
+
+def test_pending_sections_are_cancelled_when_the_client_disconnects(fake_ollama):
+    questions = [(f"Section {n}", f"Question {n}?") for n in range(4)]
+
+    async def first_then_disconnect(client):
+        stream = _engine(client, questions, max_concurrency=1).stream()
+        first = await stream.__anext__()
+        await stream.aclose()
+        # Give any generation that was not cancelled time to reach the server
+        await asyncio.sleep(0.5)
+        return first, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    first, leftover = _run(first_then_disconnect, fake_ollama)
+
+    assert first["answer"].startswith("Fake answer")
+    assert leftover == []
+    assert len(fake_ollama.requests) < len(questions)
+
+
+def test_facts_answer_mode_skips_retrieval_and_generation(fake_ollama):
+    questions = [("EMD", "What is the EMD?"), ("Scope", "What is the scope?")]
+    retriever = StubRetriever()
+
+    async def collect(client):
+        engine = _engine(client, questions, retriever=retriever, facts={"EMD": [EMD_FACT], "Scope": []},
+                         facts_mode="answer")
+        return [section async for section in engine.stream()]
+
+    sections = _run(collect, fake_ollama)
+
+    assert sections[0] == {
+        "index": 0, "section": "EMD", "cached": False, "source": "facts", "facts_used": 1,
+        "answer": "- The EMD is Rs 50,000. (page 3)", "timings": {}, "elapsed": 0.0
+    }
+    # A section without facts is answered as usual
+    assert "source" not in sections[1]
+    assert retriever.calls == [["What is the scope?"]]
+    assert len(fake_ollama.requests) == 1
+
+
+def test_facts_seed_mode_puts_facts_in_the_prompt(fake_ollama):
+    questions = [("EMD", "What is the EMD?")]
+
+    async def collect(client):
+        engine = _engine(client, questions, k=4, facts={"EMD": [EMD_FACT]}, facts_mode="seed")
+        return [section async for section in engine.stream()]
+
+    sections = _run(collect, fake_ollama)
+
+    assert sections[0]["facts_used"] == 1
+    prompt = fake_ollama.requests[0]["prompt"]
+    assert "Facts extracted from the document:\n- The EMD is Rs 50,000. (page 3)" in prompt
+    # The facts stand in for half the retrieved chunks
+    assert "Chunk 1 about" in prompt and "Chunk 2 about" not in prompt
+
+
+def test_answers_are_cached_per_namespace(fake_ollama, tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"), max_entries=10, ttl=0)
+    questions = [("EMD", "What is the EMD?")]
+
+    async def collect(client, **kwargs):
+        engine = _engine(client, questions, k=2, answer_cache=cache, document_id="doc-1", **kwargs)
+        return [section async for section in engine.stream()]
+
+    first = _run(collect, fake_ollama)[0]
+    second = _run(collect, fake_ollama)[0]
+    seeded = _run(lambda client: collect(client, facts={"EMD": [EMD_FACT]}, facts_mode="seed"), fake_ollama)[0]
+
+    assert not first["cached"] and second["cached"]
+    assert second["answer"] == first["answer"]
+    ids = ["What is the EMD?-0", "What is the EMD?-1"]
+    assert cache.get(AnswerCache.make_key("doc-1", "What is the EMD?", ids, "fake-model",
+                                          namespace="summary")) == first["answer"]
+    # Seeded prompts differ, so they are cached apart from the plain ones
+    assert not seeded["cached"]
+    assert cache.get(AnswerCache.make_key("doc-1", "What is the EMD?", ids[:1], "fake-model",
+                                          namespace="summary+facts")) == seeded["answer"]
+    assert len(fake_ollama.requests) == 2
+    cache.close()
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import os
+import tracemalloc
+
+import pytest
+
+from uploads import SpooledUpload, UploadError, receive_upload
+
+BOUNDARY = "test-boundary"
+HEADERS = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+CHUNK = 64 * 1024
+
+
+async def _body(size: int, head: bytes = b"%PDF-1.7\n", filename: str = "tender.pdf", consumed=None):
+    """A multipart body carrying a `size`-byte file and a `replaces` field, in CHUNK pieces."""
+    yield (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"replaces\"\r\n\r\nold-id\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + head
+    filler = b"x" * CHUNK
+    remaining = size - len(head)
+    while remaining > 0:
+        if consumed is not None:
+            consumed.append(1)
+        yield filler[:min(CHUNK, remaining)]
+        remaining -= CHUNK
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _expected_digest(size: int, head: bytes = b"%PDF-1.7\n") -> str:
+    content = head + b"x" * (size - len(head))
+    return hashlib.sha256(content).hexdigest()
+
+
+def test_upload_is_hashed_and_spooled_in_one_pass(tmp_path):
+    async def receive(size):
+        return await receive_upload(HEADERS, _body(size), spool_threshold=256 * 1024, directory=str(tmp_path))
+
+    small, filename, fields = asyncio.run(receive(100 * 1024))
+    assert (filename, fields) == ("tender.pdf", {"replaces": "old-id"})
+    assert small.in_memory and small.finish() == _expected_digest(100 * 1024)
+    assert os.listdir(tmp_path) == []
+    path = small.save()
+    assert os.path.getsize(path) == 100 * 1024
+
+    large, _, _ = asyncio.run(receive(1024 * 1024))
+    assert not large.in_memory and large.finish() == _expected_digest(1024 * 1024)
+    path = large.save()
+    assert os.path.getsize(path) == 1024 * 1024
+    large.discard()
+    assert not os.path.exists(path)
+
+
+def test_rejections_stop_reading_early(tmp_path):
+    consumed = []
+    with pytest.raises(UploadError, match="not a PDF"):
+        asyncio.run(receive_upload(HEADERS, _body(1024 * 1024, head=b"PK\x03\x04", consumed=consumed)))
+    assert consumed == []
+
+    with pytest.raises(UploadError, match="Only PDF"):
+        asyncio.run(receive_upload(HEADERS, _body(1024, filename="tender.docx")))
+
+    consumed = []
+    with pytest.raises(UploadError, match="exceeds"):
+        asyncio.run(receive_upload(HEADERS, _body(4 * 1024 * 1024, consumed=consumed),
+                                   max_bytes=1024 * 1024, directory=str(tmp_path)))
+    assert len(consumed) <= 1024 * 1024 // CHUNK + 1
+    assert os.listdir(tmp_path) == []
+
+    with pytest.raises(UploadError, match="exceeds"):
+        asyncio.run(receive_upload({**HEADERS, "content-length": str(50 * 1024 * 1024)}, _body(1024)))
+
+
+def test_concurrent_uploads_use_bounded_memory(tmp_path):
+    uploads, size, threshold = 16, 4 * 1024 * 1024, 256 * 1024
+
+    async def receive_all():
+        results = await asyncio.gather(*[
+            receive_upload(HEADERS, _body(size), max_bytes=2 * size,
+                           spool_threshold=threshold, directory=str(tmp_path))
+            for _ in range(uploads)
+        ])
+        return [upload for upload, _, _ in results]
+
+    tracemalloc.start()
+    try:
+        received = asyncio.run(receive_all())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert all(upload.finish() == _expected_digest(size) for upload in received)
+    # Each upload holds at most its spool buffer plus a chunk in flight, not the file
+    assert peak < uploads * (threshold + 4 * CHUNK)
+    assert peak < uploads * size / 8
+    for upload in received:
+        upload.discard()
+
+
+def test_save_without_spooling_writes_once(tmp_path):
+    upload = SpooledUpload(max_bytes=1024, spool_threshold=1024, directory=str(tmp_path))
+    upload.write(b"%PDF-1.4 tiny")
+
+    assert upload.in_memory
+    with open(upload.save(), "rb") as f:
+        assert f.read() == b"%PDF-1.4 tiny"
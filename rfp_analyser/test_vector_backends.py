@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from vector_backends import FaissBackend
+
+DIM = 8
+
+
+def _vectors(n, seed=0):
+    vectors = np.random.default_rng(seed).random((n, DIM), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _add(backend, document_id, vectors, start=0):
+    ids = [f"{document_id}:{start + i}" for i in range(len(vectors))]
+    backend.upsert(
+        ids, vectors.tolist(), [f"text {chunk_id}" for chunk_id in ids],
+        [{'document_id': document_id, 'chunk_hash': f"hash {chunk_id}"} for chunk_id in ids]
+    )
+    return ids
+
+
+@pytest.fixture(params=["flat", "hnsw"])
+def backend(request, tmp_path):
+    backend = FaissBackend(str(tmp_path / "faiss"), index_type=request.param)
+    yield backend
+    backend.close()
+
+
+def test_query_finds_nearest_globally_and_per_document(backend):
+    a, b = _vectors(20, seed=1), _vectors(20, seed=2)
+    _add(backend, "a", a)
+    _add(backend, "b", b)
+
+    best = backend.query([b[5].tolist()], k=3)[0][0]
+    assert best['id'] == "b:5"
+    assert best['text'] == "text b:5"
+    assert best['distance'] == pytest.approx(0.0, abs=1e-5)
+
+    hits = backend.query([b[5].tolist()], k=3, document_id="a")[0]
+    assert len(hits) == 3
+    assert all(hit['metadata']['document_id'] == "a" for hit in hits)
+
+
+def test_replaced_and_deleted_chunks_are_not_returned(backend, tmp_path):
+    vectors = _vectors(10)
+    _add(backend, "a", vectors)
+    backend.build()
+    _add(backend, "a", -vectors[:1], start=3)
+    backend.delete(["a:4"])
+
+    ids = {hit['id'] for hit in backend.query([vectors[4].tolist()], k=10)[0]}
+    assert "a:4" not in ids
+    assert backend.count() == 9
+    assert backend.embeddings_for_hashes(["hash a:3"])["hash a:3"] == pytest.approx((-vectors[0]).tolist())
+
+    reopened = FaissBackend(str(tmp_path / "faiss"), index_type=backend.index_type)
+    assert reopened.document_hashes("a") == backend.document_hashes("a")
+    assert reopened.query([vectors[7].tolist()], k=1)[0][0]['id'] == "a:7"
+    reopened.close()
+
+
+def test_compaction_reclaims_dead_slots(backend):
+    backend.GROWTH_MIN_SLOTS = 4
+    _add(backend, "a", _vectors(10, seed=1))
+    keep = _vectors(10, seed=2)
+    _add(backend, "b", keep)
+    backend.delete_document("a")
+
+    assert backend._slots == 10
+    assert not backend._dead
+    assert backend.query([keep[2].tolist()], k=1)[0][0]['id'] == "b:2"
+    assert not backend.has_document("a")
@@ -0,0 +1,98 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+import config
+import vector_store as vector_store_module
+from vector_store import VectorStore
+
+DIM = 8
+
+
+class StubEncoder:
+    """Embeds each text as a fixed unit vector derived from its hash, counting what it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        return [self.vector(text).tolist() for text in texts]
+
+    @staticmethod
+    def vector(text):
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).random(DIM, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+
+class StubEmbeddingService:
+    def __init__(self, **kwargs):
+        pass
+
+    def encode(self, texts):
+        return np.array([StubEncoder.vector(text) for text in texts])
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "FAISS_PATH", str(tmp_path / "faiss"))
+    monkeypatch.setattr(vector_store_module, "EmbeddingService", StubEmbeddingService)
+    store = VectorStore(backend="faiss", keyword_index_path=str(tmp_path / "keywords.sqlite3"))
+    yield store
+    store.close()
+
+
+def _chunks(*texts):
+    return [(text, {"page": n + 1}) for n, text in enumerate(texts)]
+
+
+def test_reindexing_an_edited_document_embeds_only_new_text(store):
+    encode = StubEncoder()
+    original = _chunks("Scope of work.", "EMD is Rs 50,000.", "Bids are due on 15/03/2025.", "Annexure A.")
+    stats = store.add_document_batches([original[:2], original[2:]], "doc-1", encode=encode)
+    assert stats == {"embeddings_computed": 4, "embeddings_reused": 0, "chunks_unchanged": 0, "chunks_deleted": 0}
+
+    # The EMD clause was rewritten, the due date moved up a chunk and the annexure dropped
+    encode.encoded.clear()
+    edited = _chunks("Scope of work.", "Bids are due on 15/03/2025.", "EMD is Rs 75,000.")
+    stats = store.add_document_batches([edited[:2], edited[2:]], "doc-1", encode=encode)
+
+    assert stats == {"embeddings_computed": 1, "embeddings_reused": 1, "chunks_unchanged": 1, "chunks_deleted": 1}
+    assert encode.encoded == ["EMD is Rs 75,000."]
+    assert store.backend.document_hashes("doc-1") == {
+        "doc-1:0": VectorStore.chunk_hash("Scope of work."),
+        "doc-1:1": VectorStore.chunk_hash("Bids are due on 15/03/2025."),
+        "doc-1:2": VectorStore.chunk_hash("EMD is Rs 75,000."),
+    }
+
+    hit = store.backend.query([StubEncoder.vector("Bids are due on 15/03/2025.").tolist()], k=1)[0][0]
+    assert hit["id"] == "doc-1:1"
+    assert hit["distance"] == pytest.approx(0.0, abs=1e-5)
+    assert [chunk_id for chunk_id, _ in store.keywords.search("annexure", k=5)] == []
+
+
+def test_batched_queries_keep_their_own_distances(store, monkeypatch):
+    texts = ["Scope of work.", "EMD is Rs 50,000.", "Bids are due on 15/03/2025.", "Annexure A lists the forms."]
+    store.add_documents(_chunks(*texts), "doc-1", encode=StubEncoder())
+    monkeypatch.setattr(config, "HYBRID_CANDIDATES", 2)
+    monkeypatch.setattr(config, "HYBRID_DENSE_WEIGHT", 1.0)
+    monkeypatch.setattr(config, "HYBRID_KEYWORD_WEIGHT", 1.0)
+
+    # The first two queries are chunks' own texts, so each finds its chunk at distance 0 and the other further off
+    scope, emd, annexure, forms = store.search_batch(texts[:2] + [texts[3], "forms"], k=2)
+
+    assert [(hit["id"], round(hit["distance"], 4)) for hit in scope][0] == ("doc-1:0", 0.0)
+    assert [(hit["id"], round(hit["distance"], 4)) for hit in emd][0] == ("doc-1:1", 0.0)
+    assert scope[1]["id"] == "doc-1:1" and emd[1]["id"] == "doc-1:0"
+    assert scope[1]["distance"] == pytest.approx(emd[1]["distance"]) and scope[1]["distance"] > 0.01
+
+    # Only the keyword index finds the annexure for "forms"; the distance from the other query is not reused
+    assert annexure[0]["id"] == "doc-1:3" and annexure[0]["distance"] == pytest.approx(0.0, abs=1e-5)
+    hits = {hit["id"]: hit for hit in forms}
+    assert hits["doc-1:3"]["distance"] is None
+    assert hits["doc-1:3"]["text"] == texts[3]
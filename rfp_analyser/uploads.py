@@ -0,0 +1,203 @@
+import hashlib
+import logging
+import os
+import tempfile
+from typing import AsyncIterator, Dict, Mapping, Optional, Tuple
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart before 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+import config
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b"%PDF-"
+MAX_FIELD_BYTES = 64 * 1024  # non-file form fields are short IDs
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries, part headers and fields around the file
+
+
+class UploadError(Exception):
+    """Raised when an upload is rejected, with the HTTP status to answer with."""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class SpooledUpload:
+    """A file upload checked, hashed and stored in a single pass.
+
+    Each chunk is counted against the size limit, added to the SHA-256 and,
+    while the first bytes arrive, checked for the PDF signature. Content is
+    held in memory up to `spool_threshold` bytes and moved to a temporary
+    file beyond that, so memory per upload stays bounded however large the
+    file is, and rejected or duplicate small uploads never touch the disk.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, spool_threshold: Optional[int] = None,
+                 directory: Optional[str] = None, suffix: str = ".pdf"):
+        self.max_bytes = max_bytes or config.UPLOAD_MAX_BYTES
+        self.spool_threshold = config.UPLOAD_SPOOL_BYTES if spool_threshold is None else spool_threshold
+        self.directory = directory or config.UPLOAD_DIR
+        self.suffix = suffix
+        self.size = 0
+        self.path: Optional[str] = None
+        self._hash = hashlib.sha256()
+        self._head = b""
+        self._buffer: Optional[bytearray] = bytearray()
+        self._file = None
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    def write(self, data) -> None:
+        """Take the next chunk of the file; accepts bytes or a memoryview."""
+        if not data:
+            return
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise UploadError(f"File size exceeds {self.max_bytes // (1024 * 1024)}MB limit")
+        if len(self._head) < len(PDF_MAGIC):
+            self._head += bytes(data[:len(PDF_MAGIC) - len(self._head)])
+            if not PDF_MAGIC.startswith(self._head):
+                raise UploadError("File is not a PDF")
+        self._hash.update(data)
+
+        if self._file is None and len(self._buffer) + len(data) > self.spool_threshold:
+            self._spool()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer += data
+
+    def finish(self) -> str:
+        """Check the upload is complete and return its SHA-256, the document ID."""
+        if self._head != PDF_MAGIC:
+            raise UploadError("File is not a PDF")
+        return self._hash.hexdigest()
+
+    def save(self) -> str:
+        """Return the path of the file on disk, writing it out if it is still in memory.
+
+        The caller owns the file from here on and must delete it.
+        """
+        if self._file is None and self.path is None:
+            self._spool()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.path
+
+    def discard(self) -> None:
+        """Drop the content, deleting any temporary file."""
+        self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+    def _spool(self):
+        fd, self.path = tempfile.mkstemp(suffix=self.suffix, dir=self.directory)
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(self._buffer)
+        self._buffer = None
+
+
+async def receive_upload(headers: Mapping[str, str], body: AsyncIterator[bytes], field: str = "file",
+                         **upload_options) -> Tuple[SpooledUpload, str, Dict[str, str]]:
+    """Parse a multipart/form-data request body as it streams in.
+
+    The part named `field` goes into a SpooledUpload; other parts are
+    returned as text fields. Returns (upload, filename, fields); the upload
+    has been finished and must be saved or discarded by the caller.
+    """
+    content_type, options = parse_options_header(headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadError("Expected a multipart/form-data upload")
+
+    upload = SpooledUpload(**upload_options)
+    content_length = headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > upload.max_bytes + MULTIPART_OVERHEAD:
+        # Refuse before reading anything
+        raise UploadError(f"File size exceeds {upload.max_bytes // (1024 * 1024)}MB limit")
+
+    fields: Dict[str, str] = {}
+    state = {"header_field": b"", "header_value": b"", "headers": {}, "target": None, "name": None}
+    found = {"file": False, "filename": None}
+
+    def on_part_begin():
+        state.update(headers={}, target=None, name=None)
+
+    def on_header_field(data, start, end):
+        state["header_field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_field"].lower()] = state["header_value"]
+        state.update(header_field=b"", header_value=b"")
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode("utf-8", "replace")
+        filename = disposition.get(b"filename")
+        if name == field:
+            if found["file"]:
+                raise UploadError("Upload one file at a time")
+            filename = (filename or b"").decode("utf-8", "replace")
+            if not filename.lower().endswith(".pdf"):
+                raise UploadError("Only PDF files are supported")
+            found.update(file=True, filename=filename)
+            state["target"] = upload
+        else:
+            state.update(target=bytearray(), name=name)
+
+    def on_part_data(data, start, end):
+        target = state["target"]
+        if target is upload:
+            # A view, not a copy, of the parser's chunk
+            upload.write(memoryview(data)[start:end])
+        elif target is not None:
+            target += data[start:end]
+            if len(target) > MAX_FIELD_BYTES:
+                raise UploadError(f"Form field '{state['name']}' is too large")
+
+    def on_part_end():
+        if state["name"] is not None:
+            fields[state["name"]] = state["target"].decode("utf-8", "replace")
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in body:
+            parser.write(chunk)
+        parser.finalize()
+        if not found["file"]:
+            raise UploadError(f"No '{field}' file in the upload")
+        upload.finish()
+    except UploadError:
+        upload.discard()
+        raise
+    except Exception as e:
+        upload.discard()
+        logger.warning(f"Malformed upload: {e}")
+        raise UploadError("Malformed multipart upload")
+    return upload, found["filename"], fields
@@ -0,0 +1,536 @@
+import json
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+VECTOR_BACKENDS = ("chroma", "faiss")
+FAISS_INDEX_TYPES = ("flat", "hnsw")
+
+
+class VectorBackend(ABC):
+    """Storage and nearest-neighbour search for chunk embeddings.
+
+    Chunks carry an ID, an embedding, their text and a metadata dict that
+    always includes `document_id` and `chunk_hash`. Distances are cosine
+    distances (1 - cosine similarity), smaller is closer.
+    """
+
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings: List[List[float]], texts: List[str],
+               metadatas: List[Dict[str, Any]]):
+        """Insert chunks, replacing any stored under the same IDs."""
+
+    @abstractmethod
+    def query(self, embeddings: List[List[float]], k: int,
+              document_id: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """Return up to k hits per query embedding as {id, text, metadata, distance} dicts, closest first."""
+
+    @abstractmethod
+    def get(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Return {id, text, metadata} for the chunks that exist among `ids`."""
+
+    @abstractmethod
+    def get_embeddings(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        """Return the stored float32 embedding of each chunk that exists among `ids`."""
+
+    @abstractmethod
+    def document_hashes(self, document_id: str) -> Dict[str, Optional[str]]:
+        """Map each chunk ID of a document to its chunk_hash."""
+
+    @abstractmethod
+    def embeddings_for_hashes(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """Return a stored embedding for each chunk_hash that is already indexed."""
+
+    @abstractmethod
+    def has_document(self, document_id: str) -> bool:
+        """Return whether any chunks are stored for the document."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]):
+        """Remove chunks by ID."""
+
+    @abstractmethod
+    def delete_document(self, document_id: str):
+        """Remove every chunk of one document."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored chunks."""
+
+    @abstractmethod
+    def iter_chunks(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield {id, text, metadata} for every stored chunk."""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every chunk."""
+
+    def build(self):
+        """Prepare the search index ahead of the first query."""
+
+    def close(self):
+        pass
+
+
+class ChromaBackend(VectorBackend):
+    """Chunks stored in a ChromaDB collection.
+
+    With config.CHROMA_HOST set the collection lives in a Chroma server, which
+    any number of API workers can share; otherwise it is persisted in a local
+    directory that only one process may open.
+    """
+
+    def __init__(self, persist_dir: Optional[str] = None, host: Optional[str] = None,
+                 port: Optional[int] = None):
+        import chromadb
+
+        host = host or config.CHROMA_HOST
+        self.persist_dir = None if host else Path(persist_dir or config.CHROMA_PATH)
+
+        try:
+            if host:
+                self.client = chromadb.HttpClient(host=host, port=port or config.CHROMA_PORT)
+                logger.info(f"Connected to Chroma server at {host}:{port or config.CHROMA_PORT}")
+            else:
+                self.persist_dir.mkdir(parents=True, exist_ok=True)
+                self.client = chromadb.PersistentClient(path=str(self.persist_dir))
+            self.collection = self._open_collection()
+            logger.info("Successfully initialized ChromaDB client and collection")
+        except Exception as e:
+            logger.error(f"Failed to initialize ChromaDB: {e}")
+            raise
+
+    def _open_collection(self):
+        return self.client.get_or_create_collection(
+            name="rfp_documents",
+            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+        )
+
+    def upsert(self, ids, embeddings, texts, metadatas):
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+
+    def query(self, embeddings, k, document_id=None):
+        results = self.collection.query(
+            query_embeddings=embeddings,
+            n_results=k,
+            where={'document_id': document_id} if document_id else None
+        )
+        return [
+            [
+                {
+                    'id': results['ids'][q][i],
+                    'text': results['documents'][q][i],
+                    'metadata': results['metadatas'][q][i],
+                    'distance': results['distances'][q][i]
+                }
+                for i in range(len(results['ids'][q]))
+            ]
+            for q in range(len(embeddings))
+        ]
+
+    def get(self, ids):
+        found = self.collection.get(ids=ids, include=['documents', 'metadatas'])
+        return [
+            {'id': chunk_id, 'text': text, 'metadata': meta}
+            for chunk_id, text, meta in zip(found['ids'], found['documents'], found['metadatas'])
+        ]
+
+    def get_embeddings(self, ids):
+        found = self.collection.get(ids=ids, include=['embeddings'])
+        return {
+            chunk_id: np.asarray(embedding, dtype=np.float32)
+            for chunk_id, embedding in zip(found['ids'], found['embeddings'])
+        }
+
+    def document_hashes(self, document_id):
+        existing = self.collection.get(where={'document_id': document_id}, include=['metadatas'])
+        return {
+            chunk_id: meta.get('chunk_hash')
+            for chunk_id, meta in zip(existing['ids'], existing['metadatas'])
+        }
+
+    def embeddings_for_hashes(self, hashes):
+        found = self.collection.get(
+            where={'chunk_hash': {'$in': list(hashes)}},
+            include=['metadatas', 'embeddings']
+        )
+        return {
+            meta['chunk_hash']: list(embedding)
+            for meta, embedding in zip(found['metadatas'], found['embeddings'])
+        }
+
+    def has_document(self, document_id):
+        return bool(self.collection.get(where={'document_id': document_id}, limit=1, include=[])['ids'])
+
+    def delete(self, ids):
+        self.collection.delete(ids=ids)
+
+    def delete_document(self, document_id):
+        self.collection.delete(where={'document_id': document_id})
+
+    def count(self):
+        return self.collection.count()
+
+    def iter_chunks(self, page_size=1000):
+        offset = 0
+        while True:
+            page = self.collection.get(include=['documents', 'metadatas'], limit=page_size, offset=offset)
+            if not page['ids']:
+                return
+            for chunk_id, text, meta in zip(page['ids'], page['documents'], page['metadatas']):
+                yield {'id': chunk_id, 'text': text, 'metadata': meta}
+            offset += len(page['ids'])
+
+    def clear(self):
+        self.client.delete_collection("rfp_documents")
+        self.collection = self._open_collection()
+
+
+class FaissBackend(VectorBackend):
+    """Chunks searched in-process with FAISS.
+
+    Vectors live in a memory-mapped float32 file, one row per slot; IDs,
+    texts and metadata live in a SQLite sidecar that maps chunks to slots.
+    Slots are only ever appended, so a slot is also the vector's FAISS ID;
+    replaced or deleted slots are skipped at search time and reclaimed by
+    compaction once they make up a quarter of the file. Searches limited to
+    one document are scored exactly with NumPy over that document's rows.
+    """
+
+    GROWTH_MIN_SLOTS = 1024
+
+    def __init__(self, path: Optional[str] = None, index_type: Optional[str] = None,
+                 hnsw_m: Optional[int] = None):
+        self.path = Path(path or config.FAISS_PATH)
+        self.path.mkdir(exist_ok=True)
+        self.index_type = index_type or config.FAISS_INDEX_TYPE
+        if self.index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(f"Unknown FAISS index type: {self.index_type}")
+        self.hnsw_m = hnsw_m or config.FAISS_HNSW_M
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path / "chunks.sqlite3"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                chunk_id TEXT PRIMARY KEY,
+                slot INTEGER NOT NULL,
+                document_id TEXT NOT NULL,
+                chunk_hash TEXT,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_slot ON chunks (slot);
+            CREATE INDEX IF NOT EXISTS chunks_document ON chunks (document_id);
+            CREATE INDEX IF NOT EXISTS chunks_hash ON chunks (chunk_hash);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+        meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        self.dimension: Optional[int] = meta.get('dimension')
+        self._slots = meta.get('slots', 0)
+        self._generation = meta.get('generation', 0)
+        self._vectors: Optional[np.memmap] = None
+        if self.dimension:
+            self._open_vectors()
+
+        live = np.array([row[0] for row in self._conn.execute("SELECT slot FROM chunks")], dtype=np.int64)
+        dead = np.ones(self._slots, dtype=bool)
+        dead[live] = False
+        self._dead = set(np.nonzero(dead)[0].tolist())
+
+        # Built on the first unfiltered search, then kept up to date
+        self._index = None
+        self._selector = None
+        logger.info(f"Opened FAISS store at {self.path} with {len(live)} chunks")
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.path / f"vectors.{generation}.f32"
+
+    def _open_vectors(self, min_slots: int = 0):
+        """Map the vector file, growing it to hold at least `min_slots` rows."""
+        path = self._vectors_path(self._generation)
+        row_bytes = self.dimension * 4
+        size = path.stat().st_size if path.exists() else 0
+        if size < min_slots * row_bytes or size == 0:
+            capacity = max(self.GROWTH_MIN_SLOTS, min_slots, 2 * (size // row_bytes))
+            with open(path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+            size = capacity * row_bytes
+        self._vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(size // row_bytes, self.dimension))
+
+    def _set_meta(self, **values):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(values.items())
+        )
+
+    def upsert(self, ids, embeddings, texts, metadatas):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+                self._set_meta(dimension=self.dimension)
+            if self._vectors is None or self._slots + len(ids) > len(self._vectors):
+                self._vectors = None
+                self._open_vectors(self._slots + len(ids))
+
+            replaced = self._slots_for(ids)
+            first = self._slots
+            self._vectors[first:first + len(ids)] = vectors
+            self._vectors.flush()
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (chunk_id, slot, document_id, chunk_hash, text, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (chunk_id, first + i, meta['document_id'], meta.get('chunk_hash'), text, json.dumps(meta))
+                    for i, (chunk_id, text, meta) in enumerate(zip(ids, texts, metadatas))
+                ]
+            )
+            self._slots += len(ids)
+            self._set_meta(slots=self._slots)
+            self._conn.commit()
+
+            if self._index is not None:
+                self._index.add(vectors)
+            self._mark_dead(replaced)
+
+    def _slots_for(self, ids: List[str]) -> List[int]:
+        slots = []
+        for i in range(0, len(ids), 500):
+            part = ids[i:i + 500]
+            slots.extend(row[0] for row in self._conn.execute(
+                f"SELECT slot FROM chunks WHERE chunk_id IN ({','.join('?' * len(part))})", part
+            ))
+        return slots
+
+    def _mark_dead(self, slots: List[int]):
+        if not slots:
+            return
+        self._dead.update(slots)
+        self._selector = None
+        if len(self._dead) > max(self.GROWTH_MIN_SLOTS, self._slots // 4):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the vector file without dead slots and renumber the live ones."""
+        rows = self._conn.execute("SELECT chunk_id, slot FROM chunks ORDER BY slot").fetchall()
+        old_path = self._vectors_path(self._generation)
+        new_path = self._vectors_path(self._generation + 1)
+        capacity = max(self.GROWTH_MIN_SLOTS, 2 * len(rows))
+        compacted = np.memmap(new_path, dtype=np.float32, mode="w+", shape=(capacity, self.dimension))
+        for start in range(0, len(rows), 10000):
+            part = [slot for _, slot in rows[start:start + 10000]]
+            compacted[start:start + len(part)] = self._vectors[part]
+        compacted.flush()
+        del compacted
+
+        # Live slots only ever move down, so renumbering in slot order never collides
+        self._conn.executemany(
+            "UPDATE chunks SET slot = ? WHERE chunk_id = ?",
+            [(new_slot, chunk_id) for new_slot, (chunk_id, _) in enumerate(rows)]
+        )
+        self._generation += 1
+        self._slots = len(rows)
+        self._set_meta(slots=self._slots, generation=self._generation)
+        self._conn.commit()
+
+        self._vectors = None
+        old_path.unlink()
+        self._open_vectors()
+        self._dead = set()
+        self._index = self._selector = None
+        logger.info(f"Compacted FAISS vectors to {self._slots} slots")
+
+    def _build_index(self):
+        import faiss
+
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexFlatIP(self.dimension)
+        # Vectors are L2-normalized, so inner product is cosine similarity
+        for start in range(0, self._slots, 50000):
+            index.add(np.ascontiguousarray(self._vectors[start:min(start + 50000, self._slots)]))
+        self._index = index
+        logger.info(f"Built {self.index_type} FAISS index over {self._slots} vectors")
+
+    def _search_params(self):
+        import faiss
+
+        if not self._dead:
+            return None
+        if self._selector is None:
+            self._selector = faiss.IDSelectorNot(
+                faiss.IDSelectorBatch(np.fromiter(self._dead, dtype=np.int64))
+            )
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(sel=self._selector)
+        return faiss.SearchParameters(sel=self._selector)
+
+    def build(self):
+        with self._lock:
+            if self._index is None and self._slots:
+                self._build_index()
+
+    def query(self, embeddings, k, document_id=None):
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        with self._lock:
+            if not self._slots:
+                return [[] for _ in range(len(queries))]
+            if document_id:
+                slots = np.array([row[0] for row in self._conn.execute(
+                    "SELECT slot FROM chunks WHERE document_id = ? ORDER BY slot", (document_id,)
+                )], dtype=np.int64)
+                if not len(slots):
+                    return [[] for _ in range(len(queries))]
+                similarities = queries @ self._vectors[slots].T
+                top = np.argsort(-similarities, axis=1)[:, :k]
+                ranked = [[(int(slots[j]), float(similarities[q, j])) for j in row] for q, row in enumerate(top)]
+            else:
+                if self._index is None:
+                    self._build_index()
+                found, labels = self._index.search(queries, min(k, self._slots), params=self._search_params())
+                ranked = [
+                    [(int(slot), float(score)) for slot, score in zip(labels[q], found[q]) if slot >= 0]
+                    for q in range(len(queries))
+                ]
+            rows = self._rows_for_slots({slot for hits in ranked for slot, _ in hits})
+
+        return [
+            [
+                {**rows[slot], 'distance': 1.0 - similarity}
+                for slot, similarity in hits if slot in rows
+            ]
+            for hits in ranked
+        ]
+
+    def _rows_for_slots(self, slots) -> Dict[int, Dict[str, Any]]:
+        slots = list(slots)
+        rows = {}
+        for i in range(0, len(slots), 500):
+            part = slots[i:i + 500]
+            for slot, chunk_id, text, meta in self._conn.execute(
+                f"SELECT slot, chunk_id, text, metadata FROM chunks WHERE slot IN ({','.join('?' * len(part))})", part
+            ):
+                rows[slot] = {'id': chunk_id, 'text': text, 'metadata': json.loads(meta)}
+        return rows
+
+    def get(self, ids):
+        found = []
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                found.extend(
+                    {'id': chunk_id, 'text': text, 'metadata': json.loads(meta)}
+                    for chunk_id, text, meta in self._conn.execute(
+                        f"SELECT chunk_id, text, metadata FROM chunks WHERE chunk_id IN ({','.join('?' * len(part))})",
+                        part
+                    )
+                )
+        return found
+
+    def get_embeddings(self, ids):
+        found = {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                for chunk_id, slot in self._conn.execute(
+                    f"SELECT chunk_id, slot FROM chunks WHERE chunk_id IN ({','.join('?' * len(part))})", part
+                ):
+                    found[chunk_id] = np.array(self._vectors[slot])
+        return found
+
+    def document_hashes(self, document_id):
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT chunk_id, chunk_hash FROM chunks WHERE document_id = ?", (document_id,)
+            ).fetchall())
+
+    def embeddings_for_hashes(self, hashes):
+        hashes = list(hashes)
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                for chunk_hash, slot in self._conn.execute(
+                    f"SELECT chunk_hash, slot FROM chunks WHERE chunk_hash IN ({','.join('?' * len(part))})", part
+                ):
+                    found[chunk_hash] = self._vectors[slot].tolist()
+        return found
+
+    def has_document(self, document_id):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM chunks WHERE document_id = ? LIMIT 1", (document_id,)
+            ).fetchone() is not None
+
+    def delete(self, ids):
+        with self._lock:
+            slots = self._slots_for(ids)
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                self._conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({','.join('?' * len(part))})", part)
+            self._conn.commit()
+            self._mark_dead(slots)
+
+    def delete_document(self, document_id):
+        with self._lock:
+            slots = [row[0] for row in self._conn.execute(
+                "SELECT slot FROM chunks WHERE document_id = ?", (document_id,)
+            )]
+            self._conn.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+            self._conn.commit()
+            self._mark_dead(slots)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def iter_chunks(self, page_size=1000):
+        last_slot = -1
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    "SELECT slot, chunk_id, text, metadata FROM chunks WHERE slot > ? ORDER BY slot LIMIT ?",
+                    (last_slot, page_size)
+                ).fetchall()
+            if not page:
+                return
+            for slot, chunk_id, text, meta in page:
+                yield {'id': chunk_id, 'text': text, 'metadata': json.loads(meta)}
+            last_slot = page[-1][0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.commit()
+            self._mark_dead(list(range(self._slots)))
+
+    def close(self):
+        with self._lock:
+            self._vectors = None
+            self._conn.close()
+
+
+def create_backend(name: Optional[str] = None) -> VectorBackend:
+    """Create the vector backend named by config.VECTOR_BACKEND."""
+    name = name or config.VECTOR_BACKEND
+    if name == "chroma":
+        return ChromaBackend()
+    if name == "faiss":
+        return FaissBackend()
+    raise ValueError(f"Unknown vector backend: {name}. Expected one of {', '.join(VECTOR_BACKENDS)}")
@@ -1,122 +1,304 @@
-from typing import List, Dict, Any
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-import ollama
+from typing import List, Dict, Any, Optional, Callable, Iterable
+import hashlib
 import logging
 import os
-from pathlib import Path
+import threading
+from itertools import islice
+
+import numpy as np
+
+import config
+from abbreviations import AbbreviationExpander
+from embedding_service import EmbeddingService
+from metrics import timed
+from keyword_index import KeywordIndex
+from vector_backends import VectorBackend, create_backend
 
 logger = logging.getLogger(__name__)
 
 class VectorStore:
-    def __init__(self):
-        # Ensure the persistence directory exists
-        persist_dir = Path(".chroma_db")
-        persist_dir.mkdir(exist_ok=True)
-        
+    """Chunk embeddings in a pluggable vector backend, with a BM25 keyword index beside it.
+
+    The backend (ChromaDB or FAISS, see config.VECTOR_BACKEND) and the
+    embedding model are created on first use, or by warm_up(), so
+    constructing a VectorStore is cheap.
+    """
+
+    def __init__(self, backend: Optional[str] = None, keyword_index_path: Optional[str] = None,
+                 abbreviation_loader: Optional[Callable[[str], Dict[str, str]]] = None):
+        self.backend_name = backend or config.VECTOR_BACKEND
+        self.keywords = KeywordIndex(keyword_index_path)
+        self._backend: Optional[VectorBackend] = None
+        self._embeddings: Optional[EmbeddingService] = None
+        self._backend_lock = threading.Lock()
+        self._embeddings_lock = threading.Lock()
+
+        # Compiled per document; abbreviation_loader fetches a document's map on first use
+        self.abbreviation_loader = abbreviation_loader
+        self._expanders: Dict[str, AbbreviationExpander] = {}
+
+    @property
+    def backend(self) -> VectorBackend:
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = create_backend(self.backend_name)
+        return self._backend
+
+    @property
+    def embeddings(self) -> EmbeddingService:
+        if self._embeddings is None:
+            with self._embeddings_lock:
+                if self._embeddings is None:
+                    self._embeddings = EmbeddingService()
+        return self._embeddings
+
+    @property
+    def ready(self) -> bool:
+        """Whether both the backend and the embedding model are loaded."""
+        return self._backend is not None and self._embeddings is not None
+
+    def warm_up(self, texts: Optional[List[str]] = None):
+        """Open the backend, load the embedding model and pre-embed `texts`."""
+        if self.keywords.count() == 0 and self.backend.count() > 0:
+            self._backfill_keywords()
+        self.backend.build()
+        self.embeddings.warm(texts or [])
+
+    def _backfill_keywords(self):
+        """Build the keyword index from chunks stored before it existed."""
+        chunks = self.backend.iter_chunks()
+        count = 0
+        while True:
+            batch = list(islice(chunks, 1000))
+            if not batch:
+                break
+            self.keywords.add((chunk['id'], chunk['metadata'].get('document_id', ''), chunk['text']) for chunk in batch)
+            count += len(batch)
+        logger.info(f"Built keyword index for {count} existing chunks")
+
+    def close(self):
+        self.keywords.close()
+        if self._backend is not None:
+            self._backend.close()
+        if self._embeddings is not None:
+            self._embeddings.close()
+
+    @staticmethod
+    def chunk_id(document_id: str, offset: int) -> str:
+        """Return the stable ID of a document's chunk at the given offset."""
+        return f"{document_id}:{offset}"
+
+    @staticmethod
+    def chunk_hash(text: str) -> str:
+        """Return the content hash used to recognise an already-embedded chunk."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @timed("add_documents")
+    def add_documents(self, chunks: List[tuple], document_id: str, metadata: Dict[str, Any] = None,
+                      encode: Optional[Callable[[List[str]], List[List[float]]]] = None) -> Dict[str, int]:
+        """Index a document's chunks, embedding only chunks that are not already stored.
+
+        Chunks whose text is unchanged at the same offset are left alone, chunks
+        whose text already exists anywhere in the store reuse that embedding,
+        and chunks that no longer appear in the document are deleted. `encode`
+        replaces the local embedding model, e.g. to embed on a process pool.
+        """
+        if not chunks:
+            logger.warning("No chunks provided to add_documents")
+        return self.add_document_batches([chunks] if chunks else [], document_id, metadata, encode)
+
+    def add_document_batches(self, batches: Iterable[List[tuple]], document_id: str,
+                             metadata: Dict[str, Any] = None,
+                             encode: Optional[Callable[[List[str]], List[List[float]]]] = None) -> Dict[str, int]:
+        """Index a document delivered as a stream of chunk batches, one batch in memory at a time.
+
+        Behaves like add_documents; chunk offsets continue across batches.
+        """
+        stats = {'embeddings_computed': 0, 'embeddings_reused': 0, 'chunks_unchanged': 0, 'chunks_deleted': 0}
         try:
-            # Initialize ChromaDB with the new configuration
-            self.client = chromadb.PersistentClient(path=str(persist_dir))
-            self.collection = self.client.get_or_create_collection(
-                name="rfp_documents",
-                metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+            # What this document looked like the last time it was indexed
+            existing_hashes = self.backend.document_hashes(document_id)
+
+            # Chunks indexed before the keyword index existed need adding to it even if unchanged
+            reindex_keywords = bool(existing_hashes) and not self.keywords.has_document(document_id)
+
+            offset = 0
+            for chunks in batches:
+                self._index_batch(chunks, offset, document_id, metadata, encode, existing_hashes, stats,
+                                  reindex_keywords)
+                offset += len(chunks)
+
+            # Drop chunks that vanished from this version of the document
+            vanished = sorted(
+                chunk_id for chunk_id in existing_hashes
+                if int(chunk_id.rsplit(':', 1)[1]) >= offset
             )
-            logger.info("Successfully initialized ChromaDB client and collection")
-        except Exception as e:
-            logger.error(f"Failed to initialize ChromaDB: {e}")
-            raise
+            if vanished:
+                self.backend.delete(vanished)
+                self.keywords.remove(vanished)
+            stats['chunks_deleted'] = len(vanished)
 
-        try:
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Successfully loaded embedding model")
+            logger.info(f"Indexed {offset} chunks for document {document_id}: {stats}")
+            return stats
         except Exception as e:
-            logger.error(f"Failed to load embedding model: {e}")
+            logger.error(f"Failed to add documents to vector store: {e}")
             raise
 
-        self.abbreviations: Dict[str, str] = {}
+    def _index_batch(self, chunks: List[tuple], offset: int, document_id: str, metadata: Optional[Dict[str, Any]],
+                     encode: Optional[Callable[[List[str]], List[List[float]]]],
+                     existing_hashes: Dict[str, str], stats: Dict[str, int], reindex_keywords: bool = False):
+        """Embed and upsert the new or changed chunks of one batch."""
+        ids = [self.chunk_id(document_id, offset + i) for i in range(len(chunks))]
+        texts = [chunk[0] for chunk in chunks]
+        hashes = [self.chunk_hash(text) for text in texts]
 
-    def add_documents(self, chunks: List[tuple], metadata: Dict[str, Any] = None):
-        """Add document chunks to the vector store."""
-        if not chunks:
-            logger.warning("No chunks provided to add_documents")
+        changed = [i for i, chunk_id in enumerate(ids) if existing_hashes.get(chunk_id) != hashes[i]]
+        stats['chunks_unchanged'] += len(ids) - len(changed)
+        self.keywords.add(
+            (ids[i], document_id, texts[i])
+            for i in (range(len(ids)) if reindex_keywords else changed)
+        )
+        if not changed:
             return
 
-        try:
-            texts = [chunk[0] for chunk in chunks]
-            metadatas = [chunk[1] for chunk in chunks]
-            
+        # Reuse embeddings for chunk texts already stored under any ID
+        reusable = self.backend.embeddings_for_hashes(list({hashes[i] for i in changed}))
+
+        to_embed = [i for i in changed if hashes[i] not in reusable]
+        if to_embed:
             # Generate embeddings using sentence-transformers
-            logger.info(f"Generating embeddings for {len(texts)} chunks")
-            embeddings = self.embedding_model.encode(texts).tolist()
-
-            # Add to ChromaDB
-            self.collection.add(
-                embeddings=embeddings,
-                documents=texts,
-                metadatas=metadatas,
-                ids=[f"doc_{i}" for i in range(len(texts))]
-            )
-            logger.info(f"Successfully added {len(texts)} chunks to vector store")
+            logger.info(f"Generating embeddings for {len(to_embed)} of {len(texts)} chunks")
+            to_encode = [texts[i] for i in to_embed]
+            if encode is not None:
+                computed = encode(to_encode)
+            else:
+                computed = self.embeddings.encode(to_encode).tolist()
+            for i, embedding in zip(to_embed, computed):
+                reusable[hashes[i]] = embedding
+        stats['embeddings_computed'] += len(to_embed)
+        stats['embeddings_reused'] += len(changed) - len(to_embed)
+
+        self.backend.upsert(
+            ids=[ids[i] for i in changed],
+            embeddings=[reusable[hashes[i]] for i in changed],
+            texts=[texts[i] for i in changed],
+            metadatas=[
+                {**(metadata or {}), **chunks[i][1], 'document_id': document_id, 'chunk_hash': hashes[i]}
+                for i in changed
+            ]
+        )
+
+    def has_document(self, document_id: str) -> bool:
+        """Return whether any chunks are stored for the document."""
+        return self.backend.has_document(document_id)
+
+    def delete_document(self, document_id: str):
+        """Remove all chunks belonging to one document."""
+        try:
+            self.backend.delete_document(document_id)
+            self.keywords.delete_document(document_id)
+            self._expanders.pop(document_id, None)
         except Exception as e:
-            logger.error(f"Failed to add documents to vector store: {e}")
+            logger.error(f"Failed to delete document {document_id} from vector store: {e}")
             raise
 
-    def search(self, query: str, k: int = 4) -> List[Dict[str, Any]]:
-        """Search for relevant chunks using semantic similarity."""
+    def search(self, query: str, k: int = 4, document_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search for relevant chunks using semantic similarity.
+
+        When document_id is given, only that document's chunks are considered.
+        """
         if not query.strip():
             logger.warning("Empty query provided to search")
             return []
 
+        return self.search_batch([query], k=k, document_id=document_id)[0]
+
+    @timed("search")
+    def search_batch(self, queries: List[str], k: int = 4,
+                     document_id: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """Search for several queries with one embedding call and one backend query.
+
+        Dense results are fused with BM25 keyword results by reciprocal rank,
+        weighted by config.HYBRID_DENSE_WEIGHT and config.HYBRID_KEYWORD_WEIGHT.
+        """
+        if not queries:
+            return []
+
+        dense_weight, keyword_weight = config.HYBRID_DENSE_WEIGHT, config.HYBRID_KEYWORD_WEIGHT
+        candidates = max(k, config.HYBRID_CANDIDATES) if keyword_weight > 0 else k
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+            # Generate all query embeddings in a single batch, served from cache when possible
+            query_embeddings = self.embeddings.encode(queries).tolist()
 
-            # Search in ChromaDB
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=k
-            )
+            # Search the vector backend
+            results = self.backend.query(query_embeddings, candidates, document_id)
+
+            # Process results, one list per query; distances belong to the query that found the chunk
+            hits_by_query: List[Dict[str, Dict[str, Any]]] = []
+            fused_ids = []
+            for q, query in enumerate(queries):
+                hits = {hit['id']: hit for hit in results[q]}
+                scores = {chunk_id: dense_weight / (config.HYBRID_RRF_K + rank + 1)
+                          for rank, chunk_id in enumerate(hits)}
+                if keyword_weight > 0:
+                    for rank, (chunk_id, _) in enumerate(self.keywords.search(query, candidates, document_id)):
+                        scores[chunk_id] = scores.get(chunk_id, 0.0) + keyword_weight / (config.HYBRID_RRF_K + rank + 1)
+                hits_by_query.append(hits)
+                fused_ids.append(sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k])
+
+            # Keyword-only hits still need their text and metadata, fetched once for all queries
+            missing = list({chunk_id for hits, ranked in zip(hits_by_query, fused_ids)
+                            for chunk_id, _ in ranked if chunk_id not in hits})
+            keyword_only = {}
+            if missing:
+                keyword_only = {chunk['id']: {**chunk, 'distance': None} for chunk in self.backend.get(missing)}
 
-            # Process results
             processed_results = []
-            for i in range(len(results['documents'][0])):
-                processed_results.append({
-                    'text': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i]
-                })
-
-            logger.info(f"Found {len(processed_results)} results for query: {query[:50]}...")
+            for hits, ranked in zip(hits_by_query, fused_ids):
+                processed_results.append([
+                    {**(hits.get(chunk_id) or keyword_only[chunk_id]), 'score': score}
+                    for chunk_id, score in ranked if chunk_id in hits or chunk_id in keyword_only
+                ])
+
+            logger.info(f"Searched {len(queries)} queries in one batch")
             return processed_results
         except Exception as e:
             logger.error(f"Failed to search vector store: {e}")
             raise
 
-    def expand_abbreviations(self, text: str) -> str:
-        """Expand known abbreviations in the text."""
-        if not text:
+    def chunk_embeddings(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        """Return the stored embeddings of the given chunks."""
+        return self.backend.get_embeddings(ids) if ids else {}
+
+    def expand_abbreviations(self, text: str, document_id: Optional[str] = None) -> str:
+        """Expand the abbreviations defined in a document, once each, in the text."""
+        if not text or not document_id:
             return text
 
         try:
-            expanded_text = text
-            for abbr, full_form in self.abbreviations.items():
-                expanded_text = expanded_text.replace(abbr, f"{abbr} ({full_form})")
-            return expanded_text
+            expander = self._expanders.get(document_id)
+            if expander is None:
+                abbreviations = self.abbreviation_loader(document_id) if self.abbreviation_loader else {}
+                expander = self._expanders[document_id] = AbbreviationExpander(abbreviations)
+            return expander.expand(text)
         except Exception as e:
             logger.error(f"Failed to expand abbreviations: {e}")
             return text
 
-    def set_abbreviations(self, abbreviations: Dict[str, str]):
-        """Set the abbreviation mappings."""
-        self.abbreviations = abbreviations
-        logger.info(f"Set {len(abbreviations)} abbreviation mappings")
+    def set_abbreviations(self, document_id: str, abbreviations: Dict[str, str]):
+        """Set a document's abbreviation mappings and compile its matcher."""
+        self._expanders[document_id] = AbbreviationExpander(abbreviations)
+        logger.info(f"Set {len(abbreviations)} abbreviation mappings for document {document_id}")
 
     def clear(self):
         """Clear all documents from the vector store."""
         try:
-            self.collection.delete(where={})
+            self.backend.clear()
+            self.keywords.clear()
+            self._expanders.clear()
             logger.info("Cleared all documents from vector store")
         except Exception as e:
             logger.error(f"Failed to clear vector store: {e}")
-            raise 
\ No newline at end of file
+            raise 
+